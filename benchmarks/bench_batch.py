@@ -0,0 +1,109 @@
+"""
+Benchmark: engines.rules_batch vs looping engines.rules.
+
+Checks that batch_valid_move_masks / batch_apply_moves agree with
+GameState on every legal move of a position suite, then plays random
+self-play plies on many boards at once and reports plies/sec for both.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch --boards 4096 --plies 100
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from engines.board import create_initial_board, OFF_BOARD
+from engines.rules import get_valid_moves, apply_move
+from engines.game_state_pyrsistent import GameState
+from engines.rules_batch import (
+    batch_valid_move_masks, batch_apply_moves, batch_random_moves,
+    batch_throw_sticks, batch_winners, batch_targets, boards_from_states
+)
+from engines.sticks import throw_sticks
+from benchmarks.positions import random_playout_positions
+
+
+def check_consistency(positions):
+    states = [GameState.from_board(b, p) for b, p in positions]
+    boards, players = boards_from_states(states)
+    checked = 0
+    for roll in range(1, 6):
+        rolls = np.full(len(states), roll, dtype=np.int8)
+        masks = batch_valid_move_masks(boards, players, rolls)
+        for i, state in enumerate(states):
+            moves = state.get_valid_moves(roll)
+            assert [m[0] for m in moves] == list(np.flatnonzero(masks[i])), \
+                (positions[i], roll)
+            for start, target in moves:
+                assert batch_targets(roll, start) == target
+                from_squares = np.full(len(states), -1)
+                from_squares[i] = start
+                after = batch_apply_moves(boards, players, rolls, from_squares)
+                expected = state.apply_move(start, target).get_vector()
+                assert tuple(after[i]) == tuple(expected), \
+                    (positions[i], roll, start)
+                checked += 1
+    return checked
+
+
+def bench_loop(games, plies, seed):
+    """engines.rules one board at a time."""
+    rng = random.Random(seed)
+    boards = [create_initial_board() for _ in range(games)]
+    players = ['X'] * games
+    start = time.perf_counter()
+    for _ in range(plies):
+        for i in range(games):
+            roll = throw_sticks()
+            moves = get_valid_moves(boards[i], players[i], roll)
+            if moves:
+                move = rng.choice(moves)
+                apply_move(boards[i], move[0], move[1], silent=True)
+                if players[i] not in boards[i]:
+                    boards[i] = create_initial_board()
+            players[i] = 'O' if players[i] == 'X' else 'X'
+    return games * plies / (time.perf_counter() - start)
+
+
+def bench_batch(games, plies, seed):
+    """engines.rules_batch, all boards per call."""
+    rng = np.random.default_rng(seed)
+    initial = GameState.from_board(create_initial_board(), 'X').get_vector()
+    boards = np.tile(np.array(initial, dtype=np.int8), (games, 1))
+    players = np.ones(games, dtype=np.int8)
+    start = time.perf_counter()
+    for _ in range(plies):
+        rolls = batch_throw_sticks(games, rng)
+        masks = batch_valid_move_masks(boards, players, rolls)
+        choices = batch_random_moves(masks, rng)
+        batch_apply_moves(boards, players, rolls, choices, out=boards)
+        finished = batch_winners(boards) != 0
+        boards[finished] = initial
+        players = -players
+    return games * plies / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--boards', type=int, default=4096)
+    parser.add_argument('--plies', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    positions = random_playout_positions(300, seed=args.seed,
+                                         min_plies=1, max_plies=200)
+    print(f"Consistency: {check_consistency(positions)} moves identical to GameState")
+
+    loop_rate = bench_loop(args.boards, args.plies, args.seed)
+    batch_rate = bench_batch(args.boards, args.plies, args.seed)
+    print(f"\nRandom self-play, {args.boards} boards x {args.plies} plies:")
+    print(f"  engines.rules loop   {loop_rate:12,.0f} plies/sec")
+    print(f"  engines.rules_batch  {batch_rate:12,.0f} plies/sec"
+          f"   ({batch_rate / loop_rate:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
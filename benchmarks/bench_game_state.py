@@ -0,0 +1,102 @@
+"""
+Benchmark: pyrsistent GameState vs BitboardGameState.
+
+Checks that both state classes generate identical moves and successors on a
+fixed position suite, then reports raw move-generation throughput and
+players.ai_pruning.AI nodes/sec with each class as the root state (the
+search itself runs on engines.search_board.SearchBoard).
+
+Run from the repository root:
+    python -m benchmarks.bench_game_state --depth 3 --positions 20
+"""
+
+import argparse
+import time
+
+from engines.game_state_pyrsistent import GameState
+from engines.game_state_bitboard import BitboardGameState
+from players.ai_pruning import AI
+from benchmarks.positions import random_playout_positions
+
+
+def check_consistency(positions):
+    """Both classes must agree on moves and resulting boards."""
+    checked = 0
+    for board, player in positions:
+        ref = GameState.from_board(board, player)
+        bit = BitboardGameState.from_board(board, player)
+        assert ref.get_board() == bit.get_board()
+        assert ref.is_terminal() == bit.is_terminal()
+        for roll in range(1, 6):
+            ref_moves = ref.get_valid_moves(roll)
+            bit_moves = bit.get_valid_moves(roll)
+            assert ref_moves == bit_moves, (board, player, roll)
+            for move in ref_moves:
+                ref_child = ref.apply_move(*move)
+                bit_child = bit.apply_move(*move)
+                assert ref_child.get_board() == bit_child.get_board(), \
+                    (board, player, move)
+                assert ref_child.get_current_player() == bit_child.get_current_player()
+                checked += 1
+    return checked
+
+
+def bench_movegen(state_class, positions, repeat):
+    """Successors generated per second (get_valid_moves + apply_move)."""
+    states = [state_class.from_board(b, p) for b, p in positions]
+    generated = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for state in states:
+            for roll in range(1, 6):
+                for move in state.get_valid_moves(roll):
+                    state.apply_move(move[0], move[1])
+                    generated += 1
+    elapsed = time.perf_counter() - start
+    return generated / elapsed
+
+
+def bench_search(state_class, positions, depth):
+    """AI search nodes/sec over the whole suite."""
+    ai = AI('X', depth)
+    nodes = 0
+    start = time.perf_counter()
+    for board, player in positions:
+        ai.clear_cache()
+        ai.player = player
+        ai.evaluator.player = player
+        ai.evaluator.opponent = 'O' if player == 'X' else 'X'
+        state = state_class.from_board(board, player)
+        for roll in (1, 2, 3):
+            ai.choose_best_move(state, roll)
+            nodes += ai.get_stats()['nodes']
+    elapsed = time.perf_counter() - start
+    return nodes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--positions', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+
+    checked = check_consistency(positions)
+    print(f"Consistency: {checked} successors identical")
+
+    print("\nMove generation (successors/sec):")
+    for state_class in (GameState, BitboardGameState):
+        rate = bench_movegen(state_class, positions, repeat=20)
+        print(f"  {state_class.__name__:<18} {rate:12,.0f}")
+
+    print(f"\nAI search, depth {args.depth} (nodes/sec):")
+    for state_class in (GameState, BitboardGameState):
+        nodes, elapsed = bench_search(state_class, positions, args.depth)
+        print(f"  {state_class.__name__:<18} {nodes / elapsed:12,.0f}"
+              f"   ({nodes} nodes in {elapsed:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: the MCTS player (players.mcts).
+
+1. Throughput: playouts/sec for each batch size on a position suite
+   (and with --workers, root parallelism on a process pool).
+2. Strength: games from the initial position between MCTS with a time
+   budget per move and players.ai_pruning.AI at a fixed depth, played
+   twice per seed (colours swapped). Games still running after MAX_PLIES
+   plies are adjudicated by pip count (squares left to bear off).
+
+Run from the repository root:
+    python -m benchmarks.bench_mcts --batch-sizes 1 16 64 256 --games 10
+"""
+
+import argparse
+import random
+import time
+
+from engines.board import OFF_BOARD, create_initial_board
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from players.ai_pruning import AI as PruningAI
+from players.mcts import AI as MCTSAI
+from benchmarks.positions import random_playout_positions
+
+MAX_PLIES = 600
+
+
+def throughput(positions, batch_size, workers, time_budget_ms):
+    ai = MCTSAI('X', time_budget_ms=time_budget_ms, batch_size=batch_size,
+                workers=workers, seed=0)
+    playouts = 0
+    seconds = 0.0
+    for board, player in positions:
+        state = GameState.from_board(board, player)
+        for roll in (2, 3):
+            if len(state.get_valid_moves(roll)) < 2:
+                continue
+            ai.choose_best_move(state, roll)
+            stats = ai.get_stats()
+            playouts += stats['playouts']
+            seconds += stats['search_time_ms'] / 1000
+    ai.close()
+    return playouts / seconds
+
+
+def pips(state, player):
+    return sum(OFF_BOARD - square for square, value in
+               enumerate(state.get_vector()) if value == player)
+
+
+def play_game(seed, players):
+    """Returns (winner symbol, adjudicated, seconds per symbol, moves per symbol)."""
+    rng = random.Random(seed)
+    rolls, weights = zip(*get_all_possible_rolls())
+    state = GameState.from_board(create_initial_board(), 'X')
+    elapsed = {'X': 0.0, 'O': 0.0}
+    moves = {'X': 0, 'O': 0}
+    for _ in range(MAX_PLIES):
+        if state.is_terminal():
+            break
+        symbol = state.get_current_player_symbol()
+        roll = rng.choices(rolls, weights=weights, k=1)[0]
+        start = time.perf_counter()
+        move = players[symbol].choose_best_move(state, roll)
+        elapsed[symbol] += time.perf_counter() - start
+        moves[symbol] += 1
+        state = state.pass_turn() if move is None else state.apply_move(*move)
+    if state.is_terminal():
+        return {1: 'X', -1: 'O'}[state.get_winner()], False, elapsed, moves
+    x_pips, o_pips = pips(state, 1), pips(state, -1)
+    winner = None if x_pips == o_pips else ('X' if x_pips < o_pips else 'O')
+    return winner, True, elapsed, moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 16, 64, 256])
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--positions', type=int, default=4)
+    parser.add_argument('--time-ms', type=float, default=500)
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+    print(f"Throughput, {args.time_ms:.0f} ms per move, {len(positions)} positions:")
+    for batch_size in args.batch_sizes:
+        rate = throughput(positions, batch_size, 0, args.time_ms)
+        print(f"  batch {batch_size:>4}  {rate:>9,.0f} playouts/sec")
+    if args.workers:
+        batch_size = args.batch_sizes[-1]
+        rate = throughput(positions, batch_size, args.workers, args.time_ms)
+        print(f"  batch {batch_size:>4}, {args.workers} workers  "
+              f"{rate:>9,.0f} playouts/sec")
+
+    if not args.games:
+        return
+    score = 0.0
+    adjudicated = 0
+    seconds = {True: 0.0, False: 0.0}
+    moves = {True: 0, False: 0}
+    for game in range(args.games):
+        for mcts_side in ('X', 'O'):
+            other = 'O' if mcts_side == 'X' else 'X'
+            players = {mcts_side: MCTSAI(mcts_side, time_budget_ms=args.time_ms,
+                                         batch_size=args.batch_sizes[-1],
+                                         workers=args.workers, seed=game),
+                       other: PruningAI(other, args.depth)}
+            winner, cut, elapsed, counts = play_game(args.seed + game, players)
+            players[mcts_side].close()
+            score += 0.5 if winner is None else winner == mcts_side
+            adjudicated += cut
+            for symbol in ('X', 'O'):
+                seconds[symbol == mcts_side] += elapsed[symbol]
+                moves[symbol == mcts_side] += counts[symbol]
+    played = 2 * args.games
+    print(f"\n{played} games, MCTS ({args.time_ms:.0f} ms/move, batch "
+          f"{args.batch_sizes[-1]}) vs ai_pruning depth {args.depth}: MCTS scores "
+          f"{score:.1f}/{played} ({score / played:.0%}), {adjudicated} adjudicated")
+    for is_mcts, label in ((True, 'MCTS'), (False, 'ai_pruning')):
+        print(f"  {label:<11} {seconds[is_mcts] / max(1, moves[is_mcts]) * 1000:7.1f} ms/move")
+
+
+if __name__ == '__main__':
+    main()
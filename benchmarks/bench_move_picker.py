@@ -0,0 +1,140 @@
+"""
+Benchmark: staged move picker (AI(staged_moves=True)) against the list
+ordering of every move up front (staged_moves=False).
+
+1. Allocations per decision node, with tracemalloc: for decision nodes
+   taken from the position suite (after one move of every root move, all
+   five rolls), the peak memory allocated while the moves are ordered and
+   the first one is taken (a cutoff on the first move, the common case)
+   or all of them are taken. The AI has searched the position first, so
+   the TT move, history and killers are those a real search would see.
+2. Search: nodes, time, first-move cutoff share and peak traced memory
+   of full searches, plus how many chosen moves agree.
+
+Run from the repository root:
+    python -m benchmarks.bench_move_picker --depth 4 --positions 6
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from engines.search_board import SearchBoard
+from players.ai_pruning import AI, _TT_ROLL_KEYS
+from benchmarks.positions import random_playout_positions
+
+CONFIGS = (
+    ('list order', {'staged_moves': False}),
+    ('staged', {'staged_moves': True}),
+)
+
+ROLLS = (1, 2, 3)
+
+
+def decision_nodes(positions, depth):
+    """[(ai, board, roll, tt_move)] one ply below each root, with a searched AI."""
+    nodes = []
+    for board, player in positions:
+        ai = AI(player, depth)
+        state = GameState.from_board(board, player)
+        ai.choose_best_move(state, 2)
+        for move in state.get_valid_moves(2):
+            child = SearchBoard.from_state(state.apply_move(move[0], move[1]))
+            for roll, _ in get_all_possible_rolls():
+                if len(child.get_valid_moves(roll)) > 1:
+                    # Opponent (Min) nodes below the root
+                    entry = ai.transposition_table.probe(
+                        ai._tt_key(child, False) ^ _TT_ROLL_KEYS[roll])
+                    tt_move = entry[3] if entry is not None else None
+                    nodes.append((ai, child, roll, tt_move))
+    return nodes
+
+
+def ordering_allocations(nodes, staged, take_all):
+    """Mean and max peak bytes allocated to order one node's moves."""
+    peaks = []
+    tracemalloc.start()
+    for ai, board, roll, tt_move in nodes:
+        moves = board.get_valid_moves(roll)
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        if staged:
+            picker = ai._pick_moves(moves, board, tt_move, roll, 1)
+        else:
+            picker = iter(ai._order_moves(moves, board, tt_move, roll, 1))
+        if take_all:
+            for _ in picker:
+                pass
+        else:
+            next(picker)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        del picker
+    tracemalloc.stop()
+    return sum(peaks) / len(peaks), max(peaks)
+
+
+def search(options, positions, depth, traced):
+    nodes = 0
+    moves = []
+    elapsed = 0.0
+    cutoffs = 0
+    first_move = 0.0
+    peak = 0
+    for board, player in positions:
+        ai = AI(player, depth, **options)
+        state = GameState.from_board(board, player)
+        for roll in ROLLS:
+            ai.clear_cache()
+            if traced:
+                tracemalloc.start()
+            start = time.perf_counter()
+            moves.append(ai.choose_best_move(state, roll))
+            elapsed += time.perf_counter() - start
+            if traced:
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            stats = ai.get_stats()
+            nodes += stats['nodes']
+            cutoffs += stats['decision_cutoffs']
+            first_move += stats['first_move_cutoff_rate'] * stats['decision_cutoffs']
+    return {'nodes': nodes, 'moves': moves, 'seconds': elapsed, 'peak': peak,
+            'first_rate': first_move / cutoffs if cutoffs else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--positions', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+
+    nodes = decision_nodes(positions, 3)
+    print(f"\nBytes allocated to order the moves, {len(nodes)} decision nodes:")
+    print(f"  {'config':<12}{'first move':>20}{'all moves':>20}")
+    for name, options in CONFIGS:
+        staged = options['staged_moves']
+        first_mean, first_max = ordering_allocations(nodes, staged, False)
+        all_mean, all_max = ordering_allocations(nodes, staged, True)
+        print(f"  {name:<12}{first_mean:>10.0f} (max {first_max:>4})"
+              f"{all_mean:>10.0f} (max {all_max:>4})")
+
+    print(f"\nDepth {args.depth}, {len(positions)} positions x rolls {ROLLS}:")
+    print(f"  {'config':<12}{'nodes':>10}{'time':>9}{'1st cut':>9}"
+          f"{'peak KB':>9}  same moves")
+    base_moves = None
+    for name, options in CONFIGS:
+        result = search(options, positions, args.depth, traced=False)
+        peak = search(options, positions, args.depth, traced=True)['peak']
+        if base_moves is None:
+            base_moves = result['moves']
+        same = sum(a == b for a, b in zip(result['moves'], base_moves))
+        print(f"  {name:<12}{result['nodes']:>10}{result['seconds']:>8.2f}s"
+              f"{result['first_rate']:>9.0%}{peak / 1024:>9.0f}"
+              f"  {same}/{len(base_moves)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: opening book lookups (players.opening_book).
+
+Reports the cost of OpeningBook.probe for hits and misses, then plays the
+first --plies plies of seeded AI-vs-AI games from the initial position
+with and without the book and prints the AI think time and book hits.
+
+Build the book first:
+    python -m players.opening_book --plies 2 --depth 5
+
+Run from the repository root:
+    python -m benchmarks.bench_opening_book --games 20 --depth 3
+"""
+
+import argparse
+import random
+import time
+
+from engines.board import create_initial_board
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from players.ai_pruning import AI
+from players.opening_book import OPENING_BOOK_FILE, OpeningBook, reachable_positions
+
+
+def probe_cost(book, plies, repeat=2000):
+    keys = [(state.get_zobrist_key(), roll)
+            for state in reachable_positions(plies)
+            for roll, _ in get_all_possible_rolls()]
+    hits = [k for k in keys if book.probe(*k) is not None]
+    misses = [(key ^ 0x5A5A5A5A, roll) for key, roll in keys]
+    costs = []
+    for sample in (hits, misses):
+        sample = (sample * (repeat // max(1, len(sample)) + 1))[:repeat]
+        start = time.perf_counter()
+        for key, roll in sample:
+            book.probe(key, roll)
+        costs.append((time.perf_counter() - start) / repeat * 1e6)
+    return costs
+
+
+def play_openings(games, plies, depth, book_path, seed):
+    rolls, weights = zip(*get_all_possible_rolls())
+    players = {symbol: AI(symbol, depth, opening_book=book_path)
+               for symbol in ('X', 'O')}
+    elapsed = 0.0
+    searches = 0
+    for game in range(games):
+        rng = random.Random(seed + game)
+        state = GameState.from_board(create_initial_board(), 'X')
+        for _ in range(plies):
+            roll = rng.choices(rolls, weights=weights, k=1)[0]
+            ai = players[state.get_current_player_symbol()]
+            start = time.perf_counter()
+            move = ai.choose_best_move(state, roll)
+            elapsed += time.perf_counter() - start
+            if move is None:
+                state = state.pass_turn()
+                continue
+            searches += 1
+            state = state.apply_move(move[0], move[1])
+    hits = sum(ai.get_stats()['book_hits'] for ai in players.values())
+    return elapsed, searches, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--book', default=OPENING_BOOK_FILE)
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    book = OpeningBook(args.book)
+    print(f"{args.book}: {len(book)} entries, depth {book.depth}, "
+          f"first {book.plies} plies")
+    hit_us, miss_us = probe_cost(book, book.plies)
+    print(f"  probe: hit {hit_us:.1f} us, miss {miss_us:.1f} us")
+
+    print(f"\nFirst {book.plies} plies of {args.games} games, AI depth {args.depth}:")
+    for label, path in (('no book', None), ('book', args.book)):
+        elapsed, moves, hits = play_openings(args.games, book.plies, args.depth,
+                                             path, args.seed)
+        print(f"  {label:<8} {moves} moves, {hits} book hits, "
+              f"{elapsed * 1000:.1f} ms AI time")
+
+
+if __name__ == '__main__':
+    main()
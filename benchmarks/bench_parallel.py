@@ -0,0 +1,94 @@
+"""
+Benchmark: root-parallel search (players.ai_pruning.AI with workers > 1).
+
+For each depth, runs the serial AI and the parallel AI with every worker
+count in --workers over the same position suite and prints time, speedup
+against the serial search, total nodes (search overhead: workers prune
+with a shared alpha that arrives late, and each has its own transposition
+table) and how many chosen moves agree with the serial search.
+
+With --shared-tt every worker count is run a second time with all
+workers attached to one SharedTranspositionTable instead of private
+tables.
+
+The pool of each AI is started by a warm-up search of WARM_UP_NODES
+nodes (the first iterations) before timing, as it would be after the first move of a game. The speedup is
+bounded by the number of cores: on a single-core machine every row only
+shows the pool overhead.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel --depths 3 4 5 --workers 1 2 4 8
+    python -m benchmarks.bench_parallel --depths 4 --shared-tt
+"""
+
+import argparse
+import os
+import time
+
+from engines.game_state_pyrsistent import GameState
+from players.ai_pruning import AI
+from benchmarks.positions import random_playout_positions
+
+ROLLS = (1, 2, 3)
+
+WARM_UP_NODES = 200
+
+
+def run(positions, depth, options):
+    players = {symbol: AI(symbol, depth, **options) for symbol in ('X', 'O')}
+    board, _ = positions[0]
+    for symbol, ai in players.items():
+        ai.choose_best_move(GameState.from_board(board, symbol), ROLLS[0],
+                            node_budget=WARM_UP_NODES)
+        ai.clear_cache()
+
+    moves = []
+    nodes = 0
+    start = time.perf_counter()
+    for board, player in positions:
+        ai = players[player]
+        state = GameState.from_board(board, player)
+        for roll in ROLLS:
+            before = ai.get_stats()['nodes']
+            moves.append(ai.choose_best_move(state, roll))
+            nodes += ai.get_stats()['nodes'] - before
+    elapsed = time.perf_counter() - start
+    for ai in players.values():
+        ai.close()
+    return moves, nodes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depths', type=int, nargs='+', default=[3, 4])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--split', choices=('move', 'roll'), default='move')
+    parser.add_argument('--shared-tt', action='store_true')
+    parser.add_argument('--positions', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+    print(f"{os.cpu_count()} CPUs, split by {args.split}")
+
+    for depth in args.depths:
+        print(f"\nDepth {depth}, {len(positions)} positions x rolls {ROLLS}:")
+        print(f"  {'search':<12}{'time':>9}{'speedup':>9}{'nodes':>11}  same moves")
+        base_moves, base_nodes, base_time = run(positions, depth, {})
+        print(f"  {'serial':<12}{base_time:>8.2f}s{1.0:>8.2f}x{base_nodes:>11}"
+              f"  {len(base_moves)}/{len(base_moves)}")
+        tables = (False, True) if args.shared_tt else (False,)
+        for shared in tables:
+            for workers in args.workers:
+                # 1 worker still goes through the pool (measures its overhead)
+                options = {'workers': workers, 'parallel_split': args.split,
+                           'shared_tt': shared}
+                moves, nodes, elapsed = run(positions, depth, options)
+                same = sum(a == b for a, b in zip(moves, base_moves))
+                label = f"{workers} workers" + (" sh" if shared else "")
+                print(f"  {label:<12}{elapsed:>8.2f}s"
+                      f"{base_time / elapsed:>8.2f}x{nodes:>11}  {same}/{len(moves)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: transposition-table reuse across turns in AI-vs-AI games.
+
+Plays full games between two players.ai_pruning.AI instances with seeded
+dice, once with the table kept for the whole game (persistent_tt=True)
+and once with it cleared before every move, and reports cumulative search
+nodes and time per game, plus how many TT hits came from entries written
+by an earlier move. Choices can differ slightly between the two runs (a
+reused entry may be deeper than the current search), so games can diverge
+after a while; nodes per move are shown as well. Games still running
+after MAX_PLIES plies are stopped there (evenly matched AIs often park
+pieces on the House of Happiness for a long time).
+
+Run from the repository root:
+    python -m benchmarks.bench_persistent_tt --games 3 --depth 3
+"""
+
+import argparse
+import random
+import time
+
+from engines.board import create_initial_board
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from players.ai_pruning import AI
+
+MAX_PLIES = 300
+
+
+def play_game(seed, depth, persistent):
+    """
+    Returns:
+        dict: nodes, moves (searches), seconds, reused TT hits, TT hits
+    """
+    rng = random.Random(seed)
+    rolls, weights = zip(*get_all_possible_rolls())
+    players = {symbol: AI(symbol, depth, persistent_tt=persistent)
+               for symbol in ('X', 'O')}
+
+    state = GameState.from_board(create_initial_board(), 'X')
+    searches = 0
+    elapsed = 0.0
+    for _ in range(MAX_PLIES):
+        if state.is_terminal():
+            break
+        roll = rng.choices(rolls, weights=weights, k=1)[0]
+        ai = players[state.get_current_player_symbol()]
+        start = time.perf_counter()
+        move = ai.choose_best_move(state, roll)
+        elapsed += time.perf_counter() - start
+        if move is None:
+            state = state.pass_turn()
+            continue
+        searches += 1
+        state = state.apply_move(move[0], move[1])
+
+    stats = [ai.get_stats() for ai in players.values()]
+    return {
+        'nodes': sum(s['nodes'] for s in stats),
+        'moves': searches,
+        'seconds': elapsed,
+        'reused_hits': sum(s['tt_reused_hits'] for s in stats),
+        'tt_hits': sum(s['tt_hits'] for s in stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--games', type=int, default=3)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"\nAI vs AI, depth {args.depth}:")
+    print(f"  {'game':<6}{'mode':<12}{'moves':>7}{'nodes':>11}{'nodes/move':>12}"
+          f"{'time':>9}{'reused hits':>13}")
+    totals = {True: 0, False: 0}
+    for game in range(args.games):
+        for persistent in (False, True):
+            result = play_game(args.seed + game, args.depth, persistent)
+            totals[persistent] += result['nodes']
+            mode = 'persistent' if persistent else 'cleared'
+            print(f"  {game:<6}{mode:<12}{result['moves']:>7}{result['nodes']:>11}"
+                  f"{result['nodes'] / max(1, result['moves']):>12.0f}"
+                  f"{result['seconds']:>8.1f}s{result['reused_hits']:>13}")
+
+    print(f"\nCumulative nodes: cleared {totals[False]}, persistent {totals[True]} "
+          f"({totals[True] / totals[False]:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: AI.choose_policy (all five rolls in one search) against five
+separate choose_best_move calls.
+
+For every position of the suite the answer to each roll is computed three
+ways: five independent searches (table cleared before each), five
+searches in a row on one AI (the table is kept between them, as in a
+game), and one choose_policy call. Prints nodes and time per mode and how
+many moves agree with the independent searches.
+
+Run from the repository root:
+    python -m benchmarks.bench_policy --depths 3 4 --positions 6
+"""
+
+import argparse
+import time
+
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from players.ai_pruning import AI
+from benchmarks.positions import random_playout_positions
+
+ROLLS = [roll for roll, _ in get_all_possible_rolls()]
+
+
+def separate(ai, state, clear):
+    policy = {}
+    nodes = 0
+    for roll in ROLLS:
+        if clear:
+            ai.clear_cache()
+        before = ai.nodes_evaluated
+        policy[roll] = ai.choose_best_move(state, roll)
+        nodes += ai.nodes_evaluated - before
+    return policy, nodes
+
+
+def combined(ai, state):
+    before = ai.nodes_evaluated
+    policy = ai.choose_policy(state)
+    return policy, ai.nodes_evaluated - before
+
+
+MODES = (
+    ('independent', lambda ai, state: separate(ai, state, True)),
+    ('sequential', lambda ai, state: separate(ai, state, False)),
+    ('choose_policy', combined),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depths', type=int, nargs='+', default=[3, 4])
+    parser.add_argument('--positions', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+    for depth in args.depths:
+        print(f"\nDepth {depth}, {len(positions)} positions x all {len(ROLLS)} rolls:")
+        print(f"  {'mode':<16}{'nodes':>10}{'vs indep':>10}{'time':>9}  same moves")
+        base = None
+        for name, run in MODES:
+            nodes = 0
+            elapsed = 0.0
+            moves = []
+            for board, player in positions:
+                ai = AI(player, depth)
+                state = GameState.from_board(board, player)
+                start = time.perf_counter()
+                policy, position_nodes = run(ai, state)
+                elapsed += time.perf_counter() - start
+                nodes += position_nodes
+                moves.extend(policy[roll] for roll in ROLLS)
+            if base is None:
+                base = (nodes, moves)
+            same = sum(a == b for a, b in zip(moves, base[1]))
+            print(f"  {name:<16}{nodes:>10}{nodes / base[0]:>9.0%}{elapsed:>8.2f}s"
+                  f"  {same}/{len(moves)}")
+
+
+if __name__ == '__main__':
+    main()
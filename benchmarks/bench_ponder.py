@@ -0,0 +1,103 @@
+"""
+Benchmark: pondering (players.ponder.Ponderer) during the human's turn.
+
+Plays games between players.ai_pruning.AI and a simulated human with
+seeded dice. The human "thinks" for --think-ms per move: half before
+throwing (pondering all rolls), half after (pondering the known roll),
+then plays the highest-priority move with probability --greedy and a
+random legal move otherwise. Each game is played twice, with and without
+pondering, and the script prints the AI's mean and total response time,
+the ponder hit rate and the time the hits saved.
+
+Run from the repository root:
+    python -m benchmarks.bench_ponder --games 2 --depth 3 --think-ms 1500
+"""
+
+import argparse
+import random
+import time
+
+from engines.board import create_initial_board
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from players.ai_pruning import AI
+from players.ponder import Ponderer
+
+MAX_PLIES = 80
+
+
+def human_move(state, roll, ai, rng, greedy):
+    moves = state.get_valid_moves(roll)
+    if rng.random() < greedy:
+        return max(moves, key=lambda m: ai._evaluate_move_priority(m, state))
+    return rng.choice(moves)
+
+
+def play_game(seed, depth, think_ms, greedy, ponder):
+    rng = random.Random(seed)
+    rolls, weights = zip(*get_all_possible_rolls())
+    ai = AI('O', depth)
+    ponderer = Ponderer(ai) if ponder else None
+    state = GameState.from_board(create_initial_board(), 'X')
+    latencies = []
+
+    for _ in range(MAX_PLIES):
+        if state.is_terminal():
+            break
+        human = state.get_current_player_symbol() == 'X'
+        if human and ponderer is not None:
+            ponderer.start(state)
+            time.sleep(think_ms / 2000)
+        roll = rng.choices(rolls, weights=weights, k=1)[0]
+        if not state.get_valid_moves(roll):
+            state = state.pass_turn()
+            continue
+
+        if human:
+            if ponderer is not None:
+                ponderer.start(state, roll)
+                time.sleep(think_ms / 2000)
+                ponderer.stop()
+            move = human_move(state, roll, ai, rng, greedy)
+        else:
+            start = time.perf_counter()
+            move = ponderer.lookup(state, roll) if ponderer is not None else None
+            if move is None:
+                move = ai.choose_best_move(state, roll)
+            latencies.append(time.perf_counter() - start)
+        state = state.apply_move(move[0], move[1])
+
+    if ponderer is not None:
+        ponderer.stop()
+        return latencies, ponderer.get_stats()
+    return latencies, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--games', type=int, default=2)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--think-ms', type=float, default=1500)
+    parser.add_argument('--greedy', type=float, default=0.7)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"\nAI depth {args.depth}, human thinks {args.think_ms:.0f} ms, "
+          f"plays the top-priority move {args.greedy:.0%} of the time:")
+    print(f"  {'game':<6}{'mode':<12}{'AI moves':>9}{'mean':>10}{'total':>9}"
+          f"{'hits':>10}{'saved':>9}")
+    for game in range(args.games):
+        for ponder in (False, True):
+            latencies, stats = play_game(args.seed + game, args.depth,
+                                         args.think_ms, args.greedy, ponder)
+            total = sum(latencies)
+            hits = saved = ''
+            if stats is not None:
+                hits = f"{stats['ponder_hits']}/{stats['ponder_lookups']}"
+                saved = f"{stats['ponder_saved_ms'] / 1000:.2f}s"
+            print(f"  {game:<6}{'ponder' if ponder else 'no ponder':<12}"
+                  f"{len(latencies):>9}{total / max(1, len(latencies)) * 1000:>8.0f}ms"
+                  f"{total:>8.2f}s{hits:>10}{saved:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: ProbCut forward pruning (AI(probcut=...)) against the plain
+search.
+
+1. Speed: nodes, time and ProbCut prunes per depth on a position suite,
+   and how often the pruned search picks the same move as the plain one.
+2. Strength: games from the initial position between the two, played
+   twice per seed (colours swapped), at a fixed depth or, with --time-ms,
+   with the same time budget per move for both (depth grows as far as the
+   budget allows). Games still running after MAX_PLIES plies are
+   adjudicated by pip count (squares left to bear off).
+
+Fit the model first (python -m players.probcut), then run from the
+repository root:
+    python -m benchmarks.bench_probcut --depths 4 5 --games 10 --time-ms 300
+"""
+
+import argparse
+import random
+import time
+
+from engines.board import OFF_BOARD, create_initial_board
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from players.ai_pruning import AI
+from players.probcut import PROBCUT_MODEL_FILE
+from benchmarks.positions import random_playout_positions
+
+MAX_PLIES = 600
+
+ROLLS = (1, 2, 3)
+
+
+def run(options, positions, depth):
+    totals = {'nodes': 0, 'probcut_prunes': 0}
+    moves = []
+    elapsed = 0.0
+    for board, player in positions:
+        ai = AI(player, depth, **options)
+        state = GameState.from_board(board, player)
+        for roll in ROLLS:
+            ai.clear_cache()
+            start = time.perf_counter()
+            moves.append(ai.choose_best_move(state, roll))
+            elapsed += time.perf_counter() - start
+            stats = ai.get_stats()
+            for name in totals:
+                totals[name] += stats[name]
+    totals['seconds'] = elapsed
+    return totals, moves
+
+
+def pips(state, player):
+    return sum(OFF_BOARD - square for square, value in
+               enumerate(state.get_vector()) if value == player)
+
+
+def play_game(seed, players):
+    """Returns (winner symbol, adjudicated, seconds per symbol, moves per symbol)."""
+    rng = random.Random(seed)
+    rolls, weights = zip(*get_all_possible_rolls())
+    state = GameState.from_board(create_initial_board(), 'X')
+    elapsed = {'X': 0.0, 'O': 0.0}
+    moves = {'X': 0, 'O': 0}
+    for _ in range(MAX_PLIES):
+        if state.is_terminal():
+            break
+        symbol = state.get_current_player_symbol()
+        roll = rng.choices(rolls, weights=weights, k=1)[0]
+        start = time.perf_counter()
+        move = players[symbol].choose_best_move(state, roll)
+        elapsed[symbol] += time.perf_counter() - start
+        moves[symbol] += 1
+        state = state.pass_turn() if move is None else state.apply_move(*move)
+    if state.is_terminal():
+        return {1: 'X', -1: 'O'}[state.get_winner()], False, elapsed, moves
+    x_pips, o_pips = pips(state, 1), pips(state, -1)
+    winner = None if x_pips == o_pips else ('X' if x_pips < o_pips else 'O')
+    return winner, True, elapsed, moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default=PROBCUT_MODEL_FILE)
+    parser.add_argument('--threshold', type=float, default=1.5)
+    parser.add_argument('--depths', type=int, nargs='+', default=[4, 5])
+    parser.add_argument('--positions', type=int, default=6)
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--game-depth', type=int, default=3)
+    parser.add_argument('--time-ms', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    probcut = {'probcut': args.model, 'probcut_threshold': args.threshold}
+    positions = random_playout_positions(args.positions, seed=args.seed)
+    for depth in args.depths:
+        print(f"\nDepth {depth}, {len(positions)} positions x rolls {ROLLS}:")
+        print(f"  {'config':<10} {'nodes':>10} {'vs plain':>9} {'prunes':>8} "
+              f"{'time':>8}  same moves")
+        base, base_moves = run({}, positions, depth)
+        pruned, moves = run(probcut, positions, depth)
+        same = sum(a == b for a, b in zip(moves, base_moves))
+        for name, totals in (('plain', base), ('probcut', pruned)):
+            print(f"  {name:<10} {totals['nodes']:>10} "
+                  f"{totals['nodes'] / base['nodes']:>8.0%} "
+                  f"{totals['probcut_prunes']:>8} {totals['seconds']:>7.2f}s"
+                  f"  {same if name == 'probcut' else len(moves)}/{len(moves)}")
+
+    if not args.games:
+        return
+    if args.time_ms is None:
+        depth, budget = args.game_depth, {}
+        label = f"depth {depth}"
+    else:
+        depth, budget = 20, {'time_budget_ms': args.time_ms}
+        label = f"{args.time_ms:.0f} ms/move"
+    score = 0.0
+    adjudicated = 0
+    seconds = {True: 0.0, False: 0.0}
+    moves = {True: 0, False: 0}
+    for game in range(args.games):
+        for probcut_side in ('X', 'O'):
+            other = 'O' if probcut_side == 'X' else 'X'
+            players = {probcut_side: AI(probcut_side, depth, **budget, **probcut),
+                       other: AI(other, depth, **budget)}
+            winner, cut, elapsed, counts = play_game(args.seed + game, players)
+            score += 0.5 if winner is None else winner == probcut_side
+            adjudicated += cut
+            for symbol in ('X', 'O'):
+                seconds[symbol == probcut_side] += elapsed[symbol]
+                moves[symbol == probcut_side] += counts[symbol]
+    played = 2 * args.games
+    print(f"\n{played} games, {label}, ProbCut (threshold {args.threshold}) vs plain: "
+          f"ProbCut scores {score:.1f}/{played} ({score / played:.0%}), "
+          f"{adjudicated} adjudicated")
+    for is_probcut, name in ((True, 'probcut'), (False, 'plain')):
+        print(f"  {name:<8} {seconds[is_probcut] / max(1, moves[is_probcut]) * 1000:7.1f} ms/move")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: chance-node pruning variants of players.ai_pruning.AI.
+
+Runs every configuration in CONFIGS over the same position suite at each
+requested depth and reports nodes, Star1 / Star2 cutoffs, aspiration
+re-searches and time, plus the node reduction against the first
+configuration. Options not given use the AI defaults.
+
+Run from the repository root:
+    python -m benchmarks.bench_pruning --depths 3 4 5 --positions 6
+"""
+
+import argparse
+import time
+
+from engines.game_state_pyrsistent import GameState
+from players.ai_pruning import AI
+from benchmarks.positions import random_playout_positions
+
+CONFIGS = (
+    ('Star1', {'star2': False, 'bounds': 'global'}),
+    ('Star1+Star2', {'star2': True, 'bounds': 'global'}),
+    ('Star1 position', {'star2': False, 'bounds': 'position'}),
+    ('Star2 position', {'star2': True, 'bounds': 'position'}),
+    ('+ aspiration 250', {'aspiration_window': 250}),
+    ('+ aspiration 1000', {'aspiration_window': 1000}),
+    ('+ aspiration 4000', {'aspiration_window': 4000}),
+)
+
+ROLLS = (1, 2, 3)
+
+
+def run(options, positions, depth):
+    totals = {'nodes': 0, 'star1_cutoffs': 0, 'star2_cutoffs': 0,
+              'star2_probes': 0, 'aspiration_researches': 0}
+    moves = []
+    elapsed = 0.0
+    for board, player in positions:
+        ai = AI(player, depth, **options)
+        state = GameState.from_board(board, player)
+        for roll in ROLLS:
+            ai.clear_cache()
+            start = time.perf_counter()
+            moves.append(ai.choose_best_move(state, roll))
+            elapsed += time.perf_counter() - start
+            stats = ai.get_stats()
+            for name in totals:
+                totals[name] += stats[name]
+    totals['seconds'] = elapsed
+    return totals, moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depths', type=int, nargs='+', default=[3, 4])
+    parser.add_argument('--positions', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+
+    for depth in args.depths:
+        print(f"\nDepth {depth}, {len(positions)} positions x rolls {ROLLS}:")
+        print(f"  {'config':<18} {'nodes':>10} {'vs base':>8} {'star1':>8} "
+              f"{'star2':>8} {'probes':>8} {'re-srch':>8} {'time':>8}  same moves")
+        base_nodes = None
+        base_moves = None
+        for name, options in CONFIGS:
+            totals, moves = run(options, positions, depth)
+            if base_nodes is None:
+                base_nodes, base_moves = totals['nodes'], moves
+            same = sum(a == b for a, b in zip(moves, base_moves))
+            print(f"  {name:<18} {totals['nodes']:>10} "
+                  f"{totals['nodes'] / base_nodes:>7.0%} "
+                  f"{totals['star1_cutoffs']:>8} {totals['star2_cutoffs']:>8} "
+                  f"{totals['star2_probes']:>8} {totals['aspiration_researches']:>8} "
+                  f"{totals['seconds']:>7.2f}s"
+                  f"  {same}/{len(moves)}")
+
+
+if __name__ == '__main__':
+    main()
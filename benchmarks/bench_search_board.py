@@ -0,0 +1,102 @@
+"""
+Benchmark: SearchBoard make/unmake vs immutable state successors.
+
+Checks that make_move matches GameState.apply_move (board and Zobrist key)
+and that unmake_move restores the position exactly, then compares a
+fixed-depth perft-style tree walk with both representations.
+
+Run from the repository root:
+    python -m benchmarks.bench_search_board --depth 3
+"""
+
+import argparse
+import time
+
+from engines.game_state_pyrsistent import GameState
+from engines.game_state_bitboard import BitboardGameState
+from engines.search_board import SearchBoard
+from benchmarks.positions import random_playout_positions
+
+ROLLS = (1, 2, 3, 4, 5)
+
+
+def check_consistency(positions):
+    checked = 0
+    for board, player in positions:
+        state = GameState.from_board(board, player)
+        search = SearchBoard.from_state(state)
+        before = (list(search.cells), search.get_zobrist_key())
+        for roll in ROLLS:
+            assert search.get_valid_moves(roll) == state.get_valid_moves(roll)
+            for move in state.get_valid_moves(roll):
+                child = state.apply_move(*move)
+                search.make_move(*move)
+                assert search.cells == child.get_board(), (board, player, move)
+                assert search.get_zobrist_key() == child.get_zobrist_key()
+                assert search.get_current_player() == child.get_current_player()
+                search.unmake_move()
+                assert (search.cells, search.get_zobrist_key()) == before
+                checked += 1
+    return checked
+
+
+def perft_state(state, depth):
+    if depth == 0 or state.is_terminal():
+        return 1
+    nodes = 0
+    for roll in ROLLS:
+        moves = state.get_valid_moves(roll)
+        if not moves:
+            nodes += perft_state(state.pass_turn(), depth - 1)
+        for move in moves:
+            nodes += perft_state(state.apply_move(move[0], move[1]), depth - 1)
+    return nodes
+
+
+def perft_search_board(board, depth):
+    if depth == 0 or board.is_terminal():
+        return 1
+    nodes = 0
+    for roll in ROLLS:
+        moves = board.get_valid_moves(roll)
+        if not moves:
+            board.make_pass()
+            nodes += perft_search_board(board, depth - 1)
+            board.unmake_move()
+        for move in moves:
+            board.make_move(move[0], move[1])
+            nodes += perft_search_board(board, depth - 1)
+            board.unmake_move()
+    return nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--positions', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    check = random_playout_positions(300, seed=args.seed, min_plies=1, max_plies=200)
+    print(f"Consistency: {check_consistency(check)} make/unmake pairs verified")
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+    print(f"\nPerft depth {args.depth} over {len(positions)} positions (nodes/sec):")
+
+    for state_class in (GameState, BitboardGameState):
+        start = time.perf_counter()
+        nodes = sum(perft_state(state_class.from_board(b, p), args.depth)
+                    for b, p in positions)
+        elapsed = time.perf_counter() - start
+        print(f"  {state_class.__name__:<18} {nodes / elapsed:12,.0f}   ({nodes} nodes)")
+
+    start = time.perf_counter()
+    nodes = sum(perft_search_board(SearchBoard.from_state(GameState.from_board(b, p)),
+                                   args.depth)
+                for b, p in positions)
+    elapsed = time.perf_counter() - start
+    print(f"  {'SearchBoard':<18} {nodes / elapsed:12,.0f}   ({nodes} nodes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: sparse chance nodes (AI(sparse_chance_mass=...)) against the
+full expectation over all five rolls.
+
+1. Cost and accuracy at a fixed depth: nodes and time of each mass, how
+   often it picks a move that is best under the full search, and the value
+   lost: the full-search value of the best move minus the full-search
+   value of the chosen move.
+2. Depth within a time budget: mean completed depth of each mass with the
+   same time_budget_ms per move.
+
+Run from the repository root:
+    python -m benchmarks.bench_sparse_chance --depth 4 --masses 0.875 0.625
+"""
+
+import argparse
+import time
+
+from engines.game_state_pyrsistent import GameState
+from engines.search_board import SearchBoard
+from evaluations.evaluation_star1 import MAX_POSSIBLE_SCORE, MIN_POSSIBLE_SCORE
+from players.ai_pruning import AI
+from benchmarks.positions import random_playout_positions
+
+ROLLS = (1, 2, 3)
+
+
+def fixed_depth(positions, depth, mass, full_plies):
+    """[(move, nodes, seconds)] per (position, roll)"""
+    results = []
+    for board, player in positions:
+        ai = AI(player, depth, sparse_chance_mass=mass,
+                full_chance_plies=full_plies)
+        state = GameState.from_board(board, player)
+        for roll in ROLLS:
+            ai.clear_cache()
+            start = time.perf_counter()
+            move = ai.choose_best_move(state, roll)
+            results.append((move, ai.get_stats()['nodes'],
+                            time.perf_counter() - start))
+    return results
+
+
+def full_values(positions, depth):
+    """{move: full-search value} per (position, roll), in fixed_depth order"""
+    values = []
+    for board, player in positions:
+        ai = AI(player, depth)
+        state = GameState.from_board(board, player)
+        for roll in ROLLS:
+            move_values = {}
+            for move in state.get_valid_moves(roll):
+                ai.clear_cache()
+                move_values[move] = ai.search_root_move(
+                    SearchBoard.from_state(state), move, depth,
+                    MIN_POSSIBLE_SCORE, MAX_POSSIBLE_SCORE)
+            values.append(move_values)
+    return values
+
+
+def budget_depth(positions, time_ms, mass, full_plies):
+    depths = []
+    for board, player in positions:
+        ai = AI(player, 20, time_budget_ms=time_ms, sparse_chance_mass=mass,
+                full_chance_plies=full_plies)
+        state = GameState.from_board(board, player)
+        for roll in ROLLS:
+            if len(state.get_valid_moves(roll)) < 2:
+                continue
+            ai.clear_cache()
+            ai.choose_best_move(state, roll)
+            depths.append(ai.get_stats()['completed_depth'])
+    return sum(depths) / len(depths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--masses', type=float, nargs='+', default=[0.875, 0.625])
+    parser.add_argument('--full-plies', type=int, default=2)
+    parser.add_argument('--positions', type=int, default=6)
+    parser.add_argument('--time-ms', type=float, default=1000)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+    configs = [None] + args.masses
+
+    print(f"Depth {args.depth}, {len(positions)} positions x rolls {ROLLS}, "
+          f"full expectation at the first {args.full_plies} chance levels:")
+    print(f"  {'mass':<6} {'nodes':>10} {'vs full':>8} {'time':>8} "
+          f"{'best':>7} {'mean loss':>10} {'max loss':>9}")
+    values = full_values(positions, args.depth)
+    base_nodes = None
+    for mass in configs:
+        results = fixed_depth(positions, args.depth, mass, args.full_plies)
+        nodes = sum(r[1] for r in results)
+        seconds = sum(r[2] for r in results)
+        if base_nodes is None:
+            base_nodes = nodes
+        losses = [max(move_values.values()) - move_values[move]
+                  for (move, _, _), move_values in zip(results, values)
+                  if move is not None and len(move_values) > 1]
+        best = sum(loss == 0 for loss in losses)
+        print(f"  {'full' if mass is None else mass:<6} {nodes:>10} "
+              f"{nodes / base_nodes:>7.0%} {seconds:>7.2f}s "
+              f"{best:>3}/{len(losses):<3} {sum(losses) / len(losses):>10.1f} "
+              f"{max(losses):>9.1f}")
+
+    print(f"\nMean completed depth, {args.time_ms:.0f} ms per move:")
+    for mass in configs:
+        depth = budget_depth(positions, args.time_ms, mass, args.full_plies)
+        print(f"  {'full' if mass is None else mass:<6} {depth:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: array-backed TranspositionTable vs a plain dict cache.
+
+The dict baseline is the old ai_pruning cache layout: a tuple key
+(zobrist, depth, roll, maximizing) mapped to a float, plus a second dict
+key -> (depth, bound, value, move) for the bounded variant. Reports memory
+per entry (tracemalloc) and the cost of store / probe calls on real
+Zobrist keys taken from random positions, then the AI search time with
+each table budget.
+
+Run from the repository root:
+    python -m benchmarks.bench_tt --entries 200000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from engines.game_state_pyrsistent import GameState
+from players.ai_pruning import AI
+from players.transposition_table import TranspositionTable, EXACT, ENTRY_BYTES
+from benchmarks.positions import random_playout_positions
+
+
+def sample_keys(count, seed):
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) | 1 for _ in range(count)]
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return table, after - before
+
+
+def build_tuple_dict(keys):
+    cache = {}
+    for i, key in enumerate(keys):
+        cache[(key, 3, 2, True)] = float(i) + 0.5
+    return cache
+
+
+def build_entry_dict(keys):
+    cache = {}
+    for i, key in enumerate(keys):
+        cache[key] = (3, EXACT, float(i) + 0.5, (i % 30, i % 30 + 1))
+    return cache
+
+
+def build_table(keys, size_mb):
+    table = TranspositionTable(size_mb=size_mb)
+    for i, key in enumerate(keys):
+        table.store(key, 3, EXACT, float(i) + 0.5, (i % 30, i % 30 + 1))
+    return table
+
+
+def time_calls(fn, keys, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for key in keys:
+            fn(key)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(keys) * 1e9
+
+
+def bench_search(positions, depth, size_mb):
+    ai = AI('X', depth, tt_size_mb=size_mb)
+    nodes = 0
+    start = time.perf_counter()
+    for board, player in positions:
+        ai.clear_cache()
+        ai.player = player
+        ai.evaluator.player = player
+        ai.evaluator.opponent = 'O' if player == 'X' else 'X'
+        state = GameState.from_board(board, player)
+        for roll in (1, 2, 3):
+            ai.choose_best_move(state, roll)
+            nodes += ai.get_stats()['nodes']
+    return nodes, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entries', type=int, default=200000)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--positions', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    keys = sample_keys(args.entries, args.seed)
+    misses = sample_keys(args.entries, args.seed + 1)
+    # Budget large enough that every sampled key finds a slot
+    size_mb = 2 * args.entries * ENTRY_BYTES / (1024 * 1024)
+
+    tuple_dict, tuple_bytes = measure_memory(lambda: build_tuple_dict(keys))
+    entry_dict, entry_bytes = measure_memory(lambda: build_entry_dict(keys))
+    table, table_bytes = measure_memory(lambda: build_table(keys, size_mb))
+
+    print(f"Memory for {args.entries} entries (bytes/entry):")
+    print(f"  {'dict[(key,depth,roll,max)]':<28} {tuple_bytes / args.entries:8.1f}")
+    print(f"  {'dict[key] -> entry tuple':<28} {entry_bytes / args.entries:8.1f}")
+    print(f"  {'TranspositionTable':<28} {table_bytes / args.entries:8.1f}"
+          f"   ({ENTRY_BYTES} per slot, {table.capacity} slots, "
+          f"{table.get_stats()['fill_rate']:.0%} full)")
+
+    print("\nCall cost (ns/call):")
+    rows = (
+        ('dict[(key,...)] get', lambda k: tuple_dict.get((k, 3, 2, True))),
+        ('dict[key] get', entry_dict.get),
+        ('TranspositionTable.probe', table.probe),
+    )
+    for name, fn in rows:
+        hit = time_calls(fn, keys)
+        miss = time_calls(fn, misses)
+        print(f"  {name:<28} hit {hit:7.0f}   miss {miss:7.0f}")
+
+    def dict_store(key):
+        entry_dict[key] = (3, EXACT, 1.0, (1, 2))
+    print(f"  {'dict[key] store':<28} {time_calls(dict_store, misses):11.0f}")
+    print(f"  {'TranspositionTable.store':<28} "
+          f"{time_calls(lambda k: table.store(k, 3, EXACT, 1.0, (1, 2)), misses):11.0f}")
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+    print(f"\nAI search, depth {args.depth}:")
+    for budget in (1, 8, 32):
+        nodes, elapsed = bench_search(positions, args.depth, budget)
+        print(f"  {budget:>3} MB   {nodes} nodes in {elapsed:.2f}s "
+              f"({nodes / elapsed:,.0f} nodes/sec)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Verify the precomputed engines.rules.MOVE_TARGETS move generation against
+the original per-piece rule checks, on random (not necessarily reachable)
+boards for every roll and both players. Also times both versions.
+
+Run from the repository root:
+    python -m benchmarks.check_move_tables --boards 200000
+"""
+
+import argparse
+import random
+import time
+
+from engines.board import (
+    HOUSE_THREE_TRUTHS, HOUSE_RE_ATUM, BOARD_SIZE, OFF_BOARD
+)
+from engines.rules import (
+    get_valid_moves, _can_bear_off, _can_pass_happiness, _can_land_on
+)
+from engines.game_state_pyrsistent import GameState
+from engines.game_state_bitboard import BitboardGameState
+
+
+def reference_valid_moves(board, player, roll):
+    """The rules.get_valid_moves implementation before MOVE_TARGETS."""
+    valid_moves = []
+
+    piece_indices = [i for i, x in enumerate(board) if x == player]
+
+    for start_pos in piece_indices:
+        target_pos = start_pos + roll
+        if (start_pos == HOUSE_THREE_TRUTHS and roll != 3) or (start_pos == HOUSE_RE_ATUM and roll != 2):
+            continue
+
+        if target_pos >= BOARD_SIZE:
+            if not _can_bear_off(start_pos, roll, target_pos):
+                continue
+            valid_moves.append((start_pos, OFF_BOARD))
+            continue
+
+        if not _can_pass_happiness(start_pos, target_pos, roll):
+            continue
+
+        if not _can_land_on(board, target_pos, player):
+            continue
+
+        valid_moves.append((start_pos, target_pos))
+
+    return valid_moves
+
+
+def random_board(rng):
+    """Up to 7 pieces per side scattered over any of the 30 squares."""
+    squares = rng.sample(range(BOARD_SIZE), rng.randint(0, 7) + rng.randint(0, 7))
+    split = rng.randint(0, len(squares))
+    board = [None] * BOARD_SIZE
+    for i in squares[:split]:
+        board[i] = 'X'
+    for i in squares[split:]:
+        board[i] = 'O'
+    return board
+
+
+def check(boards, seed):
+    rng = random.Random(seed)
+    checked = 0
+    for _ in range(boards):
+        board = random_board(rng)
+        for player in ('X', 'O'):
+            states = (GameState.from_board(board, player),
+                      BitboardGameState.from_board(board, player))
+            for roll in range(1, 6):
+                expected = reference_valid_moves(board, player, roll)
+                assert get_valid_moves(board, player, roll) == expected, \
+                    (board, player, roll)
+                for state in states:
+                    assert state.get_valid_moves(roll) == expected, \
+                        (type(state).__name__, board, player, roll)
+                checked += 1
+    return checked
+
+
+def bench(move_fn, boards):
+    start = time.perf_counter()
+    for board in boards:
+        for player in ('X', 'O'):
+            for roll in range(1, 6):
+                move_fn(board, player, roll)
+    return len(boards) * 10 / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--boards', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    checked = check(args.boards, args.seed)
+    print(f"OK: {checked} (board, player, roll) cases match the reference")
+
+    rng = random.Random(args.seed + 1)
+    sample = [random_board(rng) for _ in range(20000)]
+    print("\nrules.get_valid_moves calls/sec:")
+    print(f"  reference     {bench(reference_valid_moves, sample):12,.0f}")
+    print(f"  MOVE_TARGETS  {bench(get_valid_moves, sample):12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
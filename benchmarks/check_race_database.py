@@ -0,0 +1,170 @@
+"""
+Check: the race database (players.race_database) and its use in the search.
+
+1. Cost: win_probability() per call.
+2. Accuracy: for every 1..2-piece position of the endgame tablebase with
+   all pieces inside the race database, the race win probability against
+   the exact tablebase value, split into separated positions (one side
+   entirely ahead) and interleaved ones.
+3. Decisions: for the same positions and every roll with several moves,
+   the exact win probability lost by the move chosen one ply ahead with
+   the race database and with Evaluation.evaluate_board.
+4. Play: games from random positions with 3..k pieces per side on the
+   squares of the database, played twice (colours swapped) between
+   players.ai_pruning.AI with and without the race database. With
+   --start-pieces above k the games start outside the database and the
+   search has to compare race values with evaluations. Games still
+   running after MAX_PLIES plies are scored as draws and counted.
+
+The default race database is built on first use; a tablebase or race
+database of another size has to be built first:
+    python -m players.tablebase --pieces 2
+    python -m players.race_database --pieces 4 --output race_4.bin
+
+Run from the repository root:
+    python -m benchmarks.check_race_database --games 50 --depth 2
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from engines.board import BOARD_SIZE
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from evaluations.evaluation_star1 import Evaluation
+from players.ai_pruning import AI
+from players.race_database import RACE_DATABASE_FILE, load_race_database
+from players.tablebase import TABLEBASE_FILE, Tablebase
+
+MAX_PLIES = 400
+
+
+def make_state(mine, theirs):
+    vector = [0] * BOARD_SIZE
+    for square in mine:
+        vector[square] = 1
+    for square in theirs:
+        vector[square] = -1
+    return GameState(vector, 1)
+
+
+def split(vector):
+    return ([s for s, v in enumerate(vector) if v == 1],
+            [s for s, v in enumerate(vector) if v == -1])
+
+
+def decision_loss(state, tablebase, race, evaluator):
+    """(exact loss of the race move, of the evaluation move) per roll."""
+    losses = []
+    for roll, _ in get_all_possible_rolls():
+        moves = state.get_valid_moves(roll)
+        if len(moves) < 2:
+            continue
+        scored = []
+        for move in moves:
+            child = state.apply_move(*move)
+            child_mine, child_theirs = split(child.get_vector())
+            if not child_mine:
+                scored.append((1.0, 1.0, float('inf')))
+                continue
+            scored.append((1 - tablebase.probe(child_theirs, child_mine),
+                           1 - race.win_probability(child_theirs, child_mine),
+                           evaluator.evaluate_board(child.get_board())))
+        best = max(s[0] for s in scored)
+        losses.append((best - max(scored, key=lambda s: s[1])[0],
+                       best - max(scored, key=lambda s: s[2])[0]))
+    return losses
+
+
+def random_race_position(rng, race, pieces):
+    start = race.index.start
+    counts = [rng.randint(*pieces) for _ in range(2)]
+    squares = rng.sample(range(start, BOARD_SIZE), sum(counts))
+    return sorted(squares[:counts[0]]), sorted(squares[counts[0]:])
+
+
+def play(mine, theirs, depth, race_path, race_side, rng):
+    state = make_state(mine, theirs)
+    players = {symbol: AI(symbol, depth, race_database=race_path
+                          if symbol == race_side else None)
+               for symbol in ('X', 'O')}
+    rolls, weights = zip(*get_all_possible_rolls())
+    for _ in range(MAX_PLIES):
+        if state.is_terminal():
+            break
+        symbol = state.get_current_player_symbol()
+        roll = rng.choices(rolls, weights=weights, k=1)[0]
+        move = players[symbol].choose_best_move(state, roll)
+        state = state.pass_turn() if move is None else state.apply_move(*move)
+    winner = state.get_winner() if state.is_terminal() else 0
+    return {1: 'X', -1: 'O'}.get(winner)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--race-database', default=RACE_DATABASE_FILE)
+    parser.add_argument('--tablebase', default=TABLEBASE_FILE)
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--start-pieces', type=int, nargs=2, default=None,
+                        metavar=('MIN', 'MAX'))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    race = load_race_database(args.race_database)
+    if race is None:
+        parser.error(f"{args.race_database} not found")
+    tablebase = Tablebase(args.tablebase)
+    start_square = race.index.start
+    print(f"{args.race_database}: {len(race)} configurations of up to "
+          f"{race.pieces} pieces on squares {start_square + 1}-{BOARD_SIZE}, "
+          f"{race.turns} turns")
+
+    pairs = [tablebase.index.unrank(i) for i in range(len(tablebase))]
+    pairs = [(m, t) for m, t in pairs if min(m + t) >= start_square]
+    start = time.perf_counter()
+    for mine, theirs in pairs:
+        race.win_probability(mine, theirs)
+    print(f"  win_probability: "
+          f"{(time.perf_counter() - start) / len(pairs) * 1e6:.1f} us per call")
+
+    errors = {True: [], False: []}
+    losses = []
+    evaluator = Evaluation('X')
+    for mine, theirs in pairs:
+        separated = mine[0] > theirs[-1] or theirs[0] > mine[-1]
+        errors[separated].append(abs(race.win_probability(mine, theirs) -
+                                     tablebase.probe(mine, theirs)))
+        losses.extend(decision_loss(make_state(mine, theirs), tablebase,
+                                    race, evaluator))
+    print(f"\nRace vs exact tablebase, {len(pairs)} positions with up to "
+          f"{tablebase.pieces} pieces per side:")
+    for separated, label in ((True, 'separated'), (False, 'interleaved')):
+        e = np.array(errors[separated])
+        print(f"  {label:<12} {len(e):>6} positions  |error| mean {e.mean():.3f}"
+              f"  p95 {np.percentile(e, 95):.3f}  max {e.max():.3f}")
+    losses = np.array(losses)
+    print(f"  {len(losses)} decisions, mean exact win probability lost: "
+          f"race {losses[:, 0].mean():.4f}, evaluation {losses[:, 1].mean():.4f}")
+
+    pieces = tuple(args.start_pieces or (3, race.pieces))
+    rng = random.Random(args.seed)
+    score = 0.0
+    unfinished = 0
+    for game in range(args.games):
+        mine, theirs = random_race_position(rng, race, pieces)
+        for race_side in ('X', 'O'):
+            winner = play(mine, theirs, args.depth, args.race_database,
+                          race_side, random.Random(args.seed + game))
+            score += 0.5 if winner is None else winner == race_side
+            unfinished += winner is None
+    played = 2 * args.games
+    print(f"\n{played} games from {pieces[0]}..{pieces[1]}-piece races at depth "
+          f"{args.depth}: race database side scores {score:.1f}/{played} "
+          f"({score / played:.0%}), {unfinished} unfinished")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Check players.ai_pruning.AI against a brute-force expectiminimax.
+
+For every position and roll of a fixed suite, computes the exact value of
+each root move with no pruning and no transposition table, then reports how
+often (and by how much) the AI's chosen move is worse than the best one.
+
+From depth 4 on, a position can be reached again with less remaining depth
+(pass turns, moves in a different order); the AI then reuses the deeper
+transposition-table result, so a small number of differences from the
+fixed-depth reference is expected there.
+
+Run from the repository root:
+    python -m benchmarks.check_search --depth 3 --positions 6
+"""
+
+import argparse
+import time
+
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from engines.load_weights import load_weights
+from evaluations.evaluation_star1 import Evaluation
+from players.ai_pruning import AI
+from benchmarks.positions import random_playout_positions
+
+
+def exact_chance_value(evaluator, state, depth, maximizing):
+    if depth == 0 or state.is_terminal():
+        return evaluator.evaluate_board(state.get_board())
+    return sum(prob * exact_decision_value(evaluator, state, depth, roll, maximizing)
+               for roll, prob in get_all_possible_rolls())
+
+
+def exact_decision_value(evaluator, state, depth, roll, maximizing):
+    if depth <= 0 or state.is_terminal():
+        return evaluator.evaluate_board(state.get_board())
+    moves = state.get_valid_moves(roll)
+    if not moves:
+        return exact_chance_value(evaluator, state.pass_turn(), depth - 1,
+                                  not maximizing)
+    values = [exact_chance_value(evaluator, state.apply_move(*move), depth - 1,
+                                 not maximizing)
+              for move in moves]
+    return max(values) if maximizing else min(values)
+
+
+def exact_root_values(evaluator, state, depth, roll):
+    return {move: exact_chance_value(evaluator, state.apply_move(*move),
+                                     depth - 1, False)
+            for move in state.get_valid_moves(roll)}
+
+
+def check(ai_factory, positions, depth, rolls=(1, 2, 3, 4)):
+    """
+    Returns:
+        dict: searches, suboptimal choices, mean / max value loss, AI nodes
+    """
+    weights = load_weights()
+    searches = 0
+    suboptimal = 0
+    total_loss = 0.0
+    max_loss = 0.0
+    nodes = 0
+    elapsed = 0.0
+
+    for board, player in positions:
+        evaluator = Evaluation(player, config=weights)
+        ai = ai_factory(player, depth)
+        state = GameState.from_board(board, player)
+        for roll in rolls:
+            if len(state.get_valid_moves(roll)) < 2:
+                continue
+            values = exact_root_values(evaluator, state, depth, roll)
+            start = time.perf_counter()
+            move = ai.choose_best_move(state, roll)
+            elapsed += time.perf_counter() - start
+            loss = max(values.values()) - values[tuple(move)]
+            searches += 1
+            if loss > 1e-6:
+                suboptimal += 1
+                total_loss += loss
+                max_loss = max(max_loss, loss)
+        nodes += ai.get_stats()['nodes']
+
+    return {
+        'searches': searches,
+        'suboptimal': suboptimal,
+        'mean_loss': total_loss / searches if searches else 0.0,
+        'max_loss': max_loss,
+        'nodes': nodes,
+        'seconds': elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--positions', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    positions = random_playout_positions(args.positions, seed=args.seed)
+    result = check(lambda player, depth: AI(player, depth), positions, args.depth)
+    print(f"\nDepth {args.depth}: {result['suboptimal']}/{result['searches']} "
+          f"suboptimal choices, mean loss {result['mean_loss']:.1f}, "
+          f"max loss {result['max_loss']:.1f}, {result['nodes']} nodes, "
+          f"{result['seconds']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
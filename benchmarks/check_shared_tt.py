@@ -0,0 +1,112 @@
+"""
+Check: concurrent access to players.shared_transposition_table.
+
+Starts several processes that hammer one SharedTranspositionTable with
+stores and probes over an overlapping key set (so they keep overwriting
+the same buckets). Every stored entry is a pure function of its key, so a
+probe hit whose depth, bound, value or move does not match the key is a
+torn entry that slipped past the checksum; the script reports those
+(expected 0). A single-core machine rarely interleaves writes, so the
+script also tears entries on purpose (rewrites one word of a stored slot)
+and checks they read as misses. Ends with the per-call cost against the
+private TranspositionTable.
+
+Run from the repository root:
+    python -m benchmarks.check_shared_tt --processes 4 --ops 200000
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from players.shared_transposition_table import (
+    SharedTranspositionTable, HEADER_WORDS, SLOT_WORDS)
+from players.transposition_table import TranspositionTable
+
+
+def entry_for(key):
+    """(depth, bound, value, move) derived from the key alone."""
+    return (key % 40 + 1, key % 3, (key % 100003) / 7.0,
+            (key % 30, (key >> 8) % 31))
+
+
+def hammer(name, keys, ops, seed):
+    table = SharedTranspositionTable(name=name)
+    rng = random.Random(seed)
+    torn = hits = 0
+    for _ in range(ops):
+        key = rng.choice(keys)
+        if rng.random() < 0.5:
+            table.store(key, *entry_for(key))
+        else:
+            entry = table.probe(key)
+            if entry is not None:
+                hits += 1
+                if entry != entry_for(key):
+                    torn += 1
+    table.close()
+    return torn, hits
+
+
+def time_calls(table, keys):
+    start = time.perf_counter()
+    for key in keys:
+        table.store(key, *entry_for(key))
+    stored = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        table.probe(key)
+    probed = time.perf_counter() - start
+    return stored / len(keys) * 1e9, probed / len(keys) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--ops', type=int, default=200000)
+    parser.add_argument('--keys', type=int, default=20000)
+    parser.add_argument('--size-mb', type=float, default=0.25)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = [rng.getrandbits(64) or 1 for _ in range(args.keys)]
+    table = SharedTranspositionTable(size_mb=args.size_mb)
+    print(f"{table.capacity} slots, {args.keys} keys, {args.processes} processes "
+          f"x {args.ops} ops")
+    try:
+        with ProcessPoolExecutor(max_workers=args.processes) as executor:
+            results = list(executor.map(
+                hammer, [table.name] * args.processes,
+                [keys] * args.processes, [args.ops] * args.processes,
+                range(args.processes)))
+        torn = sum(r[0] for r in results)
+        hits = sum(r[1] for r in results)
+        print(f"  probe hits {hits}, torn entries returned {torn}")
+        print(f"  fill rate {table.get_stats()['fill_rate']:.0%}")
+
+        # Simulated torn writes: one word of each slot from another entry
+        table.clear()
+        words = table._words
+        torn_slots = range(HEADER_WORDS, HEADER_WORDS + table.capacity * SLOT_WORDS,
+                           SLOT_WORDS)
+        for key in keys:
+            table.store(key, *entry_for(key))
+        for n, i in enumerate(torn_slots):
+            words[i + 1 + n % 2] ^= 1 << (n % 64)
+        survivors = sum(table.probe(key) is not None for key in keys)
+        print(f"  after tearing every slot: {survivors} of {len(keys)} keys still hit")
+
+        print("\nCall cost (ns/call), single process:")
+        for label, other in (('TranspositionTable', TranspositionTable(args.size_mb)),
+                             ('SharedTranspositionTable', table)):
+            other.clear()
+            store_ns, probe_ns = time_calls(other, keys)
+            print(f"  {label:<26} store {store_ns:6.0f}   probe {probe_ns:6.0f}")
+    finally:
+        table.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Check: the endgame tablebase (players.tablebase) and its use in the search.
+
+1. Ranking: unrank / rank round trip over a sample of indices.
+2. Values: for random positions, the stored win probability against a
+   one-step backup computed with GameState moves and the stored values of
+   the children (residual of the value-iteration fixed point, expected to
+   be at the uint16 quantization level).
+3. Play: endgames from random positions with at most k pieces per side
+   (--start-pieces k + 1 starts outside the tablebase, so the search has
+   to compare tablebase values with evaluations), played twice (colours
+   swapped) between players.ai_pruning.AI with and without the tablebase
+   at the same depth. Prints the score of the tablebase side, the games
+   still running after MAX_PLIES plies (scored as draws) and the mean time
+   per move of each side.
+
+Build the tablebase first:
+    python -m players.tablebase --pieces 2
+
+Run from the repository root:
+    python -m benchmarks.check_tablebase --games 20 --depth 2
+"""
+
+import argparse
+import random
+import time
+
+from engines.board import BOARD_SIZE
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from players.ai_pruning import AI
+from players.tablebase import TABLEBASE_FILE, Tablebase
+
+MAX_PLIES = 200
+
+
+def random_position(rng, pieces):
+    mine = rng.randint(1, pieces)
+    squares = rng.sample(range(BOARD_SIZE), mine + rng.randint(1, pieces))
+    return sorted(squares[:mine]), sorted(squares[mine:])
+
+
+def backup(tablebase, mine, theirs):
+    vector = [0] * BOARD_SIZE
+    for square in mine:
+        vector[square] = 1
+    for square in theirs:
+        vector[square] = -1
+    state = GameState(vector, 1)
+    value = 0.0
+    for roll, prob in get_all_possible_rolls():
+        moves = state.get_valid_moves(roll)
+        if not moves:
+            value += prob * (1 - tablebase.probe(theirs, mine))
+            continue
+        best = 0.0
+        for move in moves:
+            child = state.apply_move(move[0], move[1]).get_vector()
+            child_mine = [s for s, v in enumerate(child) if v == 1]
+            child_theirs = [s for s, v in enumerate(child) if v == -1]
+            best = max(best, 1.0 if not child_mine else
+                       1 - tablebase.probe(child_theirs, child_mine))
+        value += prob * best
+    return value
+
+
+def play(mine, theirs, depth, tablebase_path, tablebase_side, rng):
+    """X (to move) has mine; returns (winner symbol, seconds per side)."""
+    vector = [0] * BOARD_SIZE
+    for square in mine:
+        vector[square] = 1
+    for square in theirs:
+        vector[square] = -1
+    state = GameState(vector, 1)
+    players = {symbol: AI(symbol, depth, tablebase=tablebase_path
+                          if symbol == tablebase_side else None)
+               for symbol in ('X', 'O')}
+    rolls, weights = zip(*get_all_possible_rolls())
+    elapsed = {'X': [0.0, 0], 'O': [0.0, 0]}
+    for _ in range(MAX_PLIES):
+        if state.is_terminal():
+            break
+        symbol = state.get_current_player_symbol()
+        roll = rng.choices(rolls, weights=weights, k=1)[0]
+        start = time.perf_counter()
+        move = players[symbol].choose_best_move(state, roll)
+        elapsed[symbol][0] += time.perf_counter() - start
+        elapsed[symbol][1] += 1
+        state = state.pass_turn() if move is None else state.apply_move(*move)
+    winner = state.get_winner() if state.is_terminal() else 0
+    return {1: 'X', -1: 'O'}.get(winner), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tablebase', default=TABLEBASE_FILE)
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--start-pieces', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tablebase = Tablebase(args.tablebase)
+    index = tablebase.index
+    rng = random.Random(args.seed)
+    print(f"{args.tablebase}: {len(tablebase)} positions, "
+          f"up to {tablebase.pieces} pieces per side")
+
+    sample = [rng.randrange(index.size) for _ in range(args.samples)]
+    bad = sum(index.rank(*index.unrank(i)) != i for i in sample)
+    print(f"  rank(unrank(i)) != i: {bad} of {len(sample)}")
+
+    residual = max(abs(backup(tablebase, *index.unrank(i)) -
+                       tablebase.probe(*index.unrank(i))) for i in sample)
+    print(f"  largest |V - backup(V)|: {residual:.2e}")
+
+    start_pieces = args.start_pieces or tablebase.pieces
+    score = 0.0
+    unfinished = 0
+    times = {True: [0.0, 0], False: [0.0, 0]}
+    for game in range(args.games):
+        mine, theirs = random_position(rng, start_pieces)
+        for tablebase_side in ('X', 'O'):
+            winner, elapsed = play(mine, theirs, args.depth, args.tablebase,
+                                   tablebase_side, random.Random(args.seed + game))
+            if winner is None:
+                score += 0.5
+                unfinished += 1
+            elif winner == tablebase_side:
+                score += 1
+            for symbol, (seconds, moves) in elapsed.items():
+                side = times[symbol == tablebase_side]
+                side[0] += seconds
+                side[1] += moves
+    played = 2 * args.games
+    print(f"\n{played} endgames with up to {start_pieces} pieces per side at "
+          f"depth {args.depth}: tablebase side scores {score:.1f}/{played} "
+          f"({score / played:.0%}), {unfinished} unfinished")
+    for uses, label in ((True, 'with tablebase'), (False, 'without')):
+        seconds, moves = times[uses]
+        print(f"  {label:<16} {seconds / max(1, moves) * 1000:.2f} ms/move")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Fixed, seeded position suites shared by the benchmark scripts.
+Positions come from random playouts of engines.rules, so they cover the
+opening, midgame and bearing-off phases.
+"""
+
+import random
+
+from engines.board import create_initial_board
+from engines.rules import get_valid_moves, apply_move, check_win
+
+
+def random_playout_positions(count, seed=0, min_plies=10, max_plies=80):
+    """
+    Returns a list of (board, player_symbol) pairs reached by random play.
+    The same seed always gives the same suite.
+    """
+    rng = random.Random(seed)
+    rolls = [1, 2, 3, 4, 5]
+    weights = [0.25, 0.375, 0.25, 0.0625, 0.0625]
+    positions = []
+
+    while len(positions) < count:
+        board = create_initial_board()
+        player = 'X'
+        target_plies = rng.randint(min_plies, max_plies)
+
+        for _ in range(target_plies):
+            roll = rng.choices(rolls, weights=weights, k=1)[0]
+            moves = get_valid_moves(board, player, roll)
+            if moves:
+                move = rng.choice(moves)
+                board = apply_move(board, move[0], move[1], silent=True)
+                if check_win(board, player):
+                    break
+            player = 'O' if player == 'X' else 'X'
+        else:
+            positions.append((list(board), player))
+
+    return positions
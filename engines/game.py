@@ -1,21 +1,25 @@
 """Main Senet game class and game loop."""
 
 from engines.board import HOUSE_HORUS, HOUSE_OF_HAPPINESS, HOUSE_RE_ATUM, HOUSE_THREE_TRUTHS, HOUSE_WATER, OFF_BOARD, Colors, create_initial_board, print_board, print_message, print_roll, print_winner
-from engines.game_state_pyrsistent import GameState, get_flattened_vector, get_persistence_vector
+from engines.game_state_pyrsistent import get_flattened_vector, get_persistence_vector
+from engines.game_state_bitboard import create_state
 from players.player import PlayerType
 from engines.sticks import throw_sticks
 from engines.rules import get_valid_moves, apply_move, check_win
 from players.ai_pruning import AI
+from players.ponder import Ponderer
 
 
 class SenetGame:
-    def __init__(self, current_player, opponent, ai_player=None):
+    def __init__(self, current_player, opponent, ai_player=None, ponder=False):
         self.board = create_initial_board()
         self.current_player = current_player
         self.opponent = opponent
         self.game_over = False
 
         self.ai_player = ai_player
+        # Searches the AI's next positions while the human is thinking
+        self.ponderer = Ponderer(ai_player) if ai_player and ponder else None
 
     def get_state_vector(self):
         """Returns the current board state as a persistence vector."""
@@ -32,6 +36,10 @@ class SenetGame:
             player_color = c.CYAN if self.current_player == PlayerType.PLAYER else c.MAGENTA
             print(
                 f"\n  {c.BOLD}{player_color}▶ Player {self.current_player}'s turn{c.RESET}")
+            pondering = self.ponderer is not None and \
+                self.current_player != PlayerType.OPPONENT
+            if pondering:
+                self.ponderer.start(self._current_state())
             input(f"  {c.DIM}Press Enter to throw sticks...{c.RESET}")
 
             # Main loop
@@ -49,7 +57,12 @@ class SenetGame:
                     if self.ai_player and self.current_player == PlayerType.OPPONENT:
                         choice = self._get_ai_choice(roll)
                     else:
+                        if pondering:
+                            # The roll is known: ponder only its replies
+                            self.ponderer.start(self._current_state(), roll)
                         choice = self._get_player_choice(valid_moves)
+                        if pondering:
+                            self.ponderer.stop()
 
                     self.board = apply_move(
                         self.board, choice[0], choice[1], silent=False)
@@ -95,18 +108,40 @@ class SenetGame:
         c = Colors
         print(f"\n  {c.BOLD}{c.MAGENTA}AI is thinking...{c.RESET}")
 
-        # تحويل board الحالي إلى GameState
-        state = GameState.from_board(
-            board=self.board, current_player_symbol=self.current_player)
-        move = self.ai_player.choose_best_move(state, roll)
+        state = self._current_state()
+        move = None
+        if self.ponderer is not None:
+            move = self.ponderer.lookup(state, roll)
+        pondered = move is not None
+        if not pondered:
+            move = self.ai_player.choose_best_move(state, roll)
 
         print(
             f"  {c.MAGENTA}AI chose:{c.RESET} "
             f"Square {move[0] + 1} → "
             f"{'Off Board' if move[1] == OFF_BOARD else f'Square {move[1] + 1}'}"
         )
-        stats = self.ai_player.get_stats()
-        print(
-            f" AI evaluated {stats['nodes']} nodes | {stats['pruning']} prunings | {stats['tt_hits']} TT hits")
+        # A pondered answer ran no search now: get_stats() would describe the
+        # ponder thread's last search, usually of another position
+        stats = None if pondered else self.ai_player.get_stats()
+        if stats is not None and 'playouts' in stats:
+            print(
+                f" AI ran {stats['playouts']} playouts | {stats['playouts_per_sec']:.0f} playouts/sec"
+                f" | {stats['tree_nodes']} tree nodes | depth {stats['max_depth']}")
+        elif stats is not None:
+            print(
+                f" AI evaluated {stats['nodes']} nodes | {stats['pruning']} prunings | {stats['tt_hits']} TT hits"
+                f" | depth {stats.get('completed_depth', '-')}")
+        if self.ponderer is not None:
+            ponder = self.ponderer.get_stats()
+            print(
+                f" {'Pondered answer' if pondered else 'Not pondered'}"
+                f" | ponder hits {ponder['ponder_hits']}/{ponder['ponder_lookups']}"
+                f" | {ponder['ponder_saved_ms'] / 1000:.1f}s saved")
 
         return move
+
+    def _current_state(self):
+        # تحويل board الحالي إلى GameState (أو BitboardGameState حسب USE_BITBOARD_STATE)
+        return create_state(
+            board=self.board, current_player_symbol=self.current_player)
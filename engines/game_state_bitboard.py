@@ -0,0 +1,378 @@
+"""
+Bitboard-backed Senet game state.
+Each side is stored as a 30-bit integer mask (bit i = square i), so move
+generation, move application and terminal checks are plain integer
+operations instead of PVector/list scans.
+
+Drop-in alternative to engines.game_state_pyrsistent.GameState: it exposes
+the same public methods, so the AI, the terminal game and the GUI can switch
+between the two with USE_BITBOARD_STATE.
+"""
+
+from engines.board import (
+    HOUSE_WATER, HOUSE_THREE_TRUTHS, HOUSE_RE_ATUM, HOUSE_HORUS, HOUSE_REBIRTH,
+    BOARD_SIZE, OFF_BOARD
+)
+from engines.game_state_pyrsistent import GameState
+from engines.rules import MOVE_TARGETS
+from engines.zobrist import PIECE_KEYS, SIDE_KEY, compute_key
+
+# Switch used by SenetGame / SenetGUI / Trainer when building AI states
+USE_BITBOARD_STATE = True
+
+INITIAL_PIECES = 7
+
+# Squares 0..HOUSE_REBIRTH, searched backwards for a rebirth slot
+REBIRTH_MASK = (1 << (HOUSE_REBIRTH + 1)) - 1
+EXIT_HOUSES = (HOUSE_THREE_TRUTHS, HOUSE_RE_ATUM, HOUSE_HORUS)
+
+
+def _build_roll_masks():
+    """
+    Fold engines.rules.MOVE_TARGETS into per-roll masks of start squares
+    that may step forward on the board and that may bear off. Only occupancy
+    is left to check at runtime.
+    """
+    step_from = {}
+    bear_off_from = {}
+    for roll in range(1, 6):
+        step = 0
+        off = 0
+        for start_pos, target_pos in enumerate(MOVE_TARGETS[roll]):
+            if target_pos == OFF_BOARD:
+                off |= 1 << start_pos
+            elif target_pos is not None:
+                step |= 1 << start_pos
+        step_from[roll] = step
+        bear_off_from[roll] = off
+    return step_from, bear_off_from
+
+
+STEP_FROM, BEAR_OFF_FROM = _build_roll_masks()
+
+
+def _iter_bits(mask):
+    """Yield set bit indices in ascending order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _send_to_rebirth_bits(own, other, from_pos, piece_keys, key):
+    """
+    Move the piece at from_pos to the House of Rebirth, or to the first
+    empty square before it. If every square up to Rebirth is taken the piece
+    is simply removed (same behaviour as GameState._send_to_rebirth_vector).
+
+    Returns:
+        tuple: (own mask, updated Zobrist key)
+    """
+    own &= ~(1 << from_pos)
+    key ^= piece_keys[from_pos]
+    empty = ~(own | other) & REBIRTH_MASK
+    if empty:
+        rebirth_pos = empty.bit_length() - 1
+        own |= 1 << rebirth_pos
+        key ^= piece_keys[rebirth_pos]
+    return own, key
+
+
+class BitboardGameState:
+    """
+    Immutable game state stored as two 30-bit masks.
+    Same interface as GameState.
+    """
+
+    __slots__ = ('_x', '_o', '_current_player', '_zobrist_key', '_board_cache')
+
+    def __init__(self, x_bits, o_bits, current_player, zobrist_key=None):
+        """
+        Args:
+            x_bits (int): Mask of squares holding 'X' pieces
+            o_bits (int): Mask of squares holding 'O' pieces
+            current_player (int): 1 for 'X', -1 for 'O'
+            zobrist_key (int): 64-bit key if already known (set by apply_move)
+        """
+        self._x = x_bits
+        self._o = o_bits
+        self._current_player = current_player
+
+        # 64-bit Zobrist key, computed lazily for root states only
+        self._zobrist_key = zobrist_key
+
+        # Cache for board reconstruction (only when needed)
+        self._board_cache = None
+
+    @classmethod
+    def from_vector(cls, vector, current_player):
+        """
+        Create state from a 30 integer vector (1 = 'X', -1 = 'O', 0 = Empty).
+        """
+        x_bits = 0
+        o_bits = 0
+        for i, val in enumerate(vector):
+            if val == 1:
+                x_bits |= 1 << i
+            elif val == -1:
+                o_bits |= 1 << i
+        return cls(x_bits, o_bits, current_player)
+
+    @classmethod
+    def from_board(cls, board, current_player_symbol):
+        """
+        Create state from board list.
+
+        Args:
+            board (list): Board with None, 'X', 'O'
+            current_player_symbol (str): 'X' or 'O'
+
+        Returns:
+            BitboardGameState: New state instance
+        """
+        x_bits = 0
+        o_bits = 0
+        for i, cell in enumerate(board):
+            if cell == 'X':
+                x_bits |= 1 << i
+            elif cell == 'O':
+                o_bits |= 1 << i
+
+        player_int = 1 if current_player_symbol == 'X' else -1
+        return cls(x_bits, o_bits, player_int)
+
+    @classmethod
+    def from_state(cls, state):
+        """Convert any state exposing get_vector()/get_current_player()."""
+        if isinstance(state, cls):
+            return state
+        return cls.from_vector(state.get_vector(), state.get_current_player())
+
+    def to_game_state(self):
+        """Convert back to the pyrsistent GameState."""
+        return GameState(self.get_vector(), self._current_player)
+
+    def get_bits(self, player=None):
+        """Returns the raw mask for a player (1/'X' or -1/'O')."""
+        return self._x if self._player_int(player) == 1 else self._o
+
+    def get_vector(self):
+        """Returns the board as a tuple of 30 integers."""
+        x_bits = self._x
+        o_bits = self._o
+        return tuple(
+            1 if (x_bits >> i) & 1 else -1 if (o_bits >> i) & 1 else 0
+            for i in range(BOARD_SIZE)
+        )
+
+    def get_zobrist_key(self):
+        """Returns the 64-bit Zobrist key of this position."""
+        if self._zobrist_key is None:
+            self._zobrist_key = compute_key(self.get_vector(), self._current_player)
+        return self._zobrist_key
+
+    def get_current_player(self):
+        """Returns current player as integer (1 or -1)."""
+        return self._current_player
+
+    def get_current_player_symbol(self):
+        """Returns current player as symbol ('X' or 'O')."""
+        return 'X' if self._current_player == 1 else 'O'
+
+    def get_opponent_player(self):
+        """Returns opponent player as integer."""
+        return -self._current_player
+
+    def get_opponent_symbol(self):
+        """Returns opponent symbol."""
+        return 'O' if self._current_player == 1 else 'X'
+
+    def get_board(self):
+        """Reconstruct board list from the masks (cached)."""
+        if self._board_cache is None:
+            board = [None] * BOARD_SIZE
+            mask = self._x
+            while mask:
+                low = mask & -mask
+                board[low.bit_length() - 1] = 'X'
+                mask ^= low
+            mask = self._o
+            while mask:
+                low = mask & -mask
+                board[low.bit_length() - 1] = 'O'
+                mask ^= low
+            self._board_cache = board
+
+        return self._board_cache
+
+    def _player_int(self, player):
+        if player is None:
+            return self._current_player
+        if isinstance(player, str):
+            return 1 if player == 'X' else -1
+        return player
+
+    def get_piece_positions(self, player=None):
+        """Indices where the player's pieces are located."""
+        return list(_iter_bits(self.get_bits(player)))
+
+    def count_pieces(self, player=None):
+        """Number of the player's pieces on the board."""
+        return self.get_bits(player).bit_count()
+
+    def get_pieces_off_board(self, player=None):
+        """Calculate pieces that have been borne off."""
+        return INITIAL_PIECES - self.count_pieces(player)
+
+    def apply_move(self, from_pos, to_pos):
+        """
+        Apply move and return NEW state.
+
+        Args:
+            from_pos (int): Starting position (0-29)
+            to_pos (int): Target position (0-29 or OFF_BOARD=30)
+
+        Returns:
+            BitboardGameState: New state after move
+        """
+        player = self._current_player
+        if player == 1:
+            own, other = self._x, self._o
+        else:
+            own, other = self._o, self._x
+        piece_keys = PIECE_KEYS[player]
+
+        # Zobrist: piece leaves from_pos, side to move flips
+        key = self.get_zobrist_key() ^ piece_keys[from_pos] ^ SIDE_KEY
+
+        from_bit = 1 << from_pos
+        own &= ~from_bit
+
+        if to_pos < BOARD_SIZE:
+            to_bit = 1 << to_pos
+
+            # Handle attack/swap - opponent goes back to our start square
+            if other & to_bit:
+                other ^= to_bit | from_bit
+                opponent_keys = PIECE_KEYS[-player]
+                key ^= opponent_keys[to_pos] ^ opponent_keys[from_pos]
+
+            own |= to_bit
+            key ^= piece_keys[to_pos]
+
+            # Handle House of Water
+            if to_pos == HOUSE_WATER:
+                own, key = _send_to_rebirth_bits(
+                    own, other, to_pos, piece_keys, key)
+
+            # Handle exit house failures
+            for house_idx in EXIT_HOUSES:
+                if (own >> house_idx) & 1 and house_idx != to_pos:
+                    own, key = _send_to_rebirth_bits(
+                        own, other, house_idx, piece_keys, key)
+
+        if player == 1:
+            return BitboardGameState(own, other, -1, key)
+        return BitboardGameState(other, own, 1, key)
+
+    def pass_turn(self):
+        """Same board, opponent to move (used when no move is available)."""
+        return BitboardGameState(self._x, self._o, -self._current_player,
+                                 self.get_zobrist_key() ^ SIDE_KEY)
+
+    def get_valid_moves(self, roll):
+        """
+        Legal moves as (from, to) tuples in ascending from-square order,
+        matching engines.rules.get_valid_moves.
+        """
+        own = self._x if self._current_player == 1 else self._o
+
+        # Step moves that don't land on our own pieces
+        steppers = own & STEP_FROM[roll] & ~(own >> roll)
+        bearers = own & BEAR_OFF_FROM[roll]
+
+        moves = []
+        mask = steppers | bearers
+        while mask:
+            low = mask & -mask
+            start_pos = low.bit_length() - 1
+            mask ^= low
+            if bearers & low:
+                moves.append((start_pos, OFF_BOARD))
+            else:
+                moves.append((start_pos, start_pos + roll))
+        return moves
+
+    def is_terminal(self):
+        """Check if game is over."""
+        return not self._x or not self._o
+
+    def get_winner(self):
+        """
+        Get winner if game is terminal.
+
+        Returns:
+            int: 1 for X wins, -1 for O wins, 0 for no winner yet
+        """
+        if not self._x:
+            return 1
+        elif not self._o:
+            return -1
+        else:
+            return 0
+
+    def get_game_phase(self):
+        """
+        Determine game phase from occupancy.
+
+        Returns:
+            str: 'opening', 'midgame', 'endgame'
+        """
+        occupied = self._x | self._o
+        if not occupied:
+            return 'endgame'
+
+        max_pos = occupied.bit_length() - 1
+        positions = list(_iter_bits(occupied))
+        avg_pos = sum(positions) / len(positions)
+
+        if max_pos < 15:
+            return 'opening'
+        elif avg_pos < 20:
+            return 'midgame'
+        else:
+            return 'endgame'
+
+    def get_flattened_vector(self):
+        """
+        Returns:
+            list[int]: [30 board positions, current_player, pieces_off_x, pieces_off_o]
+        """
+        return list(self.get_vector()) + [
+            self._current_player,
+            self.get_pieces_off_board(1),
+            self.get_pieces_off_board(-1)
+        ]
+
+    def __hash__(self):
+        return self.get_zobrist_key()
+
+    def __eq__(self, other):
+        if not isinstance(other, BitboardGameState):
+            return False
+        return (self._x == other._x and self._o == other._o and
+                self._current_player == other._current_player)
+
+    def __repr__(self):
+        return (f"BitboardGameState(player={self.get_current_player_symbol()}, "
+                f"X={self.count_pieces(1)}, O={self.count_pieces(-1)}, "
+                f"phase={self.get_game_phase()})")
+
+
+def create_state(board, current_player_symbol):
+    """
+    Build the state class selected by USE_BITBOARD_STATE from a board list.
+    """
+    if USE_BITBOARD_STATE:
+        return BitboardGameState.from_board(board, current_player_symbol)
+    return GameState.from_board(board, current_player_symbol)
@@ -5,7 +5,8 @@ Enhanced for Expectiminimax using pyrsistent for true immutability.
 
 from pyrsistent import pvector, PVector
 from engines.board import OFF_BOARD, HOUSE_WATER, HOUSE_THREE_TRUTHS, HOUSE_REBIRTH, HOUSE_RE_ATUM, HOUSE_HORUS, HOUSE_REBIRTH, BOARD_SIZE
-from engines.rules import get_valid_moves
+from engines.rules import MOVE_TARGETS
+from engines.zobrist import PIECE_KEYS, SIDE_KEY, compute_key
 
 
 class GameState:
@@ -14,12 +15,13 @@ class GameState:
     Guarantees true immutability with structural sharing for efficiency.
     """
 
-    def __init__(self, vector, current_player):
+    def __init__(self, vector, current_player, zobrist_key=None):
         """
         Args:
             vector (PVector/tuple/list): 30 integers representing board state
                 1 = 'X', -1 = 'O', 0 = Empty
             current_player (int): 1 for 'X', -1 for 'O'
+            zobrist_key (int): 64-bit key if already known (set by apply_move)
         """
         # Convert to PVector if not already
         if isinstance(vector, PVector):
@@ -29,8 +31,8 @@ class GameState:
 
         self._current_player = current_player
 
-        # Cache for hash
-        self._hash = None
+        # 64-bit Zobrist key, computed lazily for root states only
+        self._zobrist_key = zobrist_key
 
         # Cache for board reconstruction (only when needed)
         self._board_cache = None
@@ -64,6 +66,12 @@ class GameState:
         """Returns the immutable PVector."""
         return self._vector
 
+    def get_zobrist_key(self):
+        """Returns the 64-bit Zobrist key of this position."""
+        if self._zobrist_key is None:
+            self._zobrist_key = compute_key(self._vector, self._current_player)
+        return self._zobrist_key
+
     def get_current_player(self):
         """Returns current player as integer (1 or -1)."""
         return self._current_player
@@ -157,6 +165,10 @@ class GameState:
 
         # Get piece value
         piece = self._vector[from_pos]
+        piece_keys = PIECE_KEYS[piece]
+
+        # Zobrist: piece leaves from_pos, side to move flips
+        key = self.get_zobrist_key() ^ piece_keys[from_pos] ^ SIDE_KEY
 
         # Start with clearing the from position
         new_vector = self._vector.set(from_pos, 0)
@@ -171,30 +183,33 @@ class GameState:
                 # Swap pieces - opponent goes back to start position
                 opponent_piece = new_vector[to_pos]
                 new_vector = new_vector.set(from_pos, opponent_piece)
+                opponent_keys = PIECE_KEYS[opponent_piece]
+                key ^= opponent_keys[to_pos] ^ opponent_keys[from_pos]
 
             # Place piece at target
             new_vector = new_vector.set(to_pos, piece)
+            key ^= piece_keys[to_pos]
 
             # Handle House of Water
             if to_pos == HOUSE_WATER:
-                new_vector = self._send_to_rebirth_vector(
-                    new_vector, piece, to_pos)
+                new_vector, key = self._send_to_rebirth_vector(
+                    new_vector, piece, to_pos, key)
 
             # Handle exit house failures
             special_houses = [HOUSE_THREE_TRUTHS, HOUSE_RE_ATUM, HOUSE_HORUS]
 
             for house_idx in special_houses:
                 if new_vector[house_idx] == piece and house_idx != to_pos:
-                    new_vector = self._send_to_rebirth_vector(
-                        new_vector, piece, house_idx)
+                    new_vector, key = self._send_to_rebirth_vector(
+                        new_vector, piece, house_idx, key)
 
         # Next player
         next_player = -self._current_player
 
-        # Return new GameState with updated vector
-        return GameState(new_vector, next_player)
+        # Return new GameState with updated vector and key
+        return GameState(new_vector, next_player, key)
 
-    def _send_to_rebirth_vector(self, vector, piece, from_pos):
+    def _send_to_rebirth_vector(self, vector, piece, from_pos, key):
         """
         Send piece to rebirth using pyrsistent operations.
 
@@ -202,13 +217,16 @@ class GameState:
             vector (PVector): Current vector
             piece (int): Piece value (1 or -1)
             from_pos (int): Position to clear
+            key (int): Zobrist key of vector
 
         Returns:
-            PVector: Modified vector
+            tuple: (Modified PVector, updated Zobrist key)
         """
+        piece_keys = PIECE_KEYS[piece]
 
         # Clear current position
         vector = vector.set(from_pos, 0)
+        key ^= piece_keys[from_pos]
 
         # Find rebirth position
         rebirth_pos = HOUSE_REBIRTH
@@ -217,6 +235,7 @@ class GameState:
 
         if rebirth_pos >= 0:
             vector = vector.set(rebirth_pos, piece)
+            key ^= piece_keys[rebirth_pos]
 
         else:
             # كل البيوت في rebirth ممتلئة
@@ -228,22 +247,39 @@ class GameState:
             if rebirth_pos >= 0:
                 # لو لقينا بيت فارغ، نحط القطعة فيه
                 vector = vector.set(rebirth_pos, piece)
+                key ^= piece_keys[rebirth_pos]
             else:
                 # إذا ما في أي بيت فارغ، القطعة تتحرك للخارج
                 # (أي تمثل أنها خرجت من اللعبة)
                 # ممكن تحسبها كمكافأة أو أقلل قطعة من اللوحة
                 pass  # حسب قواعد لعبتك، ممكن تعتبر OFF_BOARD أو تضيف منطق آخر
 
-        return vector
+        return vector, key
+
+    def pass_turn(self):
+        """Same board, opponent to move (used when no move is available)."""
+        return GameState(self._vector, -self._current_player,
+                         self.get_zobrist_key() ^ SIDE_KEY)
 
     def get_valid_moves(self, roll):
         """
-        Get valid moves - requires board reconstruction.
-        This is the ONLY place we need the board list.
+        Get valid moves straight from the vector using the precomputed
+        engines.rules.MOVE_TARGETS table (no board reconstruction).
         """
-        board = self.get_board()
-        player_symbol = self.get_current_player_symbol()
-        return get_valid_moves(board, player_symbol, roll)
+        player = self._current_player
+        vector = self._vector
+        targets = MOVE_TARGETS[roll]
+        moves = []
+        for start_pos, val in enumerate(vector):
+            if val != player:
+                continue
+            target_pos = targets[start_pos]
+            if target_pos is None:
+                continue
+            if target_pos != OFF_BOARD and vector[target_pos] == player:
+                continue
+            moves.append((start_pos, target_pos))
+        return moves
 
     def is_terminal(self):
         """Check if game is over - pure vector operation."""
@@ -304,11 +340,11 @@ class GameState:
         ]
 
     def __hash__(self):
-        """Enable state as dictionary key - using PVector's built-in hash."""
-        if self._hash is None:
-            # PVector is already hashable
-            self._hash = hash((self._vector, self._current_player))
-        return self._hash
+        """
+        Enable state as dictionary key - using the Zobrist key.
+        (PVector's built-in hash collides far too often for the TT.)
+        """
+        return self.get_zobrist_key()
 
     def __eq__(self, other):
         """Fast equality check using PVector's equality."""
@@ -10,38 +10,52 @@ def get_valid_moves(board, player, roll):
     """
     Determines all legal moves for the current player given a roll.
     Implements constraints like Blockades, Protection, and Special Houses.
+
+    The roll/square rules are precomputed in MOVE_TARGETS, so only the
+    occupancy of the target square is checked here.
     """
     valid_moves = []
+    targets = MOVE_TARGETS[roll]
 
-    # Find all pieces for the current player
-    piece_indices = [i for i, x in enumerate(board) if x == player]
-
-    for start_pos in piece_indices:
-        target_pos = start_pos + roll
-        if (start_pos == HOUSE_THREE_TRUTHS and roll != 3) or (start_pos == HOUSE_RE_ATUM and roll != 2):
-            continue
-
-        # --- RULE: Bearing Off (Exiting the Board) ---
-        if target_pos >= BOARD_SIZE:
-            if not _can_bear_off(start_pos, roll, target_pos):
-                continue
-            valid_moves.append((start_pos, OFF_BOARD))
+    for start_pos, cell in enumerate(board):
+        if cell != player:
             continue
 
-        # --- RULE: House of happiness ---
-        if not _can_pass_happiness(start_pos, target_pos, roll):
+        target_pos = targets[start_pos]
+        if target_pos is None:
             continue
 
         # --- RULE: Occupancy and Capturing ---
-        if not _can_land_on(board, target_pos, player):
+        if target_pos != OFF_BOARD and board[target_pos] == player:
             continue
 
-        # If we passed all checks, it's a valid move
         valid_moves.append((start_pos, target_pos))
 
     return valid_moves
 
 
+def _static_target(start_pos, roll):
+    """
+    Target square for a piece on start_pos with the given roll, ignoring
+    occupancy: OFF_BOARD for bearing off, None if the move is illegal.
+    """
+    target_pos = start_pos + roll
+    if (start_pos == HOUSE_THREE_TRUTHS and roll != 3) or (start_pos == HOUSE_RE_ATUM and roll != 2):
+        return None
+
+    # --- RULE: Bearing Off (Exiting the Board) ---
+    if target_pos >= BOARD_SIZE:
+        if not _can_bear_off(start_pos, roll, target_pos):
+            return None
+        return OFF_BOARD
+
+    # --- RULE: House of happiness ---
+    if not _can_pass_happiness(start_pos, target_pos, roll):
+        return None
+
+    return target_pos
+
+
 def _can_bear_off(start_pos, roll, target_pos):
     """Check if a piece can bear off the board."""
     # Can only bear off if already at position 25 or beyond
@@ -88,6 +102,14 @@ def _can_land_on(board, target_pos, player):
 
     return True
 
+# MOVE_TARGETS[roll][start_pos] -> target square, OFF_BOARD or None (illegal).
+# Built once at import time; index 0 is unused so rolls index directly.
+MOVE_TARGETS = [None] + [
+    tuple(_static_target(start_pos, roll) for start_pos in range(BOARD_SIZE))
+    for roll in range(1, 6)
+]
+
+
 def _maybe_print(message, level, silent):
     if not silent: print_message(message, level)
 
@@ -0,0 +1,189 @@
+"""
+Vectorized Senet rules over many boards at once (NumPy).
+
+Boards are an (N, 30) int8 array in the GameState vector encoding
+(1 = 'X', -1 = 'O', 0 = Empty) and `players` is an (N,) array of 1/-1 for
+the side to move. Every piece has at most one target for a given roll
+(engines.rules.MOVE_TARGETS), so a move is identified by its from-square
+and legal moves are returned as an (N, 30) boolean mask over from-squares.
+
+Move application follows GameState.apply_move exactly: swap on capture,
+House of Water and failed exits from 28/29/30 send the piece back to
+Rebirth (or the first empty square before it).
+"""
+
+import numpy as np
+
+from engines.board import (
+    HOUSE_WATER, HOUSE_THREE_TRUTHS, HOUSE_RE_ATUM, HOUSE_HORUS, HOUSE_REBIRTH,
+    BOARD_SIZE, OFF_BOARD
+)
+from engines.rules import MOVE_TARGETS
+
+# Marks a row that passes (no legal move) in a from_squares vector
+NO_MOVE = -1
+
+# TARGET_TABLE[roll, start] -> target square, OFF_BOARD, or -1 if illegal
+TARGET_TABLE = np.full((6, BOARD_SIZE), -1, dtype=np.int8)
+# Per-roll 30-bit masks of start squares that may step / bear off
+STEP_MASKS = np.zeros(6, dtype=np.int64)
+BEAR_OFF_MASKS = np.zeros(6, dtype=np.int64)
+for _roll in range(1, 6):
+    for _start, _target in enumerate(MOVE_TARGETS[_roll]):
+        if _target is None:
+            continue
+        TARGET_TABLE[_roll, _start] = _target
+        if _target == OFF_BOARD:
+            BEAR_OFF_MASKS[_roll] |= 1 << _start
+        else:
+            STEP_MASKS[_roll] |= 1 << _start
+
+_SQUARE_SHIFTS = np.arange(BOARD_SIZE, dtype=np.int64)
+
+ROLL_VALUES = np.array([1, 2, 3, 4, 5], dtype=np.int8)
+ROLL_PROBABILITIES = np.array([0.25, 0.375, 0.25, 0.0625, 0.0625])
+
+_EXIT_HOUSES = (HOUSE_THREE_TRUTHS, HOUSE_RE_ATUM, HOUSE_HORUS)
+
+
+def boards_from_states(states):
+    """Stack GameState/BitboardGameState vectors into an (N, 30) int8 array."""
+    boards = np.array([state.get_vector() for state in states], dtype=np.int8)
+    players = np.array([state.get_current_player() for state in states],
+                       dtype=np.int8)
+    return boards, players
+
+
+def batch_throw_sticks(count, rng=None):
+    """Draw `count` stick rolls with the engines.sticks probabilities."""
+    rng = rng if rng is not None else np.random.default_rng()
+    return rng.choice(ROLL_VALUES, size=count, p=ROLL_PROBABILITIES)
+
+
+def batch_valid_move_masks(boards, players, rolls):
+    """
+    Legal moves for every board.
+
+    Args:
+        boards (np.ndarray): (N, 30) int8 boards
+        players (np.ndarray): (N,) side to move, 1 or -1
+        rolls (np.ndarray): (N,) rolls 1-5
+
+    Returns:
+        np.ndarray: (N, 30) bool, True where the piece on that square may move
+    """
+    own = boards == np.asarray(players, dtype=np.int8)[:, None]
+
+    # Pack each row into a 30-bit mask and reuse the bitboard formulation:
+    # steppers must not land on their own pieces, bear-offs always may.
+    own_bits = np.packbits(own, axis=1, bitorder='little')
+    own_bits = own_bits.view('<u4')[:, 0].astype(np.int64)
+    rolls = np.asarray(rolls, dtype=np.int64)
+
+    movers = (own_bits & STEP_MASKS[rolls] & ~(own_bits >> rolls)) | \
+        (own_bits & BEAR_OFF_MASKS[rolls])
+
+    return ((movers[:, None] >> _SQUARE_SHIFTS) & 1).astype(bool)
+
+
+def batch_targets(rolls, from_squares):
+    """Target squares (or OFF_BOARD) for chosen from-squares."""
+    return TARGET_TABLE[np.asarray(rolls), np.asarray(from_squares)]
+
+
+def _send_to_rebirth(boards, rows, from_pos, pieces):
+    """
+    Vectorized GameState._send_to_rebirth_vector for boards[rows].
+    from_pos may be a scalar or an array aligned with rows.
+    """
+    if rows.size == 0:
+        return
+    boards[rows, from_pos] = 0
+
+    # Highest empty square in 0..HOUSE_REBIRTH
+    empty = boards[rows, :HOUSE_REBIRTH + 1] == 0
+    has_slot = empty.any(axis=1)
+    slot = HOUSE_REBIRTH - np.argmax(empty[:, ::-1], axis=1)
+
+    boards[rows[has_slot], slot[has_slot]] = pieces[has_slot]
+
+
+def batch_apply_moves(boards, players, rolls, from_squares, out=None):
+    """
+    Apply one chosen move per board.
+
+    Args:
+        boards (np.ndarray): (N, 30) int8 boards
+        players (np.ndarray): (N,) side to move, 1 or -1
+        rolls (np.ndarray): (N,) rolls 1-5
+        from_squares (np.ndarray): (N,) from-square per board, NO_MOVE to pass.
+            Must be legal according to batch_valid_move_masks.
+        out (np.ndarray): Optional destination (may be `boards` for in-place)
+
+    Returns:
+        np.ndarray: (N, 30) boards after the moves. Flipping the side to
+        move is left to the caller (players = -players).
+    """
+    if out is None:
+        out = boards.copy()
+    elif out is not boards:
+        np.copyto(out, boards)
+
+    players = np.asarray(players, dtype=np.int8)
+    from_squares = np.asarray(from_squares)
+    rows = np.flatnonzero(from_squares != NO_MOVE)
+    if rows.size == 0:
+        return out
+
+    starts = from_squares[rows].astype(np.intp)
+    targets = TARGET_TABLE[np.asarray(rolls)[rows], starts].astype(np.intp)
+    pieces = players[rows]
+
+    out[rows, starts] = 0
+
+    # Bearing off: the piece simply leaves the board
+    on_board = targets < BOARD_SIZE
+    rows, starts, targets, pieces = (rows[on_board], starts[on_board],
+                                     targets[on_board], pieces[on_board])
+
+    # Attack/swap - the opponent goes back to our start square
+    occupant = out[rows, targets]
+    swap = occupant != 0
+    out[rows[swap], starts[swap]] = occupant[swap]
+
+    out[rows, targets] = pieces
+
+    # House of Water
+    water = targets == HOUSE_WATER
+    _send_to_rebirth(out, rows[water], HOUSE_WATER, pieces[water])
+
+    # Exit house failures, in the same order as GameState.apply_move
+    for house_idx in _EXIT_HOUSES:
+        failed = (out[rows, house_idx] == pieces) & (targets != house_idx)
+        _send_to_rebirth(out, rows[failed], house_idx, pieces[failed])
+
+    return out
+
+
+def batch_random_moves(masks, rng=None):
+    """
+    Pick a uniformly random legal from-square per row (NO_MOVE if none).
+    Useful for self-play and rollouts.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    counts = masks.sum(axis=1)
+    picks = (rng.random(len(masks)) * counts).astype(np.int64)
+
+    # First square whose running count of legal moves exceeds the pick
+    running = np.cumsum(masks, axis=1, dtype=np.int8)
+    choice = np.argmax(running > picks[:, None], axis=1)
+    return np.where(counts > 0, choice, NO_MOVE)
+
+
+def batch_winners(boards):
+    """
+    Returns (N,) int8: 1 if X has borne off every piece, -1 for O, 0 otherwise.
+    """
+    has_x = (boards == 1).any(axis=1)
+    has_o = (boards == -1).any(axis=1)
+    return np.where(~has_x, 1, np.where(~has_o, -1, 0)).astype(np.int8)
@@ -0,0 +1,205 @@
+"""
+Mutable board used only inside the AI search.
+
+The immutable GameState / BitboardGameState remain the external API. The
+search converts the root state once and then walks the tree with
+make_move / unmake_move on this single object, so no state, PVector or
+board list is allocated per node.
+
+Every change is pushed onto one flat undo stack as (square, old content)
+pairs, followed by the number of pairs. A move records its from/to squares,
+and the swap, House of Water and failed-exit rebirths each record the
+vacated house and the rebirth slot they fill.
+"""
+
+from engines.board import (
+    HOUSE_WATER, HOUSE_THREE_TRUTHS, HOUSE_RE_ATUM, HOUSE_HORUS, HOUSE_REBIRTH,
+    BOARD_SIZE, OFF_BOARD
+)
+from engines.game_state_pyrsistent import GameState
+from engines.rules import MOVE_TARGETS
+from engines.zobrist import PIECE_KEYS, SIDE_KEY
+
+_SYMBOL_TO_INT = {'X': 1, 'O': -1, None: 0}
+_EXIT_HOUSES = (HOUSE_THREE_TRUTHS, HOUSE_RE_ATUM, HOUSE_HORUS)
+
+
+class SearchBoard:
+    """
+    Board list (None/'X'/'O') + side to move + Zobrist key, modified in place.
+    Exposes the subset of the GameState interface the search relies on.
+    """
+
+    __slots__ = ('cells', '_current_player', '_symbol', '_opponent_symbol',
+                 '_zobrist_key', '_undo')
+
+    def __init__(self, cells, current_player, zobrist_key):
+        """
+        Args:
+            cells (list): 30 cells with None, 'X', 'O' (owned by the board)
+            current_player (int): 1 for 'X', -1 for 'O'
+            zobrist_key (int): Zobrist key of the position
+        """
+        self.cells = cells
+        self._set_player(current_player)
+        self._zobrist_key = zobrist_key
+        self._undo = []
+
+    @classmethod
+    def from_state(cls, state):
+        """Copy a GameState / BitboardGameState into a new search board."""
+        return cls(list(state.get_board()), state.get_current_player(),
+                   state.get_zobrist_key())
+
+    def to_game_state(self):
+        """Snapshot of the current position as an immutable GameState."""
+        return GameState(self.get_vector(), self._current_player,
+                         self._zobrist_key)
+
+    def _set_player(self, player):
+        self._current_player = player
+        self._symbol = 'X' if player == 1 else 'O'
+        self._opponent_symbol = 'O' if player == 1 else 'X'
+
+    # ------------------------------------------------------------------
+    # GameState-compatible queries
+    # ------------------------------------------------------------------
+
+    def get_board(self):
+        """The live cell list - callers must not modify it."""
+        return self.cells
+
+    def get_vector(self):
+        return tuple(_SYMBOL_TO_INT[cell] for cell in self.cells)
+
+    def get_zobrist_key(self):
+        return self._zobrist_key
+
+    def get_current_player(self):
+        return self._current_player
+
+    def get_current_player_symbol(self):
+        return self._symbol
+
+    def get_opponent_symbol(self):
+        return self._opponent_symbol
+
+    def is_terminal(self):
+        cells = self.cells
+        return 'X' not in cells or 'O' not in cells
+
+    def get_valid_moves(self, roll):
+        """Same moves and order as engines.rules.get_valid_moves."""
+        cells = self.cells
+        player = self._symbol
+        targets = MOVE_TARGETS[roll]
+        moves = []
+        for start_pos, cell in enumerate(cells):
+            if cell != player:
+                continue
+            target_pos = targets[start_pos]
+            if target_pos is None:
+                continue
+            if target_pos != OFF_BOARD and cells[target_pos] == player:
+                continue
+            moves.append((start_pos, target_pos))
+        return moves
+
+    # ------------------------------------------------------------------
+    # Make / unmake
+    # ------------------------------------------------------------------
+
+    def make_move(self, from_pos, to_pos):
+        """Apply a legal move in place (same semantics as GameState.apply_move)."""
+        cells = self.cells
+        undo = self._undo
+        piece = cells[from_pos]
+        piece_keys = PIECE_KEYS[self._current_player]
+
+        undo.append(self._zobrist_key)
+        key = self._zobrist_key ^ piece_keys[from_pos] ^ SIDE_KEY
+
+        undo.append(from_pos)
+        undo.append(piece)
+        cells[from_pos] = None
+        changes = 1
+
+        if to_pos < BOARD_SIZE:
+            occupant = cells[to_pos]
+            undo.append(to_pos)
+            undo.append(occupant)
+            changes += 1
+
+            # Attack/swap - opponent goes back to our start square
+            if occupant is not None:
+                cells[from_pos] = occupant
+                opponent_keys = PIECE_KEYS[-self._current_player]
+                key ^= opponent_keys[to_pos] ^ opponent_keys[from_pos]
+
+            cells[to_pos] = piece
+            key ^= piece_keys[to_pos]
+
+            # House of Water
+            if to_pos == HOUSE_WATER:
+                key, recorded = self._send_to_rebirth(
+                    piece, to_pos, piece_keys, key)
+                changes += recorded
+
+            # Exit house failures
+            for house_idx in _EXIT_HOUSES:
+                if cells[house_idx] == piece and house_idx != to_pos:
+                    key, recorded = self._send_to_rebirth(
+                        piece, house_idx, piece_keys, key)
+                    changes += recorded
+
+        undo.append(changes)
+        self._zobrist_key = key
+        self._set_player(-self._current_player)
+
+    def make_pass(self):
+        """Hand the turn over without moving (no legal move for the roll)."""
+        self._undo.append(self._zobrist_key)
+        self._undo.append(0)
+        self._zobrist_key ^= SIDE_KEY
+        self._set_player(-self._current_player)
+
+    def unmake_move(self):
+        """Undo the last make_move / make_pass."""
+        cells = self.cells
+        undo = self._undo
+        for _ in range(undo.pop()):
+            old = undo.pop()
+            cells[undo.pop()] = old
+        self._zobrist_key = undo.pop()
+        self._set_player(-self._current_player)
+
+    def _send_to_rebirth(self, piece, from_pos, piece_keys, key):
+        """
+        Move piece from from_pos to Rebirth (or the first empty square
+        before it), recording both squares. Returns (key, pairs recorded).
+        """
+        cells = self.cells
+        undo = self._undo
+
+        undo.append(from_pos)
+        undo.append(piece)
+        cells[from_pos] = None
+        key ^= piece_keys[from_pos]
+
+        rebirth_pos = HOUSE_REBIRTH
+        while rebirth_pos >= 0 and cells[rebirth_pos] is not None:
+            rebirth_pos -= 1
+
+        if rebirth_pos < 0:
+            return key, 1
+
+        undo.append(rebirth_pos)
+        undo.append(None)
+        cells[rebirth_pos] = piece
+        key ^= piece_keys[rebirth_pos]
+        return key, 2
+
+    def __repr__(self):
+        return (f"SearchBoard(player={self._symbol}, "
+                f"X={self.cells.count('X')}, O={self.cells.count('O')}, "
+                f"undo_depth={len(self._undo)})")
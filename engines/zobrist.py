@@ -0,0 +1,43 @@
+"""
+64-bit Zobrist keys for Senet positions.
+
+A position key is the XOR of one random number per (player, square) that is
+occupied, plus SIDE_KEY when 'O' is to move. Moving a piece only XORs out the
+old square and XORs in the new one, so states can update their key
+incrementally instead of hashing the whole board.
+"""
+
+import random
+
+from engines.board import BOARD_SIZE
+
+# Fixed seed: keys must be identical across processes and runs
+_rng = random.Random(0x5E7E7)
+
+
+def _random_key():
+    return _rng.getrandbits(64)
+
+
+# PIECE_KEYS[player][square], player is 1 ('X') or -1 ('O')
+PIECE_KEYS = {
+    1: tuple(_random_key() for _ in range(BOARD_SIZE)),
+    -1: tuple(_random_key() for _ in range(BOARD_SIZE)),
+}
+
+# XORed in when 'O' (-1) is to move
+SIDE_KEY = _random_key()
+
+
+def compute_key(vector, current_player):
+    """
+    Full key computation from a 30 integer vector (1 = 'X', -1 = 'O', 0 = Empty).
+    Used once per root state; children update their parent's key.
+    """
+    key = 0
+    for i, val in enumerate(vector):
+        if val:
+            key ^= PIECE_KEYS[val][i]
+    if current_player == -1:
+        key ^= SIDE_KEY
+    return key
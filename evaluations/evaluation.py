@@ -2,6 +2,9 @@ from engines.board import (
     HOUSE_OF_HAPPINESS, HOUSE_WATER, HOUSE_THREE_TRUTHS,
     HOUSE_RE_ATUM, HOUSE_HORUS, HOUSE_REBIRTH, BOARD_SIZE, OFF_BOARD
 )
+from players.race_database import load_race_database
+
+WIN_SCORE = 10000
 
 SENET_AI_CONFIG = {
     'piece_off': 1200,
@@ -18,20 +21,27 @@ SENET_AI_CONFIG = {
 
 
 class Evaluation:
-    def __init__(self, player, config=None):
+    def __init__(self, player, config=None, race_database=None):
         self.player = player
         self.opponent = 'O' if player == 'X' else 'X'
         self.base_weights = config.copy() if config else SENET_AI_CONFIG.copy()
         self.weights = self.base_weights.copy()
+        self.race_database = load_race_database(race_database) \
+            if race_database else None
 
     # =====================================================
 
-    def evaluate_board(self, board, valid_moves=None):
+    def evaluate_board(self, board, valid_moves=None, to_move=None):
         self.weights = self.base_weights.copy()
 
         if self._is_terminal(board):
             return self._evaluate_terminal(board)
 
+        if self.race_database is not None:
+            race = self._evaluate_race(board, to_move)
+            if race is not None:
+                return race
+
         phase = self._get_game_phase(board)
         self._adjust_weights_for_phase(phase)
 
@@ -47,7 +57,8 @@ class Evaluation:
         if valid_moves:
             score += len(valid_moves) * self.weights['flexibility']
 
-        return score
+        # Below a certain win, on the same scale as terminal and race values
+        return max(1 - WIN_SCORE, min(score, WIN_SCORE - 1))
 
     # =====================================================
 
@@ -56,12 +67,22 @@ class Evaluation:
             not any(c == self.opponent for c in board)
 
     def _evaluate_terminal(self, board):
+        # A player with no pieces left on the board has borne them all off
         if not any(c == self.player for c in board):
-            return -10000
+            return WIN_SCORE
         if not any(c == self.opponent for c in board):
-            return 10000
+            return -WIN_SCORE
         return 0
 
+    def _evaluate_race(self, board, to_move):
+        mine = [i for i, c in enumerate(board) if c == self.player]
+        theirs = [i for i, c in enumerate(board) if c == self.opponent]
+        p = self.race_database.race_probability(
+            mine, theirs, None if to_move is None else to_move == self.player)
+        if p is None:
+            return None
+        return (2.0 * p - 1.0) * WIN_SCORE
+
     # =====================================================
 
     def _get_game_phase(self, board):
@@ -1,7 +1,10 @@
+import math
+
 from engines.board import (
     HOUSE_OF_HAPPINESS, HOUSE_WATER,
     BOARD_SIZE, OFF_BOARD
 )
+from players.race_database import load_race_database
 
 SENET_AI_CONFIG = {
     'piece_off': 1200,
@@ -47,18 +50,74 @@ PHASE_MULTIPLIERS = {
 MAX_POSSIBLE_SCORE = 50000
 MIN_POSSIBLE_SCORE = -50000
 
+PIECES_PER_PLAYER = 7
+MAX_ROLL = 5
+
+
+def _square_value_table(config, special_houses=True):
+    """
+    قيمة قطعة واحدة على كل مربع بأوزان مرحلة: التقدم، والبيوت الخاصة
+    لقطع اللاعب فقط (evaluate_board لا يحسبها لقطع الخصم).
+    """
+    table = []
+    for pos in range(BOARD_SIZE):
+        mult = config['zone_multiplier'] if pos >= 20 else 1.0
+        value = (pos + 1) * config['progress_base'] * mult
+        if special_houses:
+            if pos == HOUSE_OF_HAPPINESS:
+                value += config['happiness_bonus']
+            elif pos == HOUSE_WATER:
+                value += config['water_penalty']
+        table.append(value)
+    return table
+
+
+def _range_tables(table):
+    """highest[lo][hi] / lowest[lo][hi]: أكبر وأصغر قيمة في المجال [lo, hi]"""
+    highest = []
+    lowest = []
+    for lo in range(BOARD_SIZE):
+        high_row = [None] * BOARD_SIZE
+        low_row = [None] * BOARD_SIZE
+        high = low = table[lo]
+        for hi in range(lo, BOARD_SIZE):
+            high = max(high, table[hi])
+            low = min(low, table[hi])
+            high_row[hi] = high
+            low_row[hi] = low
+        highest.append(high_row)
+        lowest.append(low_row)
+    return highest, lowest
+
 
 class Evaluation:
-    def __init__(self, player, config=None):
+    def __init__(self, player, config=None, race_database=None):
         self.player = player
         self.opponent = 'O' if player == 'X' else 'X'
         self.base_config = config if config else SENET_AI_CONFIG
         self.config = self.base_config.copy()
 
+        # قاعدة بيانات السباق (players.race_database): عندما تكون كل قطع
+        # الطرفين ضمنها يُعاد احتمال الفوز بدلاً من التقييم الاستدلالي
+        self.race_database = load_race_database(race_database) \
+            if race_database else None
+        self.race_evaluations = 0
+
         # للتتبع والتحليل
         self.phase_stats = {'opening': 0, 'midgame': 0, 'endgame': 0}
         self.debug = False  # اضبطه على True للتحليل
 
+        # جداول قيم المربعات لكل مرحلة (لحساب حدود التقييم):
+        # phase -> (config, (table, highest, lowest) للاعب, ... للخصم)
+        self._phase_tables = {}
+        for phase in PHASE_MULTIPLIERS:
+            config = self._apply_phase_adjustments(phase)
+            sides = []
+            for special_houses in (True, False):
+                table = _square_value_table(config, special_houses)
+                sides.append((table,) + _range_tables(table))
+            self._phase_tables[phase] = (config, sides[0], sides[1])
+
     def _get_game_phase(self, board):
         """تحديد مرحلة اللعبة بدقة أعلى"""
         my_indices = [i for i, cell in enumerate(board) if cell == self.player]
@@ -100,7 +159,11 @@ class Evaluation:
                 adjusted_config[key] = self.base_config[key] * multiplier
         return adjusted_config
 
-    def evaluate_board(self, board, valid_moves=None):
+    def evaluate_board(self, board, valid_moves=None, to_move=None):
+        """
+        to_move: رمز اللاعب الذي يرمي العصي تالياً (يُستخدم في مواقع السباق،
+        None = غير معروف)
+        """
         my_indices = [i for i, cell in enumerate(board) if cell == self.player]
         opp_indices = [i for i, cell in enumerate(
             board) if cell == self.opponent]
@@ -111,6 +174,15 @@ class Evaluation:
         if not opp_indices:
             return -self.config['win_bonus']
 
+        # السباق: (2p - 1) * win_bonus حيث p احتمال الفوز من قاعدة البيانات
+        if self.race_database is not None:
+            p = self.race_database.race_probability(
+                my_indices, opp_indices,
+                None if to_move is None else to_move == self.player)
+            if p is not None:
+                self.race_evaluations += 1
+                return (2.0 * p - 1.0) * self.base_config['win_bonus']
+
         # Get phase and adjust weights
         phase = self._get_game_phase(board)
         self.config = self._apply_phase_adjustments(phase)
@@ -164,7 +236,150 @@ class Evaluation:
                   f"Progress weight: {self.config['progress_base']:.1f}, "
                   f"Block weight: {self.config['block']:.1f}")
 
-        return max(MIN_POSSIBLE_SCORE + 1, min(score, MAX_POSSIBLE_SCORE - 1))
+        # التقييم الاستدلالي يبقى دون الفوز المؤكد: الحالات النهائية وقيم
+        # جدول النهايات وقاعدة السباق (2p - 1) * win_bonus على المقياس نفسه
+        win = self.base_config['win_bonus']
+        return max(1 - win, min(score, win - 1))
+
+    # ------------------------------------------------------------------
+    # حدود التقييم (Star1 / Star2 في ai_pruning)
+    # ------------------------------------------------------------------
+
+    def get_score_bounds(self, board, my_moves, opp_moves):
+        """
+        حدود مضمونة لقيمة evaluate_board في أي موقع يمكن الوصول إليه من
+        board إذا لعب اللاعب my_moves حركة والخصم opp_moves حركة:
+        - كل حركة تغيّر مربع قطعة واحدة لصاحبها (5 مربعات للأمام على الأكثر)
+          وقطعة واحدة للخصم (التبديل يعيدها 5 مربعات على الأكثر)
+        - القطعة التي تبلغ بيت الماء أو بيوت الخروج قد تعود حتى المربع 0
+        - المرحلة قد تتغير، فتُؤخذ الحدود على كل مرحلة ممكنة
+        - الحماية تُحسب بين 0 وقيمتها لكل قطعة
+
+        Returns:
+            tuple: (lower, upper)
+        """
+        win = self.base_config['win_bonus']
+        my_pieces = self._piece_ranges(board, self.player, my_moves, opp_moves)
+        opp_pieces = self._piece_ranges(board, self.opponent, opp_moves, my_moves)
+        if not my_pieces:
+            return win, win
+        if not opp_pieces:
+            return -win, -win
+        my_off = PIECES_PER_PLAYER - len(my_pieces)
+        opp_off = PIECES_PER_PLAYER - len(opp_pieces)
+
+        # عدد قطع كل لاعب التي قد يتغير مربعها
+        my_changes = my_moves + opp_moves + \
+            sum(1 for piece in my_pieces if piece[0] >= HOUSE_WATER)
+        opp_changes = my_moves + opp_moves + \
+            sum(1 for piece in opp_pieces if piece[0] >= HOUSE_WATER)
+
+        # القطع التي يمكن إخراجها (قطعة واحدة على الأكثر في كل حركة)
+        my_can_off = min(my_moves, sum(1 for piece in my_pieces if piece[3]))
+        opp_can_off = min(opp_moves, sum(1 for piece in opp_pieces if piece[3]))
+
+        # المراحل الممكنة لأي موقع لاحق
+        pieces = my_pieces + opp_pieces
+        total_off = my_off + opp_off
+        advance = sorted((piece[2] - piece[0] for piece in my_pieces),
+                         reverse=True)[:my_changes] + \
+            sorted((piece[2] - piece[0] for piece in opp_pieces),
+                   reverse=True)[:opp_changes]
+        highest_average = (sum(piece[0] for piece in pieces) + sum(advance)) / \
+            max(1, len(pieces) - my_can_off - opp_can_off)
+        phases = []
+        if total_off == 0 and all(piece[1] < 15 for piece in pieces):
+            phases.append('opening')
+        if total_off <= 2:
+            phases.append('midgame')
+        if total_off + my_can_off + opp_can_off >= 3 or highest_average >= 22:
+            phases.append('endgame')
+
+        lower, upper = self._bounds_for(phases, my_pieces, my_off, my_changes,
+                                        opp_pieces, opp_off, opp_changes)
+
+        # الحالات النهائية: إخراج كل القطع
+        if my_off + my_can_off == PIECES_PER_PLAYER:
+            upper = max(upper, win)
+        if opp_off + opp_can_off == PIECES_PER_PLAYER:
+            lower = min(lower, -win)
+
+        # مواقع السباق تحت هذه العقدة تأخذ أي قيمة بين -win و win
+        if self.race_database is not None and self.race_database.reachable(
+                len(my_pieces), len(opp_pieces), my_moves, opp_moves,
+                min(piece[2] for piece in pieces)):
+            lower = min(lower, -win)
+            upper = max(upper, win)
+        return lower, upper
+
+    @staticmethod
+    def _piece_ranges(board, symbol, own_moves, other_moves):
+        """
+        Returns:
+            list: (square, lowest square, highest square, can bear off)
+        """
+        ranges = []
+        for pos, cell in enumerate(board):
+            if cell != symbol:
+                continue
+            reach = pos + MAX_ROLL * own_moves
+            hi = min(reach, BOARD_SIZE - 1)
+            lo = 0 if hi >= HOUSE_WATER else max(0, pos - MAX_ROLL * other_moves)
+            ranges.append((pos, lo, hi, reach >= OFF_BOARD))
+        return ranges
+
+    @staticmethod
+    def _side_range(side, pieces, changes, piece_off):
+        """
+        أدنى وأعلى مجموع لقيم قطع لاعب واحد، إذا تغير مربع `changes` قطعة
+        على الأكثر.
+        """
+        table, highest, lowest = side
+        current = 0.0
+        gains = []
+        losses = []
+        for pos, lo, hi, off in pieces:
+            high = highest[lo][hi]
+            low = lowest[lo][hi]
+            if off:
+                high = max(high, piece_off)
+                low = min(low, piece_off)
+            value = table[pos]
+            current += value
+            gains.append(high - value)
+            losses.append(value - low)
+        if changes < len(pieces):
+            gains.sort(reverse=True)
+            losses.sort(reverse=True)
+            gains = gains[:changes]
+            losses = losses[:changes]
+        return current - sum(losses), current + sum(gains)
+
+    def _bounds_for(self, phases, my_pieces, my_off, my_changes,
+                    opp_pieces, opp_off, opp_changes):
+        """أدنى وأعلى قيمة ممكنة عبر المراحل المعطاة"""
+        lower = math.inf
+        upper = -math.inf
+        for phase in phases:
+            config, my_side, opp_side = self._phase_tables[phase]
+            piece_off = config['piece_off']
+            protection = config['protection']
+
+            my_low, my_high = self._side_range(
+                my_side, my_pieces, my_changes, piece_off)
+            opp_low, opp_high = self._side_range(
+                opp_side, opp_pieces, opp_changes, piece_off)
+            off_score = (my_off - opp_off) * piece_off
+            extra = PIECES_PER_PLAYER * (abs(protection) +
+                                         abs(config['flexibility']))
+
+            upper = max(upper, off_score + my_high - opp_low + extra)
+            lower = min(lower, off_score + my_low - opp_high - extra)
+
+        # evaluate_board يقص القيم إلى المجال نفسه من الجهتين
+        win = self.base_config['win_bonus']
+        return (min(win - 1, max(1 - win, lower)),
+                max(1 - win, min(win - 1, upper)))
 
     def _evaluate_blocking(self, board, my_indices, opp_indices):
         """Enhanced blocking evaluation"""
@@ -11,13 +11,13 @@ def start_game():
 
     input(f"\n  {c.DIM}Press Enter to start...{c.RESET}")
 
-    print("\n  Choose type: \n    1- Human vs Human \n    2- Human vs AI(SLOW) \n    3- Human vs AI(FAST) \n    4- Human vs AI(MEDIUM)")
+    print("\n  Choose type: \n    1- Human vs Human \n    2- Human vs AI(SLOW) \n    3- Human vs AI(FAST) \n    4- Human vs AI(MEDIUM) \n    5- Human vs AI(MCTS)")
 
     mode_mapping = {
         2: "HARD",
         3: "EASY",
         4: "MEDIUM",
-        5: "Intelligent"
+        5: "MCTS"
     }
 
     choice = int(input('  Enter a number: '))
@@ -29,7 +29,7 @@ def start_game():
             game = SenetGame(current_player=current_player, opponent=opponent)
             game.start_playing()
 
-        case 2 | 3 | 4:
+        case 2 | 3 | 4 | 5:
             current_player = PlayerType.PLAYER
             opponent = PlayerType.OPPONENT
 
@@ -40,11 +40,13 @@ def start_game():
 
             print_legend(current_player, opponent)
 
-            ai = ai_class(player_symbol=opponent, depth=depth)
+            ai = ai_class(player_symbol=opponent, depth=depth,
+                          **ai_config.get("options", {}))
             game = SenetGame(
                 current_player=current_player,
                 opponent=opponent,
-                ai_player=ai
+                ai_player=ai,
+                ponder=ai_config.get("ponder", False)
             )
 
             game.start_playing()
@@ -12,7 +12,7 @@ from concurrent.futures import ProcessPoolExecutor, as_completed
 from players.ai_pruning import AI
 
 from evaluations.evaluation_star1 import SENET_AI_CONFIG
-from engines.game_state_pyrsistent import GameState
+from engines.game_state_bitboard import create_state
 from engines.board import create_initial_board
 from engines.rules_silent import apply_move, check_win
 from engines.sticks import throw_sticks
@@ -130,10 +130,10 @@ class Trainer:
             roll = throw_sticks()
 
             if current_player == 'X':
-                state = GameState.from_board(board, 'X')
+                state = create_state(board, 'X')
                 move = ai_x.choose_best_move(state, roll)
             else:
-                state = GameState.from_board(board, 'O')
+                state = create_state(board, 'O')
                 move = ai_o.choose_best_move(state, roll)
 
             if move:
@@ -5,15 +5,17 @@ from evaluations.evaluation import Evaluation
 from engines.board import *
 
 class AI:
-    def __init__(self, player_symbol, depth, weights=None):
+    def __init__(self, player_symbol, depth, weights=None, race_database=None):
         self.player = player_symbol
         self.depth = depth
-        self.evaluator = Evaluation(player_symbol, config=weights)
+        self.evaluator = Evaluation(player_symbol, config=weights,
+                                    race_database=race_database)
         # self.evaluator = Evaluation(player_symbol)
 
     def evaluation(self, state):
         board = state.get_board()
-        return self.evaluator.evaluate_board(board)
+        return self.evaluator.evaluate_board(
+            board, to_move=state.get_current_player_symbol())
 
     def choose_best_move(self, state, roll):
         best_value = -math.inf
@@ -1,8 +1,236 @@
 import math
+import random
+import time
+from dataclasses import dataclass, replace
+from typing import Optional, Union
 from engines.load_weights import load_weights
 from engines.board import BOARD_SIZE, HOUSE_OF_HAPPINESS, HOUSE_WATER, OFF_BOARD
-from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from engines.game_state_pyrsistent import get_all_possible_rolls
+from engines.search_board import SearchBoard
 from evaluations.evaluation_star1 import Evaluation, MAX_POSSIBLE_SCORE, MIN_POSSIBLE_SCORE
+from players.transposition_table import TranspositionTable, EXACT, LOWER, UPPER
+from players.shared_transposition_table import SharedTranspositionTable
+from players.parallel_search import (RootSearchPool, SPLIT_MOVE, SPLIT_ROLL,
+                                     SHARED_ALPHA, SHARED_STOP, NODE_CHUNK)
+from players.opening_book import load_book
+from players.tablebase import load_tablebase
+from players.probcut import load_model as load_probcut_model
+
+# مفاتيح عشوائية تُدمج مع مفتاح Zobrist للحالة بدلاً من بناء tuple لكل عقدة
+# (العمق لم يعد جزءاً من المفتاح: يُخزَّن داخل المدخل ويُستخدم المدخل الأعمق)
+_tt_rng = random.Random(0x77AB)
+_TT_ROLL_KEYS = tuple(_tt_rng.getrandbits(64) for _ in range(6))
+_TT_MAXIMIZING_KEY = _tt_rng.getrandbits(64)
+
+
+# ترتيب الحركات الديناميكي: مكافأة حركات killer وجدول history
+KILLER_BONUS = (20000, 15000)    # أول / ثاني حركة killer لنفس (العمق من الجذر، الرمية)
+HISTORY_BONUS = 50               # يُضرب في depth**2 عند كل قطع
+HISTORY_LIMIT = 20000            # عند تجاوزه يُنصَّف الجدول كله
+HISTORY_DECAY = 0.5              # تقادم الجدول في بداية كل choose_best_move
+
+CAPTURE_BONUS = 1200             # هجوم جيد لكن ليس أولوية مطلقة
+MAX_MOVES = 7                    # حجم مخزن الأولويات لكل ply (قطعة لكل حركة)
+_PICKED = -math.inf              # أولوية حركة وُلِّدت مسبقاً
+
+
+def _target_priority(to_pos):
+    """الأولوية الثابتة لحركة إلى to_pos، دون مكافأة الهجوم"""
+    # أولوية قصوى للخروج
+    if to_pos == OFF_BOARD:
+        return 30000
+
+    priority = 0
+    # أولوية عالية للتقدم المتأخر
+    if to_pos >= 25:
+        priority += 10000 + to_pos * 50
+    elif to_pos >= 20:
+        priority += 5000 + to_pos * 20
+
+    # مكافأة بيت السعادة لكن ليس مفرطة
+    if to_pos == HOUSE_OF_HAPPINESS:
+        priority += 2000
+
+    # عقوبة قوية للماء
+    if to_pos == HOUSE_WATER:
+        priority -= 10000
+
+    # مكافأة عامة للتقدم
+    return priority + to_pos * 25
+
+
+# جدول ثابت يُحسب مرة واحدة: الأولوية حسب المربع الهدف (0..OFF_BOARD)
+_TARGET_PRIORITY = tuple(_target_priority(to_pos) for to_pos in range(OFF_BOARD + 1))
+
+
+# الرميات مرتبة حسب الاحتمالية (الأكبر أولاً) لزيادة كفاءة Star1
+_ROLLS = tuple(sorted(get_all_possible_rolls(), key=lambda x: x[1], reverse=True))
+
+
+def _truncate_rolls(rolls, mass):
+    """
+    أكثر الرميات احتمالاً حتى يبلغ مجموع احتمالاتها mass، مع إعادة تطبيع
+    الاحتمالات لمجموع 1 (القيمة المتوقعة متوسط الرميات المبحوثة فقط).
+    """
+    kept = []
+    total = 0.0
+    for roll, prob in rolls:
+        kept.append((roll, prob))
+        total += prob
+        if total >= mass:
+            break
+    return tuple((roll, prob / total) for roll, prob in kept)
+
+
+class _MovePicker:
+    """
+    منتقي الحركات على مراحل لعقد القرار، يتوقف حيث يتوقف البحث (القطع):
+    1. حركة الجدول (pv_ordering) قبل حساب أي أولوية
+    2. بقية الحركات بالأولوية + history + killers (نفس ترتيب AI._order_moves)،
+       تُقيَّم فقط إذا لم تقطع حركة الجدول، وتُختار واحدة واحدة (الأعلى أولاً)
+       دون ترتيب القائمة كلها.
+
+    لكل ply منتقٍ واحد يُعاد استخدامه مع مخزن أولوياته (start لكل عقدة) بدلاً
+    من قوائم أو مولد جديد لكل عقدة، فلا تخصيص للذاكرة سوى أعداد الأولويات.
+    لا توجد عقدتا قرار نشطتان بنفس الـ ply في نفس الوقت. اللوحة تتغير بين
+    الحركات (make/unmake) لكنها تعود كما كانت قبل طلب الحركة التالية.
+    """
+
+    __slots__ = ('ai', 'scores', 'moves', 'state', 'tt_move', 'roll', 'ply',
+                 'count', 'remaining', 'scored')
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.scores = [_PICKED] * MAX_MOVES
+        self.moves = self.state = self.tt_move = None
+
+    def start(self, moves, state, tt_move, roll, ply):
+        if not (self.ai.options.pv_ordering and tt_move is not None and tt_move in moves):
+            tt_move = None
+        self.moves = moves
+        self.state = state
+        self.tt_move = tt_move
+        self.roll = roll
+        self.ply = ply
+        self.count = len(moves)
+        self.remaining = self.count
+        self.scored = False
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.remaining:
+            self.moves = self.state = None
+            raise StopIteration
+        self.remaining -= 1
+        if not self.scored:
+            if self.tt_move is not None and self.remaining == self.count - 1:
+                return self.tt_move
+            self._score()
+        # الأعلى أولاً، وعند التساوي الأسبق (max يعيد أول أكبر قيمة، كالترتيب
+        # المستقر في _order_moves)
+        scores = self.scores
+        best_index = max(range(self.count), key=scores.__getitem__)
+        scores[best_index] = _PICKED
+        return self.moves[best_index]
+
+    def _score(self):
+        self.scored = True
+        ai = self.ai
+        moves = self.moves
+        count = self.count
+        scores = self.scores
+        if len(scores) < count:
+            scores.extend([_PICKED] * (count - len(scores)))
+        state = self.state
+        cells = state.get_board()
+        opponent = state.get_opponent_symbol()
+        priority = _TARGET_PRIORITY
+        tt_move = self.tt_move
+        use_history = ai.options.history
+        if use_history:
+            player = state.get_current_player()
+            history = ai.history_table
+            killers = ai.killers.get((self.ply, self.roll), ())
+        i = 0
+        for move in moves:
+            if move == tt_move:
+                scores[i] = _PICKED
+            else:
+                to_pos = move[1]
+                score = priority[to_pos]
+                if to_pos != OFF_BOARD and cells[to_pos] == opponent:
+                    score += CAPTURE_BONUS
+                if use_history:
+                    score += history.get((move[0], to_pos, player), 0)
+                    if move in killers:
+                        score += KILLER_BONUS[killers.index(move)]
+                scores[i] = score
+            i += 1
+
+
+class SearchBudgetExceeded(Exception):
+    """يُرفع داخل البحث عند انتهاء الوقت أو عدد العقد المسموح"""
+
+
+class SharedAlphaRaised(Exception):
+    """
+    يُرفع داخل search_root_move عندما ترفع عملية أخرى alpha المشتركة فوق
+    نافذة البحث الجاري (يعيد RootSearchPool البحث بالنافذة الجديدة)
+    """
+
+
+@dataclass
+class SearchOptions:
+    """
+    خيارات البحث في AI. كل خيار موثق عند الدالة التي تطبقه (بين القوسين).
+    AI(player, depth, options, **overrides) يأخذ نسخة منها بعد تعديل الحقول
+    المعطاة بالاسم، فيكفي AI(player, depth, star2=False) لتغيير خيار واحد.
+    """
+    # جدول التبديل (start_search، _tt_signature، SharedTranspositionTable)
+    tt_size_mb: float = 8
+    persistent_tt: bool = True
+    shared_tt: Optional[Union[bool, str]] = None
+    verify_tt: bool = False
+    # حدود Star1 / Star2 (_chance_bounds، _star2_probe، _leaf_value)
+    star2: bool = True
+    bounds: str = 'global'
+    validate_bounds: bool = False
+    # حدود كل استدعاء (_start_budget)
+    time_budget_ms: Optional[float] = None
+    node_budget: Optional[int] = None
+    # ترتيب الحركات (_order_moves، _pick_moves، _record_cutoff)
+    pv_ordering: bool = True
+    history: bool = True
+    staged_moves: bool = True
+    # نافذة الجذر (_search_iteration)
+    aspiration_window: Optional[float] = None
+    aspiration_widen: float = 4.0
+    # البحث المتوازي عند الجذر (_choose_parallel)
+    workers: int = 0
+    parallel_split: str = SPLIT_MOVE
+    # ملفات المعرفة المسبقة (_probe_book، _probe_tablebase، Evaluation)
+    opening_book: Optional[str] = None
+    tablebase: Optional[str] = None
+    race_database: Optional[str] = None
+    # التقليم التقريبي (_chance_search، _probcut)
+    sparse_chance_mass: Optional[float] = None
+    full_chance_plies: int = 2
+    probcut: Optional[str] = None
+    probcut_threshold: float = 1.5
+    probcut_min_depth: int = 2
+
+    def __post_init__(self):
+        if self.bounds not in ('global', 'position'):
+            raise ValueError(f"Unknown bounds mode: {self.bounds}")
+        if self.parallel_split not in (SPLIT_MOVE, SPLIT_ROLL):
+            raise ValueError(f"Unknown parallel split: {self.parallel_split}")
+        if self.shared_tt and self.verify_tt:
+            raise ValueError("verify_tt is not supported with a shared table")
+        if self.sparse_chance_mass is not None and not 0 < self.sparse_chance_mass <= 1:
+            raise ValueError(f"sparse_chance_mass must be in (0, 1]: {self.sparse_chance_mass}")
 
 
 class AI:
@@ -11,244 +239,1056 @@ class AI:
     - Transposition Table
     - Move Ordering
     - Iterative Deepening
+
+    البحث يعمل على SearchBoard واحد قابل للتعديل (make_move/unmake_move)
+    يُنشأ مرة واحدة عند الجذر، بدلاً من إنشاء GameState جديد لكل عقدة.
+
+    جدول التبديل (TranspositionTable) ثابت الحجم (ميزانية tt_size_mb ميغابايت)،
+    ويخزن لكل موقع: العمق، نوع الحد (EXACT/LOWER/UPPER)، القيمة وأفضل حركة.
+    عقد الحظ تمرر لكل رمية نافذة Star1 الخاصة بها، لذلك أي قيمة لم تسبب
+    قطعاً هي قيمة دقيقة، وقيم القطع تُخزَّن كحدود فقط.
+
+    خيارات البحث في SearchOptions (self.options).
     """
 
-    def __init__(self, player_symbol, depth):
+    def __init__(self, player_symbol, depth, options=None, **overrides):
+        options = replace(options or SearchOptions(), **overrides)
         self.player = player_symbol
         self.depth = depth
-        self.evaluator = Evaluation(player_symbol, config=load_weights())
+        self.options = options
+        self._sparse_rolls = _ROLLS if options.sparse_chance_mass is None else \
+            _truncate_rolls(_ROLLS, options.sparse_chance_mass)
+        self._pool = None
+        # خيارات AI العمليات العاملة: نفس البحث دون حدود الاستدعاء والكتاب
+        # وأدوات التشخيص (الجدول المشترك يُضبط أدناه)
+        self._worker_options = replace(
+            options, workers=0, time_budget_ms=None, node_budget=None,
+            aspiration_window=None, opening_book=None, verify_tt=False,
+            validate_bounds=False, shared_tt=None)
 
-        # Transposition Table
-        self.transposition_table = {}
+        # ترتيب ديناميكي
+        self.killers = {}
+        self.history_table = {}
+        self._pickers = []
+        self._root_depth = 0
+        config = load_weights()
+        self.evaluator = Evaluation(player_symbol, config=config,
+                                    race_database=options.race_database)
+        self.opening_book = load_book(options.opening_book, config) \
+            if options.opening_book else None
+        self.book_hits = 0
+        self.tablebase = load_tablebase(options.tablebase) if options.tablebase else None
+        self.tablebase_hits = 0
+        self.probcut_model = load_probcut_model(options.probcut, config) \
+            if options.probcut else None
+        self._win_score = self.evaluator.base_config['win_bonus']
+        self._active_bounds = []
+
+        # Transposition Table. shared_tt: جدول في ذاكرة مشتركة بدلاً من الجدول
+        # الخاص (True ينشئ جدولاً جديداً، واسم يتصل بجدول موجود). العمليات
+        # العاملة تتصل بجدول الـ AI نفسه، فما تجده عملية تستفيد منه البقية.
+        # القيم من منظور اللاعب، لذلك كل من يتصل بنفس الجدول يجب أن يبحث لنفس
+        # اللاعب وبنفس أوزان التقييم
+        if options.shared_tt:
+            self.transposition_table = SharedTranspositionTable(
+                size_mb=options.tt_size_mb,
+                name=options.shared_tt if isinstance(options.shared_tt, str) else None)
+            self._worker_options.shared_tt = self.transposition_table.name
+        else:
+            self.transposition_table = TranspositionTable(
+                size_mb=options.tt_size_mb, verify=options.verify_tt)
         self.tt_hits = 0
         self.tt_misses = 0
 
         # إحصائيات
         self.nodes_evaluated = 0
-        self.pruning_count = 0
+        self.star1_cutoffs = 0
+        self.star2_cutoffs = 0
+        self.star2_probes = 0
+        self.decision_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.sparse_chance_nodes = 0
+        self.probcut_prunes = 0
+
+        # حدود البحث لآخر استدعاء. stop_requested يضبطه خيط آخر (مثل Ponderer)
+        # لإيقاف البحث الجاري كما لو انتهى الوقت
+        self.stop_requested = False
+        self._deadline = None
+        self._node_limit = None
+        self._shared = None
+        self._search_alpha = None
+        self._node_budget = None
+        self._search_time_ms = 0.0
+        self.completed_depth = 0
+        self.root_value = None
+        self.search_aborted = False
+        self.nodes_per_depth = []
+        self.aspiration_researches = 0
+        self.aspiration_window_sizes = []
 
     def clear_cache(self):
         self.transposition_table.clear()
         self.tt_hits = 0
         self.tt_misses = 0
         self.nodes_evaluated = 0
-        self.pruning_count = 0
+        self.star1_cutoffs = 0
+        self.star2_cutoffs = 0
+        self.star2_probes = 0
+        self.decision_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.sparse_chance_nodes = 0
+        self.probcut_prunes = 0
+        self.killers = {}
+        self.history_table = {}
 
-    def choose_best_move(self, state, roll):
+    def choose_best_move(self, state, roll, time_budget_ms=None, node_budget=None,
+                         new_search=True):
         """
         نقطة الدخول: لدينا رمية معروفة (roll)، لذا نبدأ بـ Decision Node مباشرة.
+
+        Args:
+            time_budget_ms (float): حد زمني للبحث (الافتراضي options.time_budget_ms)
+            node_budget (int): حد لعدد العقد في هذا الاستدعاء
+                (الافتراضي options.node_budget)
+            new_search (bool): False يتابع البحث الحالي دون start_search():
+                لا جيل جديد في الجدول ولا تقادم لجدول history (يستخدمه Ponderer
+                كي لا تُقادم بحوثه جدول البحث الرئيسي وترتيبه)
         """
+        self._reset_search_stats()
+
         valid_moves = state.get_valid_moves(roll)
         if not valid_moves:
             return None
         if len(valid_moves) == 1:
             return valid_moves[0]
+        book_move = self._probe_book(state, roll, valid_moves)
+        if book_move is not None:
+            return book_move
 
         # 1. Move Ordering (ترتيب الحركات)
-        scored_moves = []
-        for move in valid_moves:
-            priority = self._evaluate_move_priority(move, state)
-            scored_moves.append((priority, move))
-        scored_moves.sort(key=lambda x: x[0], reverse=True)
+        root = self._new_root(state, valid_moves)
 
-        best_move = None
+        # حدود البحث: تُفحص في كل عقدة حظ، وتجاوزها يوقف التكرار الحالي
+        self._start_budget(time_budget_ms, node_budget)
+
+        if self.options.workers:
+            best_move = self._choose_parallel(state, root['moves'], root['best_move'],
+                                              new_search)
+            self._search_time_ms = (time.perf_counter() - self._search_start) * 1000
+            return best_move
+        if new_search:
+            self.start_search()
+
+        # لوحة البحث: تحويل واحد عند الجذر ثم make/unmake في كل الشجرة
+        board = SearchBoard.from_state(state)
 
         # 2. Iterative Deepening (البحث التدريجي)
-        # نبدأ من عمق 1 ونزيد حتى نصل للعمق المطلوب
+        self._iterative_deepening(board, [root])
+
+        self.root_value = root['best_value']
+        self._search_time_ms = (time.perf_counter() - self._search_start) * 1000
+        return root['best_move']
+
+    def choose_policy(self, state, time_budget_ms=None, node_budget=None):
+        """
+        أفضل حركة لكل رمية من الرميات الخمس في بحث واحد، قبل معرفة الرمية.
+
+        الجذور الخمسة (عقدة قرار لكل رمية) تُبحث معاً في تعميق تدريجي واحد:
+        كل عمق يُكمل كل الرميات (الأكثر احتمالاً أولاً) قبل العمق التالي، مع
+        جدول تبديل وkillers/history مشتركة وجيل واحد في الجدول. عند انتهاء
+        الوقت تبقى لكل رمية حركة آخر عمق مكتمل لها.
+
+        Returns:
+            dict: {roll: move} (None للرمية التي لا حركات لها)
+        """
+        self._reset_search_stats()
+        policy = {}
+        roots = []
+        for roll, _ in sorted(get_all_possible_rolls(),
+                              key=lambda x: x[1], reverse=True):
+            valid_moves = state.get_valid_moves(roll)
+            if len(valid_moves) < 2:
+                policy[roll] = valid_moves[0] if valid_moves else None
+                continue
+            policy[roll] = self._probe_book(state, roll, valid_moves)
+            if policy[roll] is None:
+                root = self._new_root(state, valid_moves)
+                root['roll'] = roll
+                roots.append(root)
+
+        self._start_budget(time_budget_ms, node_budget)
+        if roots:
+            self.start_search()
+            board = SearchBoard.from_state(state)
+            self._iterative_deepening(board, roots)
+        for root in roots:
+            policy[root['roll']] = root['best_move']
+
+        self._search_time_ms = (time.perf_counter() - self._search_start) * 1000
+        return policy
+
+    def _probe_book(self, state, roll, valid_moves):
+        """
+        حركة الكتاب (options.opening_book، players.opening_book) للموقع والرمية
+        أو None. يُتجاهل الكتاب إذا بُني بأوزان تقييم مختلفة.
+        """
+        if self.opening_book is None:
+            return None
+        entry = self.opening_book.probe(state.get_zobrist_key(), roll)
+        if entry is None or entry[0] not in valid_moves:
+            return None
+        self.book_hits += 1
+        self.root_value = entry[1]
+        return entry[0]
+
+    def _reset_search_stats(self):
+        self.completed_depth = 0
+        self.root_value = None
+        self.search_aborted = False
+        self._search_time_ms = 0.0
+        self.nodes_per_depth = []
+        self.aspiration_researches = 0
+        self.aspiration_window_sizes = []
+
+    def _new_root(self, state, valid_moves):
+        """
+        جذر بحث لرمية واحدة: الحركات مرتبة بالأولوية الثابتة، وأفضل حركة
+        مبدئية هي الأولى (تُلعب إذا توقف البحث قبل إكمال العمق الأول).
+        """
+        board = state.get_board()
+        opponent = state.get_opponent_symbol()
+        scored_moves = [(self._move_priority(move[0], move[1], board, opponent), move)
+                        for move in valid_moves]
+        scored_moves.sort(key=lambda x: x[0], reverse=True)
+        return {'moves': scored_moves, 'best_move': scored_moves[0][1],
+                'best_value': None, 'depth': 0}
+
+    def _iterative_deepening(self, board, roots):
+        """
+        التعميق التدريجي لجذر واحد أو أكثر على نفس اللوحة: نبدأ من عمق 1
+        ونزيد حتى نصل للعمق المطلوب، وكل عمق يبحث كل الجذور بالترتيب.
+        """
         for current_depth in range(1, self.depth + 1):
+            iteration_start = self.nodes_evaluated
+            self._root_depth = current_depth
+            try:
+                for root in roots:
+                    self._search_iteration(board, root, current_depth)
+            except SearchBudgetExceeded:
+                # التكرار الناقص آمن فقط إذا بحث أفضل حركة من التكرار السابق
+                # وحصل على قيمة داخل النافذة أو فوقها: عندها أفضل حركة فيه ليست
+                # أسوأ منها على العمق الجديد
+                self.search_aborted = True
+                if root['current_move'] is not None and \
+                   root['current_value'] > root['alpha'] and \
+                   (root['depth'] == 0 or root['best_move'] in root['searched']):
+                    root['best_move'] = root['current_move']
+                self.nodes_per_depth.append(self.nodes_evaluated - iteration_start)
+                break
+
+            self.completed_depth = current_depth
+            self.nodes_per_depth.append(self.nodes_evaluated - iteration_start)
+
+    def _search_iteration(self, board, root, current_depth):
+        """
+        تكرار واحد (عمق current_depth) لجذر واحد مع aspiration window.
+        يحدّث root أثناء البحث (current_move / current_value / alpha / searched)
+        لتبقى أفضل نتيجة جزئية متاحة إذا رُفع SearchBudgetExceeded.
+
+        aspiration_window: من العمق الثاني تبدأ الدورة بنافذة [v - w, v + w]
+        حول قيمة العمق السابق v؛ عند الفشل المنخفض أو المرتفع تُضرب w في
+        aspiration_widen ويُعاد البحث (None = النافذة الكاملة دائماً).
+        """
+        best_value = root['best_value']
+        scored_moves = root['moves']
+
+        # Aspiration window: نافذة حول قيمة العمق السابق بدلاً من النافذة الكاملة
+        window = self.options.aspiration_window
+        if best_value is None or not window:
+            alpha, beta = MIN_POSSIBLE_SCORE, MAX_POSSIBLE_SCORE
+        else:
+            alpha = max(MIN_POSSIBLE_SCORE, best_value - window)
+            beta = min(MAX_POSSIBLE_SCORE, best_value + window)
 
+        while True:
             # إعادة تهيئة المتغيرات للبحث الحالي
-            current_best_move = None
-            current_best_val = -math.inf
-            alpha = MIN_POSSIBLE_SCORE
-            beta = MAX_POSSIBLE_SCORE
+            root['current_move'] = None
+            root['current_value'] = -math.inf
+            root['alpha'] = alpha
+            root['searched'] = searched = []
+            root_alpha = alpha
+            root_values = {}
 
             # نقوم بالبحث لأفضل الحركات المرتبة
             for _, move in scored_moves:
-                child_state = state.apply_move(move[0], move[1])
+                board.make_move(move[0], move[1])
 
                 # الانتقال لعقدة الحظ (لأن الدور انتهى وسيرمي الخصم)
                 # ملاحظة: الخصم هو Min، لذا نمرر maximizing=False
                 val = self._chance_node(
-                    child_state,
+                    board,
                     current_depth - 1,
-                    alpha,
+                    root_alpha,
                     beta,
                     maximizing=False
                 )
+                board.unmake_move()
+                searched.append(move)
+                root_values[move] = val
 
-                if val > current_best_val:
-                    current_best_val = val
-                    current_best_move = move
+                if val > root['current_value']:
+                    root['current_value'] = val
+                    root['current_move'] = move
+
+                # فشل مرتفع: القيمة الحقيقية فوق النافذة
+                if val >= beta:
+                    break
 
                 # تحديث Alpha للجذر
-                alpha = max(alpha, val)
+                root_alpha = max(root_alpha, val)
+
+            # القيمة خارج النافذة: توسيعها من الجهة التي فشلت وإعادة البحث
+            current_best_val = root['current_value']
+            if current_best_val <= alpha and alpha > MIN_POSSIBLE_SCORE:
+                window *= self.options.aspiration_widen
+                alpha = max(MIN_POSSIBLE_SCORE, best_value - window)
+            elif current_best_val >= beta and beta < MAX_POSSIBLE_SCORE:
+                window *= self.options.aspiration_widen
+                beta = min(MAX_POSSIBLE_SCORE, best_value + window)
+            else:
+                break
+            self.aspiration_researches += 1
+
+        root['best_value'] = current_best_val
+        root['best_move'] = root['current_move']
+        root['depth'] = current_depth
+        self.aspiration_window_sizes.append(beta - alpha)
 
-            best_move = current_best_move
+        # تحديث ترتيب الحركات بناءً على نتائج هذا العمق لتسريع العمق القادم:
+        # الترتيب حسب القيم (أفضل حركة أولاً)، والأولوية الثابتة عند التساوي.
+        # القيم غير الأفضل حدود عليا فقط (فشل منخفض) لكنها تكفي للترتيب
+        if self.options.pv_ordering:
+            scored_moves.sort(
+                key=lambda x: (root_values.get(x[1], -math.inf), x[0]),
+                reverse=True)
 
-            # تحديث ترتيب الحركات بناءً على نتائج هذا العمق لتسريع العمق القادم
-            # (نضع أفضل حركة وجدناها في المقدمة)
-            if best_move:
-                # نبحث عن الحركة في القائمة ونضعها في الأول
-                # هذا تبسيط، الأفضل إعادة الترتيب بالكامل لكن هذا يكفي
-                pass
+    def _choose_parallel(self, state, scored_moves, best_move, new_search=True):
+        """
+        التعميق التدريجي مع توزيع حركات الجذر على عمليات RootSearchPool
+        (options.workers، تُنشأ عند أول استدعاء وتبقى حتى close()): مهمة لكل
+        حركة جذر (parallel_split='move') تتابع alpha المشتركة، أو مهمة لكل
+        (حركة جذر، رمية أولى) (parallel_split='roll') بنافذة كاملة.
+        stop_requested يُنقل إلى العمليات عبر الذاكرة المشتركة، فتتوقف مهامها
+        كما لو انتهى الوقت.
+        """
+        if self._pool is None:
+            self._pool = RootSearchPool(self.options.workers, self._worker_options)
+            self._pool.set_stop(self._stop_requested)
+        if new_search:
+            self._pool.new_search()
+            self.start_search()
+        deadline = None
+        if self._deadline is not None:
+            deadline = time.time() + (self._deadline - time.perf_counter())
 
+        for current_depth in range(1, self.depth + 1):
+            moves = [move for _, move in scored_moves]
+            node_budget = None if self._node_limit is None else \
+                max(0, self._node_limit - self.nodes_evaluated)
+            results, nodes = self._pool.search_moves(
+                state, moves, current_depth, deadline, self.options.parallel_split,
+                node_budget)
+            self.nodes_evaluated += nodes
+            self.nodes_per_depth.append(nodes)
+            if results is None:
+                self.search_aborted = True
+                break
+
+            # أفضل قيمة دقيقة (القيم <= alpha التي قرأتها المهمة حدود عليا فقط)،
+            # وعند التساوي الحركة الأسبق بالترتيب كما في البحث التسلسلي
+            root_values = {}
+            best_val = -math.inf
+            for move, val, exact in results:
+                root_values[move] = val
+                if exact and val > best_val:
+                    best_val = val
+                    best_move = move
+            self.completed_depth = current_depth
+
+            if self.options.pv_ordering:
+                scored_moves.sort(
+                    key=lambda x: (root_values.get(x[1], -math.inf), x[0]),
+                    reverse=True)
+            if self._node_limit is not None and self.nodes_evaluated >= self._node_limit:
+                self.search_aborted = current_depth < self.depth
+                break
         return best_move
 
-    def _chance_node(self, state, depth, alpha, beta, maximizing):
+    def search_root_move(self, board, move, depth, alpha, beta, time_budget_ms=None,
+                         maximizing=True, shared=None, node_budget=None):
+        """
+        بحث حركة جذر واحدة بعمق depth (مهمة عملية عاملة في البحث المتوازي).
+        يعيد قيمة fail-soft ضمن [alpha, beta]، أو None عند انتهاء الوقت
+        (اللوحة تبقى عندها في حالة غير محددة). maximizing=False إذا كانت
+        الحركة للخصم (القيمة تبقى من منظور اللاعب).
+
+        shared: مصفوفة RootSearchPool في ذاكرة مشتركة، تُقرأ مع فحص الوقت (كل
+        32 عقدة). علامة الإيقاف فيها تنهي البحث كانتهاء الوقت، وإذا رفعت عملية
+        أخرى alpha المشتركة فوق alpha يُرفع SharedAlphaRaised (اللوحة أيضاً في
+        حالة غير محددة).
+
+        node_budget: حد العقد المشترك بين العمليات (claim / release): تؤخذ
+        العقد منه دفعة دفعة، وعند نفاده يتوقف البحث كانتهاء الوقت.
+        """
+        self._root_depth = depth
+        self._start_shared_search(time_budget_ms, shared, node_budget, alpha)
+        board.make_move(move[0], move[1])
+        try:
+            val = self._chance_node(board, depth - 1, alpha, beta,
+                                    maximizing=not maximizing)
+        except SearchBudgetExceeded:
+            return None
+        finally:
+            self._end_shared_search()
+        board.unmake_move()
+        return val
+
+    def search_root_roll(self, board, move, roll, depth, time_budget_ms=None,
+                         shared=None, node_budget=None):
+        """
+        القيمة الدقيقة لرمية الخصم roll بعد حركة الجذر move (parallel_split='roll').
+        shared وnode_budget كما في search_root_move (النافذة كاملة، فتُهمل
+        alpha المشتركة).
+        """
+        self._root_depth = depth
+        self._start_shared_search(time_budget_ms, shared, node_budget, math.inf)
+        board.make_move(move[0], move[1])
+        try:
+            val = self._decision_node(board, depth - 1, roll, MIN_POSSIBLE_SCORE,
+                                      MAX_POSSIBLE_SCORE, maximizing=False)
+        except SearchBudgetExceeded:
+            return None
+        finally:
+            self._end_shared_search()
+        board.unmake_move()
+        return val
+
+    def _start_shared_search(self, time_budget_ms, shared, node_budget, alpha):
+        # _node_limit رقم أول عقدة ممنوعة: يبدأ الحد المشترك بصفر عقد مأخوذة،
+        # فتؤخذ الدفعة الأولى عند أول عقدة
+        self._start_budget(time_budget_ms, None if node_budget is None else 1)
+        self._shared = shared
+        self._node_budget = node_budget
+        self._search_alpha = alpha
+
+    def _end_shared_search(self):
+        # العقد المأخوذة التي لم تُبحث تعود إلى العمليات الأخرى
+        if self._node_budget is not None:
+            self._node_budget.release(
+                max(0, self._node_limit - 1 - self.nodes_evaluated))
+        self._shared = None
+        self._node_budget = None
+
+    @property
+    def stop_requested(self):
+        return self._stop_requested
+
+    @stop_requested.setter
+    def stop_requested(self, value):
+        # يُنقل إلى عمليات البحث المتوازي، التي لا ترى هذا الكائن
+        self._stop_requested = value
+        if self._pool is not None:
+            self._pool.set_stop(value)
+
+    def start_search(self):
         """
-        عقدة الحظ: تطبق Star1 Pruning.
+        بداية بحث جديد: جيل جديد في الجدول وتحديث الترتيب. persistent_tt=True
+        يُبقي الجدول بين البحوث طوال اللعبة (المدخلات القديمة تُستبدل أولاً ما
+        لم تُستخدم)، وpersistent_tt=False يمسحه في بداية كل بحث (للمقارنة).
+        """
+        if not self.options.persistent_tt:
+            self.transposition_table.clear()
+        self.transposition_table.new_search()
+        self._start_ordering()
+
+    def close(self):
+        """إيقاف عمليات البحث المتوازي (إن وجدت) وتحرير الذاكرة المشتركة"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        if isinstance(self.transposition_table, SharedTranspositionTable):
+            self.transposition_table.close()
+
+    def _start_budget(self, time_budget_ms, node_budget):
+        """
+        أقصى وقت / عدد عقد لهذا الاستدعاء (الافتراضي options.time_budget_ms /
+        options.node_budget): يتوقف التعميق التدريجي عند الحد وتُعاد أفضل حركة
+        من آخر عمق مكتمل (أو من العمق الناقص إذا كان آمناً). مع workers تتقاسم
+        العمليات ما بقي من حد العقد في كل عمق (RootSearchPool).
+        """
+        if time_budget_ms is None:
+            time_budget_ms = self.options.time_budget_ms
+        if node_budget is None:
+            node_budget = self.options.node_budget
+        self._search_start = time.perf_counter()
+        self._deadline = None if time_budget_ms is None else \
+            self._search_start + time_budget_ms / 1000
+        self._node_limit = None if node_budget is None else \
+            self.nodes_evaluated + node_budget
+
+    def _check_budget(self):
+        """يرفع SearchBudgetExceeded عند تجاوز حد العقد أو الوقت أو طلب الإيقاف"""
+        if self._node_limit is not None and self.nodes_evaluated >= self._node_limit:
+            granted = 0
+            if self._node_budget is not None:
+                granted = self._node_budget.claim(NODE_CHUNK)
+            if not granted:
+                if self._node_budget is not None:
+                    # هذه العقدة لم تُبحث ولم تُؤخذ من الحد المشترك
+                    self.nodes_evaluated -= 1
+                raise SearchBudgetExceeded()
+            self._node_limit += granted
+        # قراءة الساعة كل 32 عقدة تكفي (أقل من ميلي ثانية بين القراءات)
+        if self.nodes_evaluated & 31:
+            return
+        if self._stop_requested or (
+                self._deadline is not None and time.perf_counter() >= self._deadline):
+            raise SearchBudgetExceeded()
+        shared = self._shared
+        if shared is not None:
+            if shared[SHARED_STOP]:
+                raise SearchBudgetExceeded()
+            if shared[SHARED_ALPHA] > self._search_alpha:
+                raise SharedAlphaRaised()
+
+    def _chance_node(self, board, depth, alpha, beta, maximizing):
+        """
+        عقدة الحظ: تطبق Star1 Pruning، ومع star2=True تسبقها مرحلة Star2.
         تحسب القيمة المتوقعة لجميع الرميات الممكنة.
         """
         self.nodes_evaluated += 1
+        self._check_budget()
 
-        if depth == 0 or state.is_terminal():
-            return self.evaluator.evaluate_board(state.get_board())
+        if depth == 0 or board.is_terminal():
+            return self._evaluate(board)
+        if self.tablebase is not None:
+            # قيمة الجدول دقيقة مهما كان العمق المتبقي
+            value = self._probe_tablebase(board)
+            if value is not None:
+                return self._leaf_value(value)
 
         # Transposition Table Lookup
-        state_key = (hash(state), depth, 'chance', maximizing)
-        if state_key in self.transposition_table:
-            self.tt_hits += 1
-            return self.transposition_table[state_key]
-        self.tt_misses += 1
+        state_key = self._tt_key(board, maximizing)
+        signature = self._tt_signature(board, 0, maximizing) \
+            if self.options.verify_tt else None
+        hit, _ = self._probe_tt(state_key, depth, alpha, beta, signature)
+        if hit is not None:
+            return hit
+
+        if self.options.validate_bounds:
+            self._active_bounds.append(
+                self._chance_bounds(board, depth, maximizing))
+            try:
+                return self._chance_search(board, depth, alpha, beta, maximizing,
+                                           state_key, signature)
+            finally:
+                self._active_bounds.pop()
+        return self._chance_search(board, depth, alpha, beta, maximizing,
+                                   state_key, signature)
+
+    def _chance_search(self, board, depth, alpha, beta, maximizing,
+                       state_key, signature):
+        """
+        sparse_chance_mass: عقد الحظ بعد المستوى full_chance_plies (عقد الحظ بعد
+        حركة الجذر هي المستوى 1) تبحث فقط أكثر الرميات احتمالاً حتى يبلغ مجموع
+        احتمالاتها sparse_chance_mass (_truncate_rolls). القيمة تقريبية وتُخزَّن
+        في الجدول كغيرها.
+        """
+        rolls = _ROLLS
+        if self.options.sparse_chance_mass is not None and \
+                self._root_depth - depth > self.options.full_chance_plies:
+            rolls = self._sparse_rolls
+            self.sparse_chance_nodes += 1
+
+        # أدنى وأعلى قيمة ممكنة لأي ورقة تحت هذه العقدة. قيم الأبناء تُقص
+        # إلى هذا المجال (قيم الجدول قد تأتي من بحث أعمق) ليبقى Star1 صحيحاً
+        lower, upper = self._chance_bounds(board, depth, maximizing)
+
+        # حدود قيمة كل رمية قبل البحث الكامل: حدود العقدة افتراضياً،
+        # ومرحلة Star2 تشدد جهة واحدة منها (الدنيا لعقد Max، العليا لعقد Min)
+        lower_bounds = [lower] * len(rolls)
+        upper_bounds = [upper] * len(rolls)
+        if self.options.star2:
+            probe_bounds = lower_bounds if maximizing else upper_bounds
+            cut = self._star2_probe(board, depth, rolls, alpha, beta,
+                                    maximizing, probe_bounds, lower, upper)
+            if cut is not None:
+                self.star2_cutoffs += 1
+                self._store_tt(state_key, depth, LOWER if maximizing else UPPER,
+                               cut, None, signature)
+                return cut
 
         expected_value = 0.0
-        cumulative_prob = 0.0
+        rest_lower = sum(prob * bound
+                         for (_, prob), bound in zip(rolls, lower_bounds))
+        rest_upper = sum(prob * bound
+                         for (_, prob), bound in zip(rolls, upper_bounds))
+
+        for i, (roll, prob) in enumerate(rolls):
+            rest_lower -= prob * lower_bounds[i]
+            rest_upper -= prob * upper_bounds[i]
 
-        # ترتيب الرميات حسب الاحتمالية (الأكبر أولاً) لزيادة كفاءة Star1
-        rolls = sorted(get_all_possible_rolls(),
-                       key=lambda x: x[1], reverse=True)
+            # --- Star1: نافذة هذه الرمية ---
+            # إذا كانت قيمتها <= roll_alpha فحتى أفضل قيمة للرميات الباقية
+            # لن ترفع المتوقع فوق alpha (والعكس لـ roll_beta)
+            roll_alpha = (alpha - expected_value - rest_upper) / prob
+            roll_beta = (beta - expected_value - rest_lower) / prob
 
-        for roll, prob in rolls:
             # نستدعي عقدة القرار لكل رمية
             val = self._decision_node(
-                state, depth, roll, alpha, beta, maximizing)
+                board, depth, roll,
+                max(lower, roll_alpha), min(upper, roll_beta), maximizing)
+            val = min(max(val, lower), upper)
+
+            # التقليم
+            if val <= roll_alpha:
+                self.star1_cutoffs += 1
+                bound = expected_value + prob * val + rest_upper
+                self._store_tt(state_key, depth, UPPER, bound, None, signature)
+                return bound  # Fail-low
+            if val >= roll_beta:
+                self.star1_cutoffs += 1
+                bound = expected_value + prob * val + rest_lower
+                self._store_tt(state_key, depth, LOWER, bound, None, signature)
+                return bound  # Fail-high
 
             expected_value += prob * val
-            cumulative_prob += prob
 
-            # --- Star1 Pruning Logic ---
-            remaining_prob = 1.0 - cumulative_prob
+        # تخزين النتيجة
+        self._store_tt(state_key, depth, EXACT, expected_value, None, signature)
+        return expected_value
+
+    def _star2_probe(self, board, depth, rolls, alpha, beta, maximizing, bounds,
+                     lower, upper):
+        """
+        مرحلة Star2: نبحث حركة واحدة فقط لكل رمية (حركة الجدول أو الأولى
+        بالترتيب). عند Max قيمة حركة واحدة حد أدنى لقيمة الرمية، وعند Min
+        حد أعلى. تُكتب هذه الحدود في bounds، وإذا كفت وحدها لتجاوز beta
+        (أو النزول تحت alpha) نعيد الحد مباشرة دون البحث الكامل.
+        """
+        known = 0.0
+        remaining_prob = 1.0
+        for i, (roll, prob) in enumerate(rolls):
+            remaining_prob -= prob
+            roll_alpha = (alpha - known - remaining_prob * upper) / prob
+            roll_beta = (beta - known - remaining_prob * lower) / prob
 
-            # أقصى قيمة ممكنة يمكن الوصول إليها
-            max_possible = expected_value + \
-                (remaining_prob * MAX_POSSIBLE_SCORE)
-            # أدنى قيمة ممكنة يمكن الوصول إليها
-            min_possible = expected_value + \
-                (remaining_prob * MIN_POSSIBLE_SCORE)
+            val = self._probe_decision(
+                board, depth, roll,
+                max(lower, roll_alpha), min(upper, roll_beta), maximizing)
+            val = min(max(val, lower), upper)
 
-            # التقليم
-            if max_possible <= alpha:
-                self.pruning_count += 1
-                return alpha  # Fail-low
-            if min_possible >= beta:
-                self.pruning_count += 1
-                return beta  # Fail-high
+            if maximizing:
+                if val >= roll_beta:
+                    return known + prob * val + remaining_prob * lower
+                # فشل منخفض = حد أعلى فقط، لا يفيد كحد أدنى
+                if val > roll_alpha:
+                    bounds[i] = val
+            else:
+                if val <= roll_alpha:
+                    return known + prob * val + remaining_prob * upper
+                if val < roll_beta:
+                    bounds[i] = val
+            known += prob * bounds[i]
+        return None
 
-        # تخزين النتيجة
-        self._store_tt(state_key, expected_value)
-        return expected_value
+    def _probe_decision(self, board, depth, roll, alpha, beta, maximizing):
+        """عقدة قرار مختصرة لـ Star2: تبحث حركة واحدة فقط."""
+        if depth <= 0 or board.is_terminal():
+            return self._evaluate(board)
 
-    def _decision_node(self, state, depth, roll, alpha, beta, maximizing):
+        valid_moves = board.get_valid_moves(roll)
+        if not valid_moves:
+            board.make_pass()
+            val = self._chance_node(board, depth - 1, alpha, beta, not maximizing)
+            board.unmake_move()
+            return val
+
+        state_key = self._tt_key(board, maximizing) ^ _TT_ROLL_KEYS[roll]
+        signature = self._tt_signature(board, roll, maximizing) \
+            if self.options.verify_tt else None
+        entry = self.transposition_table.probe(state_key, signature)
+        move = None
+        if entry is not None:
+            move = entry[3]
+        if move not in valid_moves:
+            ply = self._root_depth - depth
+            if self.options.staged_moves:
+                move = next(self._pick_moves(valid_moves, board, None, roll, ply))
+            else:
+                move = self._order_moves(valid_moves, board, None, roll, ply)[0]
+
+        self.star2_probes += 1
+        board.make_move(move[0], move[1])
+        val = self._chance_node(board, depth - 1, alpha, beta, not maximizing)
+        board.unmake_move()
+        return val
+
+    def _decision_node(self, board, depth, roll, alpha, beta, maximizing):
         """
         عقدة القرار: تطبق Alpha-Beta Pruning التقليدية.
         تختار أفضل حركة بعد معرفة الرمية.
         """
-        if depth <= 0 or state.is_terminal():  # تغيير depth == 0 إلى depth <= 0 للأمان
-            return self.evaluator.evaluate_board(state.get_board())
+        if depth <= 0 or board.is_terminal():  # تغيير depth == 0 إلى depth <= 0 للأمان
+            return self._evaluate(board)
 
-        valid_moves = state.get_valid_moves(roll)
+        valid_moves = board.get_valid_moves(roll)
 
         # حالة عدم وجود حركات (تمرير الدور)
         if not valid_moves:
-            next_player = -state.get_current_player()  # تبديل اللاعب
-            # ملاحظة: في كود GameState الخاص بك، قد تحتاج للتأكد من كيفية تبديل الدور يدوياً
-            # هنا نفترض إنشاء حالة جديدة بنفس اللوحة ولكن للاعب التالي
-            next_state = GameState(state.get_vector(), next_player)
+            # نفس اللوحة ولكن للاعب التالي، الذي سيرمي العصي (Chance Node)
+            board.make_pass()
+            val = self._chance_node(board, depth-1, alpha, beta, not maximizing)
+            board.unmake_move()
+            return val
 
-            # إذا كنا Max والآن دور Min، نذهب لـ Chance node للـ Min
-            # لكن مهلاً، إذا مررنا الدور، فاللاعب التالي سيرمي العصي.
-            # لذا نذهب لـ Chance Node
-            return self._chance_node(next_state, depth-1, alpha, beta, not maximizing)
+        state_key = self._tt_key(board, maximizing) ^ _TT_ROLL_KEYS[roll]
+        signature = self._tt_signature(board, roll, maximizing) \
+            if self.options.verify_tt else None
+        hit, tt_move = self._probe_tt(state_key, depth, alpha, beta, signature)
+        if hit is not None:
+            return hit
+        alpha_orig, beta_orig = alpha, beta
 
-        # ترتيب الحركات (Heuristic)
-        sorted_moves = self._order_moves(valid_moves, state)
+        # ترتيب الحركات (Heuristic + killer/history)، وأفضل حركة من الجدول أولاً
+        ply = self._root_depth - depth
+        if self.options.staged_moves:
+            moves = self._pick_moves(valid_moves, board, tt_move, roll, ply)
+        else:
+            moves = self._order_moves(valid_moves, board, tt_move, roll, ply)
+        best_move = None
+        cutoff_index = -1
+        probcut_line = self._probcut_line(depth)
 
         if maximizing:
             best_val = -math.inf
-            for move in sorted_moves:
-                child_state = state.apply_move(move[0], move[1])
+            for index, move in enumerate(moves):
+                board.make_move(move[0], move[1])
+                if probcut_line is not None and index and \
+                        self._probcut(board, alpha, beta, maximizing, probcut_line):
+                    board.unmake_move()
+                    continue
 
                 # بعد حركتي (Max)، يأتي دور الخصم (Min) ليرمي العصي
                 val = self._chance_node(
-                    child_state, depth - 1, alpha, beta, maximizing=False)
+                    board, depth - 1, alpha, beta, maximizing=False)
+                board.unmake_move()
 
-                best_val = max(best_val, val)
+                if val > best_val:
+                    best_val = val
+                    best_move = move
                 alpha = max(alpha, best_val)
                 if beta <= alpha:
+                    cutoff_index = index
                     break  # Beta Cutoff
-            return best_val
         else:  # Minimizing
             best_val = math.inf
-            for move in sorted_moves:
-                child_state = state.apply_move(move[0], move[1])
+            for index, move in enumerate(moves):
+                board.make_move(move[0], move[1])
+                if probcut_line is not None and index and \
+                        self._probcut(board, alpha, beta, maximizing, probcut_line):
+                    board.unmake_move()
+                    continue
 
                 # بعد حركة الخصم (Min)، يأتي دوري (Max) لأرمي العصي
                 val = self._chance_node(
-                    child_state, depth - 1, alpha, beta, maximizing=True)
+                    board, depth - 1, alpha, beta, maximizing=True)
+                board.unmake_move()
 
-                best_val = min(best_val, val)
+                if val < best_val:
+                    best_val = val
+                    best_move = move
                 beta = min(beta, best_val)
                 if beta <= alpha:
+                    cutoff_index = index
                     break  # Alpha Cutoff
-            return best_val
 
-    def _store_tt(self, key, value):
-        self.transposition_table[key] = value
-        # تنظيف بسيط للذاكرة
-        if len(self.transposition_table) > 200000:
-            self.transposition_table.clear()
+        if cutoff_index >= 0:
+            self._record_cutoff(best_move, cutoff_index, board, roll, ply, depth)
 
-    def _evaluate_move_priority(self, move, state):
-        from_pos, to_pos = move
-        priority = 0
+        if best_val <= alpha_orig:
+            bound = UPPER
+        elif best_val >= beta_orig:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self._store_tt(state_key, depth, bound, best_val, best_move, signature)
+        return best_val
 
-        # أولوية قصوى للخروج
-        if to_pos == OFF_BOARD:
-            return 30000
+    def _probcut_line(self, depth):
+        """
+        (a, b, sigma) للتنبؤ بقيمة أبناء عقدة قرار بعمق depth (أو None) من
+        نموذج ProbCut (options.probcut، players.probcut): deep ≈ a * shallow + b
+        بانحراف sigma، للعقد بعمق probcut_min_depth فما فوق.
+        """
+        if self.probcut_model is None or depth < self.options.probcut_min_depth:
+            return None
+        line = self.probcut_model['lines'].get(depth - 1)
+        if line is None or line[0] <= 0:
+            return None
+        return line
 
-        # أولوية عالية للتقدم المتأخر
-        if to_pos >= 25:
-            priority += 10000 + to_pos * 50
-        elif to_pos >= 20:
-            priority += 5000 + to_pos * 20
+    def _probcut(self, board, alpha, beta, maximizing, line):
+        """
+        ProbCut لحركة مطبقة على board: بحث ضحل بنافذة صفرية عند القيمة الضحلة
+        التي يقابلها alpha - threshold * sigma (أو beta + threshold * sigma لعقد
+        Min) على خط النموذج. True إذا كانت الحركة شبه مؤكدة خارج النافذة.
+        تقليم تقريبي، لا يُطبَّق على أول حركة بالترتيب.
+        """
+        a, b, sigma = line
+        margin = self.options.probcut_threshold * sigma
+        shallow_depth = self.probcut_model['shallow_depth']
+        if maximizing:
+            if alpha <= MIN_POSSIBLE_SCORE:
+                return False
+            bound = (alpha - margin - b) / a
+            pruned = self._chance_node(board, shallow_depth, bound, bound + 1,
+                                       maximizing=False) <= bound
+        else:
+            if beta >= MAX_POSSIBLE_SCORE:
+                return False
+            bound = (beta + margin - b) / a
+            pruned = self._chance_node(board, shallow_depth, bound - 1, bound,
+                                       maximizing=True) >= bound
+        if pruned:
+            self.probcut_prunes += 1
+        return pruned
 
-        # مكافأة بيت السعادة لكن ليس مفرطة
-        if to_pos == HOUSE_OF_HAPPINESS:
-            priority += 2000
+    def _chance_bounds(self, board, depth, maximizing):
+        """
+        (lower, upper) لقيم الأوراق تحت عقدة حظ بعمق depth، حسب options.bounds:
+        - 'global' (الافتراضي): الحدود العامة ±50000
+        - 'position': حدود محسوبة من الموقع وعدد الحركات المتبقية
+          (Evaluation.get_score_bounds). تقلل العقد لكن حسابها في كل عقدة حظ
+          يكلف أكثر مما توفره مع Star2، لذلك هي اختيارية. مع tablebase تُوسَّع
+          إلى ±win_bonus متى أمكن الوصول إلى الجدول تحت العقدة.
+        """
+        if self.options.bounds == 'position':
+            # maximizing: اللاعب (Max) يتحرك أولاً بعد هذه الرمية
+            my_moves = (depth + 1) // 2 if maximizing else depth // 2
+            lower, upper = self.evaluator.get_score_bounds(
+                board.cells, my_moves, depth - my_moves)
+            if self.tablebase is not None and \
+                    self._tablebase_reachable(board, my_moves, depth - my_moves):
+                lower = min(lower, -self._win_score)
+                upper = max(upper, self._win_score)
+            return lower, upper
+        return MIN_POSSIBLE_SCORE, MAX_POSSIBLE_SCORE
 
-        # عقوبة قوية للماء
-        if to_pos == HOUSE_WATER:
-            priority -= 10000
+    def _evaluate(self, board):
+        """
+        قيمة الورقة: من الجدول إن وُجد، وإلا من Evaluation (التي تستخدم قاعدة
+        بيانات السباق options.race_database للمواقع الموجودة فيها).
+        """
+        value = None
+        if self.tablebase is not None:
+            value = self._probe_tablebase(board)
+        if value is None:
+            value = self.evaluator.evaluate_board(
+                board.cells, to_move=board.get_current_player_symbol())
+        return self._leaf_value(value)
 
-        # هجوم جيد لكن ليس أولوية مطلقة
-        board = state.get_board()
-        if to_pos < BOARD_SIZE and board[to_pos] == state.get_opponent_symbol():
-            priority += 1200  # كان 500 سابقاً → جيد لكن ليس أعلى من التقدم
+    def _leaf_value(self, value):
+        """
+        validate_bounds=True: يتحقق أن كل تقييم ورقة يقع داخل حدود كل عقد الحظ
+        فوقه (AssertionError عند المخالفة، للتشخيص فقط).
+        """
+        if self.options.validate_bounds:
+            for lower, upper in self._active_bounds:
+                assert lower <= value <= upper, \
+                    f"evaluation {value} outside bounds [{lower}, {upper}]"
+        return value
 
-        # مكافأة عامة للتقدم
-        priority += to_pos * 25
+    def _probe_tablebase(self, board):
+        """
+        قيمة الموقع من جدول النهايات (options.tablebase، players.tablebase)
+        من منظور اللاعب: (2p - 1) * win_bonus حيث p احتمال فوزه، أو None إذا
+        كان لأحد الطرفين أكثر من k قطع. القيمة دقيقة، لذلك تُستخدم في أي عقدة
+        حظ مهما كان العمق المتبقي.
+        """
+        symbol = board.get_current_player_symbol()
+        opponent = board.get_opponent_symbol()
+        cells = board.cells
+        # العدّ أرخص من بناء القائمتين، ومعظم العقد خارج الجدول
+        k = self.tablebase.pieces
+        if cells.count(symbol) > k or cells.count(opponent) > k:
+            return None
+        mine = [pos for pos, cell in enumerate(cells) if cell == symbol]
+        theirs = [pos for pos, cell in enumerate(cells) if cell == opponent]
+        p = self.tablebase.probe(mine, theirs)
+        if p is None:
+            return None
+        self.tablebase_hits += 1
+        if symbol != self.player:
+            p = 1.0 - p
+        return (2.0 * p - 1.0) * self._win_score
 
-        return priority
+    def _tablebase_reachable(self, board, my_moves, opp_moves):
+        """هل يمكن أن يصل موقع تحت هذه العقدة إلى الجدول (قطعة تخرج لكل حركة)"""
+        mine = board.cells.count(self.player)
+        theirs = board.cells.count(self.evaluator.opponent)
+        k = self.tablebase.pieces
+        return mine - my_moves <= k and theirs - opp_moves <= k
 
-    def _order_moves(self, moves, state):
-        scored = [(self._evaluate_move_priority(m, state), m) for m in moves]
+    def _tt_key(self, state, maximizing):
+        """مفتاح عددي واحد: Zobrist الحالة ^ مفتاح الدور"""
+        key = state.get_zobrist_key()
+        if maximizing:
+            key ^= _TT_MAXIMIZING_KEY
+        return key
+
+    def _tt_signature(self, state, roll, maximizing):
+        """
+        الموقع الكامل، يستخدم فقط في وضع verify_tt: يُخزَّن مع كل مدخل ويُتحقق
+        منه عند كل إصابة لكشف تصادمات المفاتيح (للتشخيص فقط، أبطأ وأكبر).
+        """
+        return (tuple(state.get_vector()), state.get_current_player(),
+                roll, maximizing)
+
+    def _probe_tt(self, key, depth, alpha, beta, signature=None):
+        """
+        يعيد (value, move): value هي القيمة المخزنة إذا كانت تكفي للقطع ضمن
+        النافذة [alpha, beta]: EXACT دائماً، LOWER إذا >= beta، UPPER إذا
+        <= alpha (وبعمق كافٍ)، وإلا None. move أفضل حركة مخزنة (أو None)
+        لاستخدامها في الترتيب حتى عندما لا تكفي القيمة.
+        """
+        entry = self.transposition_table.probe(key, signature)
+        if entry is not None:
+            entry_depth, bound, value, move = entry
+            if entry_depth >= depth and (
+                    bound == EXACT or
+                    (bound == LOWER and value >= beta) or
+                    (bound == UPPER and value <= alpha)):
+                self.tt_hits += 1
+                return value, move
+            self.tt_misses += 1
+            return None, move
+        self.tt_misses += 1
+        return None, None
+
+    def _store_tt(self, key, depth, bound, value, move=None, signature=None):
+        self.transposition_table.store(key, depth, bound, value, move, signature)
+
+    def _evaluate_move_priority(self, move, state):
+        return self._move_priority(move[0], move[1], state.get_board(),
+                                   state.get_opponent_symbol())
+
+    @staticmethod
+    def _move_priority(from_pos, to_pos, board, opponent):
+        if to_pos < BOARD_SIZE and board[to_pos] == opponent:
+            return _TARGET_PRIORITY[to_pos] + CAPTURE_BONUS
+        return _TARGET_PRIORITY[to_pos]
+
+    def _pick_moves(self, moves, state, tt_move, roll, ply):
+        """
+        منتقي الحركات (_MovePicker) الخاص بهذا الـ ply، مهيأ لهذه العقدة
+        (staged_moves=True؛ وإلا _order_moves).
+        """
+        pickers = self._pickers
+        while len(pickers) <= ply:
+            pickers.append(_MovePicker(self))
+        return pickers[ply].start(moves, state, tt_move, roll, ply)
+
+    def _order_moves(self, moves, state, tt_move=None, roll=None, ply=None):
+        """
+        كل الحركات مرتبة مسبقاً في قائمة (staged_moves=False): الأولوية الثابتة
+        + history + killers، وحركة الجدول أولاً مع pv_ordering=True (الذي يرتب
+        أيضاً حركات الجذر حسب قيمها بعد كل عمق).
+        """
+        board = state.get_board()
+        opponent = state.get_opponent_symbol()
+        priority = self._move_priority
+        if self.options.history:
+            player = state.get_current_player()
+            history = self.history_table
+            killers = self.killers.get((ply, roll), ())
+            scored = []
+            for m in moves:
+                score = priority(m[0], m[1], board, opponent) + \
+                    history.get((m[0], m[1], player), 0)
+                if m in killers:
+                    score += KILLER_BONUS[killers.index(m)]
+                scored.append((score, m))
+        else:
+            scored = [(priority(m[0], m[1], board, opponent), m) for m in moves]
         scored.sort(key=lambda x: x[0], reverse=True)
-        return [m for _, m in scored]
+        ordered = [m for _, m in scored]
+        if self.options.pv_ordering and tt_move is not None and tt_move in ordered:
+            ordered.remove(tt_move)
+            ordered.insert(0, tt_move)
+        return ordered
+
+    def _start_ordering(self):
+        """بداية بحث جديد: killers من الصفر، وتقادم جدول history"""
+        self.killers = {}
+        history = self.history_table
+        for key in list(history):
+            value = history[key] * HISTORY_DECAY
+            if value < 1:
+                del history[key]
+            else:
+                history[key] = value
+
+    def _record_cutoff(self, move, index, board, roll, ply, depth):
+        """
+        قطع في عقدة قرار: تحديث الإحصائيات، ومع history=True حركتا killer لكل
+        (عمق من الجذر، رمية) وجدول history مفهرس بـ (from, to, player). جدول
+        history يبقى بين البحوث خلال اللعبة ويتقادم في _start_ordering.
+        """
+        self.decision_cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        if not self.options.history:
+            return
+
+        killers = self.killers.setdefault((ply, roll), [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[len(KILLER_BONUS):]
+
+        key = (move[0], move[1], board.get_current_player())
+        value = self.history_table.get(key, 0) + HISTORY_BONUS * depth * depth
+        self.history_table[key] = value
+        if value > HISTORY_LIMIT:
+            for other in self.history_table:
+                self.history_table[other] /= 2
 
     def get_stats(self):
+        tt_stats = self.transposition_table.get_stats()
         return {
             'nodes': self.nodes_evaluated,
-            'pruning': self.pruning_count,
-            'tt_hits': self.tt_hits
+            'pruning': self.star1_cutoffs + self.star2_cutoffs,
+            'star1_cutoffs': self.star1_cutoffs,
+            'star2_cutoffs': self.star2_cutoffs,
+            'star2_probes': self.star2_probes,
+            'decision_cutoffs': self.decision_cutoffs,
+            'sparse_chance_nodes': self.sparse_chance_nodes,
+            'probcut_prunes': self.probcut_prunes,
+            'first_move_cutoff_rate': (self.first_move_cutoffs / self.decision_cutoffs
+                                       if self.decision_cutoffs else 0.0),
+            'completed_depth': self.completed_depth,
+            'root_value': self.root_value,
+            'book_hits': self.book_hits,
+            'tablebase_hits': self.tablebase_hits,
+            'race_evaluations': self.evaluator.race_evaluations,
+            'nodes_per_depth': list(self.nodes_per_depth),
+            'aspiration_researches': self.aspiration_researches,
+            'aspiration_window_sizes': list(self.aspiration_window_sizes),
+            'search_aborted': self.search_aborted,
+            'search_time_ms': self._search_time_ms,
+            'tt_hits': self.tt_hits,
+            'tt_reused_hits': tt_stats['reused_hits'],
+            'tt_collisions': tt_stats['collisions'],
+            'tt_fill_rate': tt_stats['fill_rate'],
+            'tt_replacements': tt_stats['replacements']
         }
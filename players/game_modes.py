@@ -1,5 +1,15 @@
 from players.ai import AI as SlowAI
 from players.ai_pruning import AI as FastAI
+from players.mcts import AI as MCTSAI
+from players.opening_book import OPENING_BOOK_FILE
+from players.tablebase import TABLEBASE_FILE
+from players.race_database import RACE_DATABASE_FILE
+
+# Hard upper bound on FastAI think time per move in interactive games
+INTERACTIVE_TIME_BUDGET_MS = 3000
+
+# MCTS think time per move (it plays stronger the longer it searches)
+MCTS_TIME_BUDGET_MS = 2000
 
 GAME_MODES = {
     "HUMAN": {
@@ -8,16 +18,45 @@ GAME_MODES = {
 
     "EASY": {
         "ai_class": FastAI,
-        "depth": 2
+        "depth": 2,
+        "ponder": True,
+        "options": {
+            "time_budget_ms": INTERACTIVE_TIME_BUDGET_MS,
+            "aspiration_window": None,
+            "opening_book": OPENING_BOOK_FILE,
+            "tablebase": TABLEBASE_FILE,
+            "race_database": RACE_DATABASE_FILE
+        }
     },
 
     "MEDIUM": {
         "ai_class": FastAI,
-        "depth": 3
+        "depth": 3,
+        "ponder": True,
+        "options": {
+            "time_budget_ms": INTERACTIVE_TIME_BUDGET_MS,
+            "aspiration_window": 4000,
+            "aspiration_widen": 4.0,
+            "opening_book": OPENING_BOOK_FILE,
+            "tablebase": TABLEBASE_FILE,
+            "race_database": RACE_DATABASE_FILE
+        }
     },
 
     "HARD": {
         "ai_class": SlowAI,
-        "depth": 4
+        "depth": 4,
+        "options": {
+            "race_database": RACE_DATABASE_FILE
+        }
+    },
+
+    "MCTS": {
+        "ai_class": MCTSAI,
+        "depth": None,
+        "options": {
+            "time_budget_ms": MCTS_TIME_BUDGET_MS,
+            "batch_size": 64
+        }
     },
 }
@@ -0,0 +1,343 @@
+"""
+Monte Carlo Tree Search player (expectimax-MCTS).
+
+The tree alternates decision nodes (a position and a known roll; one child
+per move) and chance nodes (the position after a move, before the next
+throw; one child per roll):
+
+- Decision nodes select with UCT over the moves expanded so far.
+  Progressive widening expands moves one at a time, in the static move
+  order of players.ai_pruning, while the number of children is below
+  widening * visits ** widening_exponent.
+- Chance nodes do not select: the roll whose share of the visits lags its
+  probability the most is followed next (stratified sampling), so the
+  mean of a chance node tracks the expectation over the sticks.
+
+Playouts are run in batches: batch_size leaves are selected with a
+virtual loss (visits counted before the result is known, so the same
+path is not taken twice), then all rollouts are played together with
+engines.rules_batch (random legal moves) for at most rollout_plies plies.
+A rollout that does not finish is scored by the pip counts (squares left
+to bear off) of both sides. Every chance node keeps the wins of the
+player who moved into it.
+
+The budget is a time (time_budget_ms) or a number of playouts
+(iterations). With workers > 0 the root is searched by independent trees
+on a persistent process pool and their root statistics are summed (root
+parallelism). The move with the most visits is played; get_stats()
+reports playouts and playouts/sec.
+"""
+
+import atexit
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engines.board import BOARD_SIZE, OFF_BOARD
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from engines.rules_batch import (
+    NO_MOVE, batch_apply_moves, batch_random_moves, batch_throw_sticks,
+    batch_valid_move_masks, batch_winners
+)
+from players.ai_pruning import AI as PruningAI
+
+DEFAULT_TIME_BUDGET_MS = 1000
+
+# Pip difference (squares left to bear off) worth about e:1 odds when a
+# rollout is cut off before the end
+PIP_SCALE = 20.0
+
+_ROLLS = get_all_possible_rolls()
+
+
+class _ChanceNode:
+    __slots__ = ('state', 'mover', 'visits', 'wins', 'children', 'winner')
+
+    def __init__(self, state):
+        self.state = state
+        # The player who moved (or passed) into this position
+        self.mover = -state.get_current_player()
+        self.visits = 0
+        self.wins = 0.0
+        self.children = {}
+        self.winner = state.get_winner() if state.is_terminal() else 0
+
+
+class _DecisionNode:
+    __slots__ = ('state', 'roll', 'visits', 'moves', 'children')
+
+    def __init__(self, state, roll):
+        self.state = state
+        self.roll = roll
+        self.visits = 0
+        self.moves = None       # ordered on the first visit
+        self.children = []      # _ChanceNode per expanded move, same order
+
+
+def _ordered_moves(state, roll):
+    moves = state.get_valid_moves(roll)
+    if not moves:
+        return [None]
+    board = state.get_board()
+    opponent = state.get_opponent_symbol()
+    return sorted(moves, key=lambda m: PruningAI._move_priority(
+        m[0], m[1], board, opponent), reverse=True)
+
+
+def _pip_win_probability(boards):
+    """P(X wins) of unfinished boards from the squares left to bear off."""
+    distance = OFF_BOARD - np.arange(BOARD_SIZE)
+    x_pips = ((boards == 1) * distance).sum(axis=1)
+    o_pips = ((boards == -1) * distance).sum(axis=1)
+    return 1.0 / (1.0 + np.exp((x_pips - o_pips) / PIP_SCALE))
+
+
+class _Tree:
+    def __init__(self, state, roll, exploration, widening, widening_exponent,
+                 rng):
+        self.root = _DecisionNode(state, roll)
+        self.exploration = exploration
+        self.widening = widening
+        self.widening_exponent = widening_exponent
+        self.rng = rng
+        self.nodes = 1
+        self.max_depth = 0
+
+    def _select(self):
+        """Path of chance nodes from the root to a new (or terminal) leaf."""
+        path = []
+        decision = self.root
+        while True:
+            decision.visits += 1
+            if decision.moves is None:
+                decision.moves = _ordered_moves(decision.state, decision.roll)
+            children = decision.children
+            allowed = min(len(decision.moves), max(
+                1, math.ceil(self.widening *
+                             decision.visits ** self.widening_exponent)))
+            if len(children) < allowed:
+                move = decision.moves[len(children)]
+                state = decision.state
+                child = _ChanceNode(state.pass_turn() if move is None
+                                    else state.apply_move(move[0], move[1]))
+                children.append(child)
+                self.nodes += 1
+                child.visits += 1
+                path.append(child)
+                return path
+            child = self._uct_child(decision)
+            child.visits += 1
+            path.append(child)
+            if child.winner:
+                return path
+            decision = self._roll_child(child)
+
+    def _uct_child(self, decision):
+        log_n = math.log(decision.visits)
+        c = self.exploration
+        best = None
+        best_score = -math.inf
+        for child in decision.children:
+            score = child.wins / child.visits + \
+                c * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best = child
+                best_score = score
+        return best
+
+    def _roll_child(self, chance):
+        total = chance.visits
+        best_roll = None
+        best_gap = -math.inf
+        for roll, prob in _ROLLS:
+            child = chance.children.get(roll)
+            gap = prob * total - (child.visits if child is not None else 0)
+            if gap > best_gap:
+                best_roll = roll
+                best_gap = gap
+        child = chance.children.get(best_roll)
+        if child is None:
+            child = chance.children[best_roll] = _DecisionNode(chance.state,
+                                                                best_roll)
+            self.nodes += 1
+        return child
+
+    def run_batch(self, batch_size, rollout_plies):
+        """Select batch_size leaves, roll them out together, back up."""
+        paths = [self._select() for _ in range(batch_size)]
+        self.max_depth = max(self.max_depth, max(len(p) for p in paths))
+        leaves = [path[-1] for path in paths]
+        x_wins = np.empty(len(leaves))
+        pending = [i for i, leaf in enumerate(leaves) if not leaf.winner]
+        for i, leaf in enumerate(leaves):
+            if leaf.winner:
+                x_wins[i] = 1.0 if leaf.winner == 1 else 0.0
+        if pending:
+            x_wins[pending] = self._rollouts(
+                [leaves[i].state for i in pending], rollout_plies)
+
+        for path, x_win in zip(paths, x_wins):
+            for node in path:
+                node.wins += x_win if node.mover == 1 else 1.0 - x_win
+        return len(paths)
+
+    def _rollouts(self, states, rollout_plies):
+        boards = np.array([s.get_vector() for s in states], dtype=np.int8)
+        players = np.array([s.get_current_player() for s in states],
+                           dtype=np.int8)
+        rng = self.rng
+        winners = np.zeros(len(states), dtype=np.int8)
+        ply = 0
+        while rollout_plies is None or ply < rollout_plies:
+            active = winners == 0
+            if not active.any():
+                break
+            rolls = batch_throw_sticks(len(boards), rng)
+            choices = batch_random_moves(
+                batch_valid_move_masks(boards, players, rolls), rng)
+            choices[~active] = NO_MOVE
+            batch_apply_moves(boards, players, rolls, choices, out=boards)
+            winners = np.where(active, batch_winners(boards), winners)
+            players = -players
+            ply += 1
+        return np.where(winners == 1, 1.0, np.where(
+            winners == -1, 0.0, _pip_win_probability(boards)))
+
+    def root_statistics(self):
+        """[(move, visits, wins of the root player)] per expanded move."""
+        moves = self.root.moves or []
+        return [(move, child.visits, child.wins)
+                for move, child in zip(moves, self.root.children)]
+
+
+def _search(state, roll, options, time_budget_ms, iterations, seed):
+    """One tree; returns (root statistics, playouts, nodes, max depth)."""
+    rng = np.random.default_rng(seed)
+    tree = _Tree(state, roll, options['exploration'], options['widening'],
+                 options['widening_exponent'], rng)
+    deadline = None if time_budget_ms is None else \
+        time.perf_counter() + time_budget_ms / 1000
+    playouts = 0
+    while True:
+        batch = options['batch_size']
+        if iterations is not None:
+            batch = min(batch, iterations - playouts)
+            if batch <= 0:
+                break
+        playouts += tree.run_batch(batch, options['rollout_plies'])
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    return tree.root_statistics(), playouts, tree.nodes, tree.max_depth
+
+
+def _search_task(vector, player, roll, options, time_budget_ms, iterations, seed):
+    return _search(GameState(vector, player), roll, options, time_budget_ms,
+                   iterations, seed)
+
+
+class AI:
+    def __init__(self, player_symbol, depth=None, time_budget_ms=None,
+                 iterations=None, batch_size=64, exploration=1.0,
+                 widening=2.0, widening_exponent=0.5, rollout_plies=100,
+                 workers=0, seed=None):
+        """
+        Args:
+            player_symbol (str): 'X' or 'O'
+            depth: Ignored (MCTS is bounded by time or playouts); accepted so
+                GAME_MODES can create every AI type the same way
+            time_budget_ms (float): Search time per move
+            iterations (int): Playouts per move (per worker with workers > 0).
+                Without either budget DEFAULT_TIME_BUDGET_MS is used.
+            batch_size (int): Leaves selected and rolled out together
+            exploration (float): UCT exploration constant
+            widening, widening_exponent (float): Progressive widening, at
+                most widening * visits ** widening_exponent moves per node
+            rollout_plies (int | None): Rollout cut-off (None: play to the end)
+            workers (int): Root-parallel processes (0 = search in-process)
+            seed (int): Random seed of the rollouts
+        """
+        self.player = player_symbol
+        self.depth = depth
+        if time_budget_ms is None and iterations is None:
+            time_budget_ms = DEFAULT_TIME_BUDGET_MS
+        self.time_budget_ms = time_budget_ms
+        self.iterations = iterations
+        self.workers = workers
+        self.options = {
+            'batch_size': batch_size, 'exploration': exploration,
+            'widening': widening, 'widening_exponent': widening_exponent,
+            'rollout_plies': rollout_plies,
+        }
+        self._seeds = np.random.SeedSequence(seed)
+        self._pool = None
+
+        self.playouts = 0
+        self.tree_nodes = 0
+        self.max_depth = 0
+        self.root_visits = {}
+        self._search_time_ms = 0.0
+
+    def choose_best_move(self, state, roll):
+        self.playouts = 0
+        self.tree_nodes = 0
+        self.max_depth = 0
+        self.root_visits = {}
+        self._search_time_ms = 0.0
+
+        valid_moves = state.get_valid_moves(roll)
+        if not valid_moves:
+            return None
+        if len(valid_moves) == 1:
+            return valid_moves[0]
+
+        start = time.perf_counter()
+        if self.workers:
+            results = self._search_parallel(state, roll)
+        else:
+            results = [_search(state, roll, self.options, self.time_budget_ms,
+                               self.iterations, self._seeds.spawn(1)[0])]
+        self._search_time_ms = (time.perf_counter() - start) * 1000
+
+        visits = {}
+        wins = {}
+        for statistics, _, _, _ in results:
+            for move, move_visits, move_wins in statistics:
+                visits[move] = visits.get(move, 0) + move_visits
+                wins[move] = wins.get(move, 0.0) + move_wins
+        self.playouts = sum(r[1] for r in results)
+        self.tree_nodes = sum(r[2] for r in results)
+        self.max_depth = max(r[3] for r in results)
+        self.root_visits = visits
+        # Most visited move, ties broken by the mean result
+        return max(visits, key=lambda m: (visits[m], wins[m] / visits[m]))
+
+    def _search_parallel(self, state, roll):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            atexit.register(self.close)
+        vector = tuple(state.get_vector())
+        futures = [self._pool.submit(_search_task, vector,
+                                     state.get_current_player(), roll,
+                                     self.options, self.time_budget_ms,
+                                     self.iterations, seed)
+                   for seed in self._seeds.spawn(self.workers)]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Shut down the worker pool (if any)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def get_stats(self):
+        seconds = self._search_time_ms / 1000
+        return {
+            'playouts': self.playouts,
+            'playouts_per_sec': self.playouts / seconds if seconds else 0.0,
+            'tree_nodes': self.tree_nodes,
+            'max_depth': self.max_depth,
+            'search_time_ms': self._search_time_ms,
+            'root_visits': dict(self.root_visits),
+        }
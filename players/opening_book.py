@@ -0,0 +1,201 @@
+"""
+Opening book: precomputed answers for the first plies of the game.
+
+Every game starts from create_initial_board(), so the positions of the
+first plies repeat from game to game. build_book() searches every position
+reachable in the first N plies (all moves, both players) for every roll
+with multiple legal moves, at a deep search depth, and writes the answers
+to a compact file of fixed-size records sorted by (position key, roll):
+
+    header   b'SENETBK1', then uint32 count, depth, plies, weights_crc
+    record   uint64 Zobrist key, uint8 roll, uint8 from, uint8 to, pad,
+             float32 value (for the player to move)       16 bytes
+
+OpeningBook memory-maps the file and answers probe(key, roll) with a
+binary search over the records, a few microseconds per call. The header
+records a checksum of the evaluation weights; load_book() ignores a book
+built with other weights.
+
+Build (optionally on several processes) from the repository root:
+    python -m players.opening_book --plies 2 --depth 5 --workers 8
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from engines.board import create_initial_board, print_message
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from engines.load_weights import load_weights
+
+OPENING_BOOK_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "opening_book.bin")
+
+MAGIC = b'SENETBK1'
+_HEADER = struct.Struct('<8sIIII')
+_RECORD = struct.Struct('<QBBBxf')
+_RECORD_KEY = struct.Struct('<QB')
+
+_books = {}
+
+
+def weights_checksum(config):
+    """crc32 of the evaluation weights (0 for the built-in defaults)."""
+    if config is None:
+        return 0
+    return zlib.crc32(json.dumps(config, sort_keys=True).encode())
+
+
+class OpeningBook:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.depth, self.plies, self.weights_crc = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not an opening book")
+        self.path = path
+
+    def probe(self, key, roll):
+        """
+        Returns:
+            tuple | None: ((from, to), value) for the position key and roll
+        """
+        mm = self._mm
+        target = (key, roll)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _RECORD_KEY.unpack_from(mm, _HEADER.size + mid * _RECORD.size) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.count:
+            return None
+        record_key, record_roll, from_pos, to_pos, value = \
+            _RECORD.unpack_from(mm, _HEADER.size + lo * _RECORD.size)
+        if record_key != key or record_roll != roll:
+            return None
+        return (from_pos, to_pos), value
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._mm.close()
+
+
+def load_book(path=OPENING_BOOK_FILE, config=None):
+    """
+    Open (once per process) the book at path.
+
+    Returns:
+        OpeningBook | None: None if the file is missing or was built with
+        weights other than config
+    """
+    if path in _books:
+        book = _books[path]
+    elif not os.path.exists(path):
+        return None
+    else:
+        book = _books[path] = OpeningBook(path)
+    if book.weights_crc != weights_checksum(config):
+        print_message(f"Opening book {path} was built with other weights; ignored.",
+                      "warning")
+        return None
+    return book
+
+
+def reachable_positions(plies):
+    """Every position reachable from the initial board in fewer than plies plies."""
+    state = GameState.from_board(create_initial_board(), 'X')
+    level = {state.get_zobrist_key(): state}
+    positions = dict(level)
+    for _ in range(plies - 1):
+        following = {}
+        for state in level.values():
+            if state.is_terminal():
+                continue
+            for roll, _ in get_all_possible_rolls():
+                moves = state.get_valid_moves(roll)
+                children = [state.apply_move(m[0], m[1]) for m in moves] or \
+                    [state.pass_turn()]
+                for child in children:
+                    following.setdefault(child.get_zobrist_key(), child)
+        level = following
+        positions.update(level)
+    return list(positions.values())
+
+
+# AI instances of a builder process, one per player
+_builder_ais = {}
+
+
+def _search_entry(vector, player, roll, depth):
+    # Imported here: ai_pruning imports this module
+    from players.ai_pruning import AI
+
+    state = GameState(vector, player)
+    symbol = state.get_current_player_symbol()
+    ai = _builder_ais.get(symbol)
+    if ai is None:
+        ai = _builder_ais[symbol] = AI(symbol, depth)
+    move = ai.choose_best_move(state, roll)
+    return state.get_zobrist_key(), roll, move, ai.get_stats()['root_value']
+
+
+def build_book(path, plies, depth, workers=1):
+    """
+    Search every (position, roll) of the first plies plies and write the book.
+
+    Returns:
+        int: Number of records written
+    """
+    tasks = []
+    for state in reachable_positions(plies):
+        if state.is_terminal():
+            continue
+        for roll, _ in get_all_possible_rolls():
+            if len(state.get_valid_moves(roll)) > 1:
+                tasks.append((tuple(state.get_vector()),
+                              state.get_current_player(), roll))
+
+    columns = list(zip(*tasks)) + [[depth] * len(tasks)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            entries = list(executor.map(_search_entry, *columns, chunksize=4))
+    else:
+        entries = list(map(_search_entry, *columns))
+
+    entries.sort(key=lambda e: (e[0], e[1]))
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(entries), depth, plies,
+                             weights_checksum(load_weights())))
+        for key, roll, move, value in entries:
+            f.write(_RECORD.pack(key, roll, move[0], move[1], value))
+    return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--plies', type=int, default=2)
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', default=OPENING_BOOK_FILE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = build_book(args.output, args.plies, args.depth, args.workers)
+    print(f"{count} positions at depth {args.depth} written to {args.output} "
+          f"({os.path.getsize(args.output)} bytes) in "
+          f"{time.perf_counter() - start:.0f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+Root-parallel search for players.ai_pruning.AI.
+
+A RootSearchPool owns a persistent ProcessPoolExecutor (created once and
+reused for every move of a game) and one small shared-memory block of
+doubles: the best root value found so far in the current iteration
+(SHARED_ALPHA), a stop flag (SHARED_STOP) that the AI raises when
+another thread sets its stop_requested, and the nodes left in the AI's
+node budget (SHARED_NODES). Each task searches one root move
+(or one (root move, first roll) pair) with a worker-local AI, which polls
+the block with the time budget (every 32 nodes) and gives up like an
+expired budget once the stop flag is set. With a node budget, workers
+take nodes from SHARED_NODES under the lock, NODE_CHUNK at a time, and
+give back what they did not use, so all workers together never search
+more nodes than the budget. A move task starts with the
+shared alpha; when another worker has raised it, the task restarts the
+move's search with the new alpha, and its transposition table keeps the
+work already done. After an exact result
+the task raises the shared alpha under a lock, so every running task
+prunes against the best bound found by any worker.
+
+Workers keep their AI (and so their transposition table and history
+table) between tasks and between moves; a new search id (new_search(),
+skipped for pondered searches) starts a new TT generation in each worker.
+"""
+
+import atexit
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Lock
+from multiprocessing.shared_memory import SharedMemory
+
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from engines.search_board import SearchBoard
+from evaluations.evaluation_star1 import MAX_POSSIBLE_SCORE, MIN_POSSIBLE_SCORE
+
+SPLIT_MOVE = 'move'
+SPLIT_ROLL = 'roll'
+
+# Indices of the doubles in the shared block
+SHARED_ALPHA = 0
+SHARED_STOP = 1
+SHARED_NODES = 2
+_SHARED_SIZE = 3
+
+# Nodes a worker takes from the shared node budget at a time
+NODE_CHUNK = 64
+
+# Process-global state of a pool worker (set by _init_worker)
+_worker = {}
+
+
+def _init_worker(options, shm_name, lock):
+    shm = SharedMemory(name=shm_name)
+    _worker['shm'] = shm
+    _worker['shared'] = shm.buf.cast('d')
+    _worker['lock'] = lock
+    _worker['options'] = options
+    _worker['ais'] = {}
+
+
+def _worker_ai(symbol, depth, search_id):
+    # ai_pruning imports this module, so the AI class is imported lazily
+    from players.ai_pruning import AI
+
+    ai, last_search = _worker['ais'].get(symbol, (None, None))
+    if ai is None:
+        ai = AI(symbol, depth, _worker['options'])
+    if last_search != search_id:
+        ai.start_search()
+    _worker['ais'][symbol] = (ai, search_id)
+    return ai
+
+
+def _publish_alpha(value):
+    shared = _worker['shared']
+    with _worker['lock']:
+        if value > shared[SHARED_ALPHA]:
+            shared[SHARED_ALPHA] = value
+
+
+class _NodeBudget:
+    """The worker's side of the shared node budget."""
+
+    def claim(self, count):
+        """Take up to count nodes; returns how many were granted."""
+        shared = _worker['shared']
+        with _worker['lock']:
+            granted = min(count, shared[SHARED_NODES])
+            shared[SHARED_NODES] -= granted
+        return int(granted)
+
+    def release(self, count):
+        """Give back nodes that were claimed but not searched."""
+        shared = _worker['shared']
+        with _worker['lock']:
+            shared[SHARED_NODES] += count
+
+
+def _node_budget():
+    # Unlimited budget: no node accounting at all
+    if _worker['shared'][SHARED_NODES] == math.inf:
+        return None
+    return _NodeBudget()
+
+
+def _remaining_ms(deadline):
+    # deadline is a time.time() value: comparable across processes
+    return None if deadline is None else (deadline - time.time()) * 1000
+
+
+def _search_move_task(vector, player, symbol, move, depth, search_id, deadline):
+    """
+    Returns:
+        tuple: (move, value or None if the budget ran out, alpha used, nodes,
+        restarts after the shared alpha was raised)
+    """
+    from players.ai_pruning import SharedAlphaRaised
+
+    shared = _worker['shared']
+    ai = None
+    nodes = 0
+    restarts = 0
+    while True:
+        alpha = shared[SHARED_ALPHA]
+        time_budget_ms = _remaining_ms(deadline)
+        if shared[SHARED_STOP] or (time_budget_ms is not None and time_budget_ms <= 0):
+            return move, None, alpha, nodes, restarts
+        if ai is None:
+            ai = _worker_ai(symbol, depth, search_id)
+            nodes = -ai.nodes_evaluated
+        board = SearchBoard.from_state(GameState(vector, player))
+        try:
+            value = ai.search_root_move(board, move, depth, alpha,
+                                        MAX_POSSIBLE_SCORE, time_budget_ms,
+                                        shared=shared, node_budget=_node_budget())
+            break
+        except SharedAlphaRaised:
+            restarts += 1
+    if value is not None and value > alpha:
+        _publish_alpha(value)
+    return move, value, alpha, nodes + ai.nodes_evaluated, restarts
+
+
+def _search_roll_task(vector, player, symbol, move, roll, depth, search_id,
+                      deadline):
+    """
+    Returns:
+        tuple: (move, roll, exact value or None, nodes)
+    """
+    shared = _worker['shared']
+    time_budget_ms = _remaining_ms(deadline)
+    if shared[SHARED_STOP] or (time_budget_ms is not None and time_budget_ms <= 0):
+        return move, roll, None, 0
+    ai = _worker_ai(symbol, depth, search_id)
+    board = SearchBoard.from_state(GameState(vector, player))
+    nodes = ai.nodes_evaluated
+    value = ai.search_root_roll(board, move, roll, depth, time_budget_ms,
+                                shared=shared, node_budget=_node_budget())
+    return move, roll, value, ai.nodes_evaluated - nodes
+
+
+class RootSearchPool:
+    def __init__(self, workers, options=None):
+        """
+        Args:
+            workers (int): Number of worker processes
+            options (SearchOptions): Options of the worker AIs
+        """
+        self.workers = workers
+        self._lock = Lock()
+        self._shm = SharedMemory(create=True, size=8 * _SHARED_SIZE)
+        self._shared = self._shm.buf.cast('d')
+        self._shared[SHARED_ALPHA] = MIN_POSSIBLE_SCORE
+        self._shared[SHARED_STOP] = 0.0
+        self._shared[SHARED_NODES] = math.inf
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(options, self._shm.name, self._lock))
+        self._search_id = 0
+        self.alpha_restarts = 0
+        atexit.register(self.close)
+
+    def new_search(self):
+        """Called once per new search: new TT generation in workers."""
+        self._search_id += 1
+
+    def set_stop(self, stop):
+        """Make running and queued tasks give up (stop=True) or run again."""
+        self._shared[SHARED_STOP] = 1.0 if stop else 0.0
+
+    def search_moves(self, state, moves, depth, deadline=None, split=SPLIT_MOVE,
+                     node_budget=None):
+        """
+        Search every root move to depth in parallel.
+
+        With split='move' the first move is searched alone, then every other
+        root move is one task behind the shared alpha. With split='roll'
+        every task searches one (root move, first roll) pair with the full
+        window and the move values are combined by roll probability (more,
+        smaller tasks; no alpha sharing).
+
+        Args:
+            deadline (float): time.time() at which tasks stop, or None
+            node_budget (int): Nodes all tasks together may search, or None
+
+        Returns:
+            tuple: (list of (move, value, exact), nodes), or (None, nodes)
+            if any task ran out of time or nodes
+        """
+        vector = tuple(state.get_vector())
+        player = state.get_current_player()
+        symbol = state.get_current_player_symbol()
+        self._shared[SHARED_ALPHA] = MIN_POSSIBLE_SCORE
+        self._shared[SHARED_NODES] = math.inf if node_budget is None else node_budget
+
+        if split == SPLIT_ROLL and depth > 1:
+            return self._search_rolls(vector, player, symbol, moves, depth,
+                                      deadline)
+
+        # The first (PV) move is searched alone so that every other task
+        # starts with its value as alpha instead of the full window
+        submit = lambda move: self._executor.submit(
+            _search_move_task, vector, player, symbol, move, depth,
+            self._search_id, deadline)
+        first = submit(moves[0])
+        first.result()
+        futures = [first] + [submit(move) for move in moves[1:]]
+        results = []
+        nodes = 0
+        aborted = False
+        for future in futures:
+            move, value, alpha, task_nodes, restarts = future.result()
+            nodes += task_nodes
+            self.alpha_restarts += restarts
+            if value is None:
+                aborted = True
+            else:
+                # value <= alpha is only an upper bound (fail-low)
+                results.append((move, value, value > alpha))
+        return (None if aborted else results), nodes
+
+    def _search_rolls(self, vector, player, symbol, moves, depth, deadline):
+        rolls = get_all_possible_rolls()
+        futures = [self._executor.submit(_search_roll_task, vector, player, symbol,
+                                         move, roll, depth, self._search_id,
+                                         deadline)
+                   for move in moves for roll, _ in rolls]
+        probabilities = dict(rolls)
+        values = {move: 0.0 for move in moves}
+        nodes = 0
+        aborted = False
+        for future in futures:
+            move, roll, value, task_nodes = future.result()
+            nodes += task_nodes
+            if value is None:
+                aborted = True
+            else:
+                values[move] += probabilities[roll] * value
+        if aborted:
+            return None, nodes
+        return [(move, values[move], True) for move in moves], nodes
+
+    def close(self):
+        """Shut the worker processes down and free the shared memory."""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self._shared.release()
+        self._shm.close()
+        self._shm.unlink()
+        atexit.unregister(self.close)
@@ -0,0 +1,151 @@
+"""
+Pondering: search the AI's next positions while the human is thinking.
+
+A Ponderer runs in a background thread with the AI's own search (and so
+fills its transposition table, which persists across turns). From the
+position where the human is to move it predicts the human's likely
+replies (every roll, ranked by the AI's static move priority; only the
+known roll once the human has thrown) and, for each resulting position,
+computes the AI's answer to each of its five rolls, most probable first.
+
+stop() cancels the search in progress at the next budget check and joins
+the thread; lookup() stops pondering the same way and returns a ready
+answer for the actual position and roll, if one was completed. get_stats()
+reports the hit rate and the AI time saved (the time the pondered search
+took).
+
+Only one thread touches the AI at a time. start() and lookup() stop the
+thread themselves, so the AI can search on the main thread right after
+lookup(); a caller that searches without calling lookup() first must call
+stop(). Pondered searches continue the AI's current search
+(choose_best_move(new_search=False)): they do not start a new
+transposition-table generation or decay the history table, so pondering
+does not age the main search's entries. The AI must be
+players.ai_pruning.AI.
+"""
+
+import threading
+
+from engines.game_state_pyrsistent import get_all_possible_rolls
+
+# Human replies pondered per roll when the roll is not known yet
+DEFAULT_REPLIES = 3
+
+_ROLLS_BY_PROBABILITY = sorted(get_all_possible_rolls(),
+                               key=lambda x: x[1], reverse=True)
+
+
+class Ponderer:
+    def __init__(self, ai, replies=DEFAULT_REPLIES):
+        """
+        Args:
+            ai (players.ai_pruning.AI): The AI that will move next
+            replies (int): Human moves pondered per roll before the human
+                has thrown (all moves once the roll is known)
+        """
+        self.ai = ai
+        self.replies = replies
+        self._thread = None
+        self._root_key = None
+        self._answers = {}
+
+        self.searches = 0
+        self.lookups = 0
+        self.hits = 0
+        self.saved_ms = 0.0
+
+    def start(self, state, roll=None):
+        """
+        Start (or restart) pondering from state, the human to move.
+        Answers already computed for the same position are kept.
+
+        Args:
+            roll (int): The human's roll if it is already known
+        """
+        self.stop()
+        root_key = state.get_zobrist_key()
+        if root_key != self._root_key:
+            self._root_key = root_key
+            self._answers = {}
+        tasks = self._predict(state, roll)
+        self._thread = threading.Thread(target=self._run, args=(tasks,),
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Cancel the search in progress and wait for the thread to end."""
+        if self._thread is None:
+            return
+        self.ai.stop_requested = True
+        self._thread.join()
+        self._thread = None
+        self.ai.stop_requested = False
+
+    def lookup(self, state, roll):
+        """
+        Stop pondering and look up the answer for the actual position.
+
+        Returns:
+            tuple | None: The pondered move for state (AI to move) and roll
+        """
+        self.stop()
+        if len(state.get_valid_moves(roll)) < 2:
+            return None
+        self.lookups += 1
+        answer = self._answers.get((state.get_zobrist_key(), roll))
+        if answer is None:
+            return None
+        move, elapsed_ms = answer
+        self.hits += 1
+        self.saved_ms += elapsed_ms
+        return move
+
+    def _predict(self, state, roll):
+        """(AI position, AI roll) pairs, most likely first."""
+        rolls = _ROLLS_BY_PROBABILITY if roll is None else ((roll, 1.0),)
+        weights = {}
+        positions = {}
+        for human_roll, prob in rolls:
+            moves = state.get_valid_moves(human_roll)
+            if not moves:
+                replies = [state.pass_turn()]
+            else:
+                moves.sort(key=lambda m: self.ai._evaluate_move_priority(m, state),
+                           reverse=True)
+                if roll is None:
+                    moves = moves[:self.replies]
+                replies = [state.apply_move(m[0], m[1]) for m in moves]
+            for rank, reply in enumerate(replies):
+                key = reply.get_zobrist_key()
+                positions[key] = reply
+                weights[key] = weights.get(key, 0.0) + prob / (rank + 1)
+
+        tasks = [(weights[key] * ai_prob, positions[key], ai_roll)
+                 for key in positions if not positions[key].is_terminal()
+                 for ai_roll, ai_prob in _ROLLS_BY_PROBABILITY]
+        tasks.sort(key=lambda x: x[0], reverse=True)
+        return [(position, ai_roll) for _, position, ai_roll in tasks]
+
+    def _run(self, tasks):
+        ai = self.ai
+        for position, roll in tasks:
+            if ai.stop_requested:
+                return
+            key = (position.get_zobrist_key(), roll)
+            if key in self._answers or len(position.get_valid_moves(roll)) < 2:
+                continue
+            move = ai.choose_best_move(position, roll, new_search=False)
+            if ai.stop_requested or ai.search_aborted:
+                # Cancelled or out of time: the TT still keeps what was found
+                continue
+            self.searches += 1
+            self._answers[key] = (move, ai.get_stats()['search_time_ms'])
+
+    def get_stats(self):
+        return {
+            'ponder_searches': self.searches,
+            'ponder_lookups': self.lookups,
+            'ponder_hits': self.hits,
+            'ponder_hit_rate': self.hits / self.lookups if self.lookups else 0.0,
+            'ponder_saved_ms': self.saved_ms,
+        }
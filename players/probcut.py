@@ -0,0 +1,192 @@
+"""
+ProbCut model: predicts the deep search value of a move from a shallow one.
+
+For a child chance node searched to depth d (remaining plies after the
+move), the deep value is modelled as
+
+    deep ~ a * shallow + b,   residual standard deviation sigma
+
+where shallow is the value of the same node searched to shallow_depth.
+fit_model() collects (shallow, deep) pairs from self-play positions: games
+between two AI(depth=game_depth) players with random rolls, cut off after
+max_plies plies, where every sample_every-th decision with several legal
+moves is recorded, and every
+move of it is searched exactly (full window) at shallow_depth and at each
+deep depth. One least-squares line per deep depth is written to a JSON
+file, together with a checksum of the evaluation weights; load_model()
+ignores a model fitted with other weights. Every deep depth must exceed
+shallow_depth: the shallow search runs inside the deep one and uses the
+per-ply move pickers of the plies below the node it tests, so a shallow
+search as deep as the node would reuse (and corrupt) the pickers of the
+node itself and of its ancestors. load_model() rejects such a model.
+
+AI(probcut=path) uses the model at decision nodes (see players.ai_pruning).
+
+Fit from the repository root:
+    python -m players.probcut --games 8 --depths 2 3 --shallow-depth 1
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from engines.board import create_initial_board, print_message
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from engines.load_weights import load_weights
+from engines.search_board import SearchBoard
+from players.opening_book import weights_checksum
+
+PROBCUT_MODEL_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "probcut_model.json")
+
+_models = {}
+
+
+def load_model(path=PROBCUT_MODEL_FILE, config=None):
+    """
+    Read (once per process) the model at path.
+
+    Returns:
+        dict | None: {'shallow_depth': int, 'lines': {deep depth: (a, b, sigma)}},
+        None if the file is missing or was fitted with weights other than config
+
+    Raises:
+        ValueError: a deep depth is not above shallow_depth
+    """
+    if path in _models:
+        model = _models[path]
+    elif not os.path.exists(path):
+        return None
+    else:
+        with open(path, "r") as f:
+            data = json.load(f)
+        model = {
+            'shallow_depth': data['shallow_depth'],
+            'weights_crc': data['weights_crc'],
+            'lines': {int(depth): (line['a'], line['b'], line['sigma'])
+                      for depth, line in data['lines'].items()},
+        }
+        _check_depths(model['shallow_depth'], model['lines'], path)
+        _models[path] = model
+    if model['weights_crc'] != weights_checksum(config):
+        print_message(f"ProbCut model {path} was fitted with other weights; ignored.",
+                      "warning")
+        return None
+    return model
+
+
+def _check_depths(shallow_depth, depths, source):
+    too_shallow = sorted(depth for depth in depths if depth <= shallow_depth)
+    if too_shallow:
+        raise ValueError(f"ProbCut {source}: deep depths {too_shallow} are not "
+                         f"above shallow_depth {shallow_depth}")
+
+
+def self_play_positions(games, game_depth, sample_every, seed, max_plies=600):
+    """(state, roll) decisions with several legal moves from self-play games."""
+    # Imported here: ai_pruning imports this module
+    from players.ai_pruning import AI
+
+    rng = random.Random(seed)
+    rolls, weights = zip(*get_all_possible_rolls())
+    players = {'X': AI('X', game_depth), 'O': AI('O', game_depth)}
+    positions = []
+    decisions = 0
+    for _ in range(games):
+        state = GameState.from_board(create_initial_board(), 'X')
+        for _ in range(max_plies):
+            if state.is_terminal():
+                break
+            roll = rng.choices(rolls, weights=weights, k=1)[0]
+            if len(state.get_valid_moves(roll)) > 1:
+                decisions += 1
+                if decisions % sample_every == 0:
+                    positions.append((state, roll))
+            move = players[state.get_current_player_symbol()].choose_best_move(
+                state, roll)
+            state = state.pass_turn() if move is None else state.apply_move(*move)
+    return positions
+
+
+def move_values(ai, state, roll, depth):
+    """Exact value (for ai's player) of every move's chance node at depth."""
+    # Imported here: ai_pruning imports this module
+    from evaluations.evaluation_star1 import MAX_POSSIBLE_SCORE, MIN_POSSIBLE_SCORE
+
+    # Entries of another depth must not answer these searches
+    ai.clear_cache()
+    board = SearchBoard.from_state(state)
+    maximizing = state.get_current_player_symbol() == ai.player
+    return [ai.search_root_move(board, move, depth + 1, MIN_POSSIBLE_SCORE,
+                                MAX_POSSIBLE_SCORE, maximizing=maximizing)
+            for move in state.get_valid_moves(roll)]
+
+
+def fit_model(path, games, game_depth, shallow_depth, depths, sample_every=10,
+              seed=0, max_plies=600):
+    """
+    Fit one line per deep depth and write the model to path.
+
+    Returns:
+        dict: {deep depth: (a, b, sigma, samples)}
+    """
+    from players.ai_pruning import AI
+
+    _check_depths(shallow_depth, depths, path)
+    positions = self_play_positions(games, game_depth, sample_every, seed,
+                                    max_plies)
+    ai = AI('X', max(depths) + 1)
+    shallow = []
+    deep = {depth: [] for depth in depths}
+    for state, roll in positions:
+        shallow.extend(move_values(ai, state, roll, shallow_depth))
+        for depth in depths:
+            deep[depth].extend(move_values(ai, state, roll, depth))
+
+    x = np.array(shallow)
+    lines = {}
+    for depth in depths:
+        y = np.array(deep[depth])
+        a, b = np.polyfit(x, y, 1)
+        sigma = float(np.std(y - (a * x + b)))
+        lines[depth] = (float(a), float(b), sigma, len(y))
+
+    with open(path, "w") as f:
+        json.dump({
+            'shallow_depth': shallow_depth,
+            'weights_crc': weights_checksum(load_weights()),
+            'lines': {str(depth): {'a': a, 'b': b, 'sigma': sigma,
+                                   'samples': samples}
+                      for depth, (a, b, sigma, samples) in lines.items()},
+        }, f, indent=4)
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--games', type=int, default=8)
+    parser.add_argument('--game-depth', type=int, default=2)
+    parser.add_argument('--shallow-depth', type=int, default=1)
+    parser.add_argument('--depths', type=int, nargs='+', default=[2, 3])
+    parser.add_argument('--sample-every', type=int, default=10)
+    parser.add_argument('--max-plies', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=PROBCUT_MODEL_FILE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    lines = fit_model(args.output, args.games, args.game_depth,
+                      args.shallow_depth, args.depths, args.sample_every,
+                      args.seed, args.max_plies)
+    for depth, (a, b, sigma, samples) in lines.items():
+        print(f"depth {depth}: deep = {a:.3f} * shallow{args.shallow_depth} "
+              f"+ {b:.1f}, sigma {sigma:.1f} ({samples} moves)")
+    print(f"written to {args.output} in {time.perf_counter() - start:.0f}s")
+
+
+if __name__ == '__main__':
+    main()
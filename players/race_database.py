@@ -0,0 +1,305 @@
+"""
+Race database: turns-to-finish distributions of one side racing alone.
+
+A configuration is the set of squares of one side's pieces, at most k
+pieces, all on squares >= RACE_START. Moves keep a configuration inside
+that set: pieces only move forward, and the water house and the exit
+houses (27-29) send a piece back to the House of Rebirth (square 15) or
+the first free square before it, which is never below RACE_START with
+k pieces.
+
+build_race_database():
+  1. Successors of every configuration for every roll, with the same
+     rules as GameState (the side moves alone; no move means the
+     configuration is unchanged for that turn).
+  2. Expected turns to finish by value iteration,
+         E(c) = 1 + sum over rolls of P(roll) * min over moves E(child),
+     which fixes the policy: the move with the smallest E(child).
+  3. The distribution under that policy: F_c(t), the probability that c
+     finishes within t turns, for t = 1 .. MAX_TURNS, stored as uint16
+     (F * 65535). RaceDatabase memory-maps the file and expands it once
+     into the two float arrays the win probability needs.
+
+For two sides racing independently, with A to move, A finishes first if
+it needs t turns and B needs at least t:
+    P(A wins) = sum over t of (F_A(t) - F_A(t - 1)) * (1 - F_B(t - 1))
+one dot product over MAX_TURNS values, whatever the configurations.
+
+Senet has no phase where contact is impossible: both sides share one
+track, a piece behind can always land on (swap with) a piece ahead, and a
+piece sent back to rebirth meets the other side again. win_probability()
+is therefore the race approximation, used for every position where both
+sides fit the database; checked against the exact players.tablebase it is
+about as accurate for interleaved positions as for separated ones
+(benchmarks/check_race_database.py). The tablebase stays the exact answer
+for the positions it covers.
+
+The database is not committed: load_race_database() builds the default
+file (RACE_DATABASE_FILE, DEFAULT_PIECES pieces, about a second) the first
+time it is missing. Rebuild it by hand from the repository root:
+    python -m players.race_database --pieces 4
+"""
+
+import argparse
+import os
+import struct
+import time
+from bisect import bisect_right
+from math import comb
+
+import numpy as np
+
+from engines.board import BOARD_SIZE, print_message
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+from players.tablebase import rank_combination, unrank_combination
+
+RACE_DATABASE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "race_database.bin")
+
+MAGIC = b'SENETRC1'
+_HEADER = struct.Struct('<8sIII')    # magic, pieces, first square, turns
+
+RACE_START = 11
+DEFAULT_PIECES = 4
+MAX_TURNS = 128
+
+# Successor codes besides configuration indices
+NO_CHILD = -1
+FINISHED = -2
+
+QUANT = 65535
+TOLERANCE = 1e-9
+MAX_ITERATIONS = 10000
+
+_ROLLS = get_all_possible_rolls()
+
+_databases = {}
+
+
+class ConfigurationIndex:
+    def __init__(self, pieces, start=RACE_START):
+        """
+        Args:
+            pieces (int): Most pieces of the side (k)
+            start (int): Lowest square of the database
+        """
+        self.pieces = pieces
+        self.start = start
+        squares = BOARD_SIZE - start
+        self._offsets = []
+        offset = 0
+        for n in range(1, pieces + 1):
+            self._offsets.append(offset)
+            offset += comb(squares, n)
+        self.size = offset
+
+    def contains(self, squares):
+        return 0 < len(squares) <= self.pieces and squares[0] >= self.start
+
+    def rank(self, squares):
+        """squares: sorted squares of the side's pieces"""
+        start = self.start
+        return self._offsets[len(squares) - 1] + \
+            rank_combination([square - start for square in squares])
+
+    def unrank(self, index):
+        n = bisect_right(self._offsets, index)
+        return [square + self.start for square in
+                unrank_combination(index - self._offsets[n - 1], n)]
+
+
+def _successors(index):
+    """(size, rolls, pieces) child indices: FINISHED, NO_CHILD padding."""
+    out = np.full((index.size, len(_ROLLS), index.pieces), NO_CHILD,
+                  dtype=np.int32)
+    for position in range(index.size):
+        squares = index.unrank(position)
+        vector = [0] * BOARD_SIZE
+        for square in squares:
+            vector[square] = 1
+        state = GameState(vector, 1)
+        for r, (roll, _) in enumerate(_ROLLS):
+            moves = state.get_valid_moves(roll)
+            if not moves:
+                out[position, r, 0] = position
+                continue
+            for m, (from_pos, to_pos) in enumerate(moves):
+                child = state.apply_move(from_pos, to_pos).get_vector()
+                child_squares = [s for s, v in enumerate(child) if v == 1]
+                if not child_squares:
+                    out[position, r, m] = FINISHED
+                else:
+                    assert index.contains(child_squares), child_squares
+                    out[position, r, m] = index.rank(child_squares)
+    return out
+
+
+def _expected_turns(successors, tolerance=TOLERANCE):
+    """Value iteration for E; returns (E, policy (size, rolls), iterations)."""
+    size = len(successors)
+    probabilities = np.array([prob for _, prob in _ROLLS])
+    # Padding reads +inf (never the min), FINISHED reads 0
+    gather = np.where(successors == NO_CHILD, size,
+                      np.where(successors == FINISHED, size + 1, successors))
+    child_turns = np.empty(size + 2)
+    child_turns[size] = np.inf
+    child_turns[size + 1] = 0.0
+    turns = np.zeros(size)
+    iteration = 0
+    while iteration < MAX_ITERATIONS:
+        child_turns[:size] = turns
+        updated = 1.0 + child_turns[gather].min(axis=2) @ probabilities
+        delta = np.abs(updated - turns).max()
+        turns = updated
+        iteration += 1
+        if delta < tolerance:
+            break
+    child_turns[:size] = turns
+    choice = child_turns[gather].argmin(axis=2)
+    policy = np.take_along_axis(gather, choice[..., None], axis=2)[..., 0]
+    return turns, policy, iteration
+
+
+def _distribution(policy, turns=MAX_TURNS):
+    """F[c, t - 1]: probability that c finishes within t turns."""
+    size = len(policy)
+    probabilities = np.array([prob for _, prob in _ROLLS])
+    finished = np.zeros(size + 2)
+    finished[size + 1] = 1.0
+    out = np.empty((size, turns))
+    for t in range(turns):
+        out[:, t] = finished[policy] @ probabilities
+        finished[:size] = out[:, t]
+    return out
+
+
+def build_race_database(path, pieces, turns=MAX_TURNS):
+    """
+    Returns:
+        tuple: (configurations, value iterations, largest E,
+                largest probability of not finishing within turns)
+    """
+    index = ConfigurationIndex(pieces)
+    successors = _successors(index)
+    expected, policy, iterations = _expected_turns(successors)
+    cumulative = _distribution(policy, turns)
+
+    quantized = np.rint(cumulative * QUANT).astype('<u2')
+    # Written aside and renamed: several processes may build the file at once
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, pieces, index.start, turns))
+        f.write(quantized.tobytes())
+    os.replace(tmp, path)
+    return index.size, iterations, expected.max(), 1.0 - cumulative[:, -1].min()
+
+
+class RaceDatabase:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            magic, self.pieces, start, self.turns = \
+                _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a race database")
+        self.index = ConfigurationIndex(self.pieces, start)
+        self._cumulative = np.memmap(path, dtype='<u2', mode='r',
+                                     offset=_HEADER.size,
+                                     shape=(self.index.size, self.turns))
+        # Expanded once so win_probability is a single dot product:
+        # P(finish on turn t) and P(not finished before turn t)
+        done = self._cumulative / QUANT
+        self._finish = np.diff(done, axis=1, prepend=0.0)
+        self._left = 1.0 - np.hstack((np.zeros((len(done), 1)), done[:, :-1]))
+        self._unfinished = 1.0 - done[:, -1]
+        self.path = path
+
+    def finish_distribution(self, squares):
+        """F(1 .. turns) of one side's sorted squares (None outside the database)."""
+        if not self.index.contains(squares):
+            return None
+        return self._cumulative[self.index.rank(squares)] / QUANT
+
+    def win_probability(self, mine, theirs):
+        """
+        Args:
+            mine, theirs: sorted squares of the side to move / the other side
+
+        Returns:
+            float | None: Probability that the side to move finishes first if
+            both race independently, None outside the database
+        """
+        if not self.index.contains(mine) or not self.index.contains(theirs):
+            return None
+        a = self.index.rank(mine)
+        b = self.index.rank(theirs)
+        win = float(self._finish[a] @ self._left[b])
+        # Neither finished within the table: split the remainder evenly
+        return win + 0.5 * float(self._unfinished[a] * self._unfinished[b])
+
+    def race_probability(self, mine, theirs, mine_to_move=None):
+        """
+        Args:
+            mine, theirs: sorted squares of a player / of the opponent
+            mine_to_move (bool | None): Whether the player moves next
+                (None: unknown, the mean of both)
+
+        Returns:
+            float | None: Race win probability of the player
+        """
+        if not self.index.contains(mine) or not self.index.contains(theirs):
+            return None
+        if mine_to_move:
+            return self.win_probability(mine, theirs)
+        if mine_to_move is None:
+            return 0.5 * (self.win_probability(mine, theirs) +
+                          1.0 - self.win_probability(theirs, mine))
+        return 1.0 - self.win_probability(theirs, mine)
+
+    def reachable(self, my_count, opp_count, my_moves, opp_moves, lowest_reach):
+        """
+        Could a position in the database follow within my_moves / opp_moves
+        moves (one piece off per move at most, every piece able to reach
+        RACE_START)? Used to widen search bounds.
+        """
+        return my_count - my_moves <= self.pieces and \
+            opp_count - opp_moves <= self.pieces and \
+            lowest_reach >= self.index.start
+
+    def __len__(self):
+        return self.index.size
+
+
+def load_race_database(path=RACE_DATABASE_FILE):
+    """
+    Open (once per process) the race database at path, None if missing.
+    The default file is built first if it is missing.
+    """
+    if path not in _databases:
+        if not os.path.exists(path):
+            if path != RACE_DATABASE_FILE:
+                return None
+            print_message(f"Building the race database {path}...", "info")
+            build_race_database(path, DEFAULT_PIECES)
+        _databases[path] = RaceDatabase(path)
+    return _databases[path]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pieces', type=int, default=DEFAULT_PIECES)
+    parser.add_argument('--turns', type=int, default=MAX_TURNS)
+    parser.add_argument('--output', default=RACE_DATABASE_FILE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    size, iterations, expected, tail = build_race_database(
+        args.output, args.pieces, args.turns)
+    print(f"{size} configurations (up to {args.pieces} pieces), "
+          f"{iterations} iterations, longest expected race {expected:.1f} turns, "
+          f"largest P(not finished in {args.turns}) {tail:.1e}, "
+          f"{os.path.getsize(args.output)} bytes in {args.output}, "
+          f"{time.perf_counter() - start:.0f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Transposition table in multiprocessing shared memory.
+
+Several search processes can probe and store into the same table at once
+without locks. Every slot is three 64-bit words:
+
+    word 0  check = key ^ value_bits ^ meta
+    word 1  value (float64)
+    word 2  meta  = depth | bound << 8 | generation << 10 | (move + 1) << 18
+                    | 1 << 34 (occupied; an all-zero slot is empty)
+
+A slot holds `key` only if check ^ value_bits ^ meta == key. When two
+processes write the same slot at once, or a reader sees a write half
+done, the three words no longer agree and the slot reads as a miss, so a
+torn entry is ignored instead of returning another position's value.
+Aligned 8-byte stores are not split by the hardware, so the check only has
+to cover mixing between words.
+
+Buckets, replacement (depth-preferred with aging) and the probe / store
+interface follow players.transposition_table.TranspositionTable. The
+generation lives in the shared header: the process that created the table
+starts a new one with new_search(); attached processes pick it up when
+they call new_search() themselves. Statistics are per process.
+"""
+
+import struct
+from multiprocessing.shared_memory import SharedMemory
+
+from players.transposition_table import (
+    EXACT, BUCKET_SIZE, AGE_PENALTY, GENERATION_MASK, encode_move, decode_move)
+
+SLOT_WORDS = 3
+SLOT_BYTES = SLOT_WORDS * 8
+
+# Header words: generation, capacity (rest reserved, one cache line)
+HEADER_WORDS = 8
+_GENERATION = 0
+_CAPACITY = 1
+
+_OCCUPIED = 1 << 34
+
+# Entries sampled by get_stats to estimate the fill rate
+FILL_SAMPLE = 4096
+
+_DOUBLE = struct.Struct('d')
+_QWORD = struct.Struct('Q')
+
+
+def _value_bits(value):
+    return _QWORD.unpack(_DOUBLE.pack(value))[0]
+
+
+def _bits_value(bits):
+    return _DOUBLE.unpack(_QWORD.pack(bits))[0]
+
+
+def slots_for_budget(size_mb):
+    """Largest power-of-two slot count that fits in size_mb megabytes."""
+    slots = max(BUCKET_SIZE, int(size_mb * 1024 * 1024) // SLOT_BYTES)
+    return 1 << (slots.bit_length() - 1)
+
+
+def _pack_meta(depth, bound, generation, move):
+    return (depth | bound << 8 | generation << 10 |
+            (encode_move(move) + 1) << 18 | _OCCUPIED)
+
+
+class SharedTranspositionTable:
+    def __init__(self, size_mb=8, name=None):
+        """
+        Args:
+            size_mb (float): Memory budget when creating a new table
+            name (str): Attach to the existing table with this shared-memory
+                name instead of creating one (size_mb is then ignored)
+        """
+        self.owner = name is None
+        if self.owner:
+            capacity = slots_for_budget(size_mb)
+            self._shm = SharedMemory(
+                create=True, size=(HEADER_WORDS + capacity * SLOT_WORDS) * 8)
+        else:
+            self._shm = SharedMemory(name=name)
+        self.name = self._shm.name
+        self._words = self._shm.buf.cast('Q')
+        if self.owner:
+            self._words[_CAPACITY] = capacity
+
+        self.capacity = self._words[_CAPACITY]
+        self.num_buckets = self.capacity // BUCKET_SIZE
+        self.mask = self.num_buckets - 1
+        self.verify = False
+        self.generation = self._words[_GENERATION]
+        self._reset_counters()
+
+    def memory_bytes(self):
+        return (HEADER_WORDS + self.capacity * SLOT_WORDS) * 8
+
+    def _reset_counters(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+        self.collisions = 0
+        self.reused_hits = 0
+
+    def clear(self):
+        """Empty every slot (creating process only) and reset counters."""
+        if self.owner:
+            start = HEADER_WORDS * 8
+            end = self.memory_bytes()
+            self._shm.buf[start:end] = bytes(end - start)
+            self._words[_GENERATION] = 0
+        self.generation = self._words[_GENERATION]
+        self._reset_counters()
+
+    def new_search(self):
+        """
+        The creating process starts a new generation; attached processes
+        adopt the current one.
+        """
+        if self.owner:
+            self._words[_GENERATION] = (self._words[_GENERATION] + 1) & GENERATION_MASK
+        self.generation = self._words[_GENERATION]
+
+    def _slot_base(self, key):
+        return HEADER_WORDS + (key & self.mask) * BUCKET_SIZE * SLOT_WORDS
+
+    def probe(self, key, signature=None):
+        """
+        Returns:
+            tuple | None: (depth, bound, value, move) stored for key
+        """
+        self.probes += 1
+        words = self._words
+        base = self._slot_base(key)
+        for i in range(base, base + BUCKET_SIZE * SLOT_WORDS, SLOT_WORDS):
+            meta = words[i + 2]
+            bits = words[i + 1]
+            if words[i] ^ bits ^ meta != key:
+                continue
+            self.hits += 1
+            generation = meta >> 10 & GENERATION_MASK
+            if generation != self.generation:
+                # Re-stamp: a reader in between sees a mismatch (a miss)
+                self.reused_hits += 1
+                meta = meta & ~(GENERATION_MASK << 10) | self.generation << 10
+                words[i + 2] = meta
+                words[i] = key ^ bits ^ meta
+            return (meta & 0xFF, meta >> 8 & 3, _bits_value(bits),
+                    decode_move((meta >> 18 & 0xFFFF) - 1))
+        return None
+
+    def store(self, key, depth, bound, value, move=None, signature=None):
+        """
+        Same replacement rules as TranspositionTable.store; the three words
+        are written last, with no lock.
+        """
+        self.stores += 1
+        words = self._words
+        generation = self.generation
+        base = self._slot_base(key)
+        empty = None
+        oldest = None
+        oldest_score = None
+        for i in range(base, base + BUCKET_SIZE * SLOT_WORDS, SLOT_WORDS):
+            meta = words[i + 2]
+            bits = words[i + 1]
+            if words[i] ^ bits ^ meta == key:
+                if (meta & 0xFF) > depth and bound != EXACT and \
+                   (meta >> 10 & GENERATION_MASK) == generation:
+                    if move is not None and not meta >> 18 & 0xFFFF:
+                        # Keep the deeper entry but remember the move; the
+                        # check word is rewritten last, as below
+                        meta |= (encode_move(move) + 1) << 18
+                        words[i + 2] = meta
+                        words[i] = key ^ bits ^ meta
+                    return
+                victim = i
+                break
+            if not meta & _OCCUPIED:
+                if empty is None:
+                    empty = i
+                continue
+            age = (generation - (meta >> 10 & GENERATION_MASK)) & GENERATION_MASK
+            score = (meta & 0xFF) - AGE_PENALTY * age
+            if oldest_score is None or score < oldest_score:
+                oldest, oldest_score = i, score
+        else:
+            if empty is not None:
+                victim = empty
+            else:
+                victim = oldest
+                self.replacements += 1
+
+        meta = _pack_meta(depth, bound, generation, move)
+        bits = _value_bits(value)
+        words[victim + 2] = meta
+        words[victim + 1] = bits
+        words[victim] = key ^ bits ^ meta
+
+    def get_stats(self):
+        words = self._words
+        sample = min(self.capacity, FILL_SAMPLE)
+        used = sum(1 for i in range(HEADER_WORDS, HEADER_WORDS + sample * SLOT_WORDS,
+                                    SLOT_WORDS) if words[i + 2] & _OCCUPIED)
+        fill_rate = used / sample
+        return {
+            'capacity': self.capacity,
+            'memory_mb': self.memory_bytes() / (1024 * 1024),
+            'used': int(fill_rate * self.capacity),
+            'fill_rate': fill_rate,
+            'stores': self.stores,
+            'replacements': self.replacements,
+            'probes': self.probes,
+            'hits': self.hits,
+            'reused_hits': self.reused_hits,
+            'collisions': self.collisions,
+            'generation': self.generation
+        }
+
+    def close(self):
+        """Detach from the shared memory; the creating process also frees it."""
+        if self._words is None:
+            return
+        self._words.release()
+        self._words = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
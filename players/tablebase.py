@@ -0,0 +1,282 @@
+"""
+Endgame tablebase: exact win probabilities with few pieces left.
+
+A position with at most k pieces per side on the board is described by
+the squares of the side to move ("mine") and of the other side
+("theirs"); the rules are the same for X and O, so one table serves both.
+Pieces on the board never increase (captures swap, the water and exit
+houses send pieces back), so these positions form a closed set.
+
+PositionIndex is a perfect ranking of that set: positions are grouped by
+piece counts (a, b), mine is ranked with the combinatorial number system
+over the 30 squares and theirs over the 30 - a squares left free.
+
+build_tablebase():
+  1. Successors. For every index and roll, the indices of the positions
+     after each legal move (from the opponent's point of view), WIN when
+     the move bears off the last piece, or the passed position when no
+     move is legal. Computed in chunks on a process pool; every finished
+     chunk is saved in a work directory, so an interrupted run resumes.
+  2. Value iteration over the stick distribution:
+         V(p) = sum over rolls of P(roll) * max over moves (1 - V(child))
+     vectorised with NumPy until the largest change is below a tolerance;
+     the values are checkpointed in the work directory as well.
+  3. The result is written as uint16 (probability * 65535) after a small
+     header (the work directory is then removed), and Tablebase
+     memory-maps it read-only.
+
+Build from the repository root:
+    python -m players.tablebase --pieces 2 --workers 8
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+import numpy as np
+
+from engines.board import BOARD_SIZE
+from engines.game_state_pyrsistent import GameState, get_all_possible_rolls
+
+TABLEBASE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "endgame_tablebase.bin")
+
+MAGIC = b'SENETTB1'
+_HEADER = struct.Struct('<8sII')     # magic, pieces per side, positions
+
+# Successor codes besides position indices
+NO_CHILD = -1
+WIN = -2
+
+QUANT = 65535
+CHUNK = 20000
+TOLERANCE = 1e-7
+MAX_ITERATIONS = 10000
+CHECKPOINT_EVERY = 100
+
+_ROLLS = get_all_possible_rolls()
+
+_tablebases = {}
+
+
+def rank_combination(squares):
+    """Colex rank of a sorted tuple of distinct squares."""
+    return sum(comb(square, i + 1) for i, square in enumerate(squares))
+
+
+def unrank_combination(rank, size):
+    squares = []
+    for i in range(size, 0, -1):
+        square = i - 1
+        while comb(square + 1, i) <= rank:
+            square += 1
+        squares.append(square)
+        rank -= comb(square, i)
+    squares.reverse()
+    return squares
+
+
+class PositionIndex:
+    def __init__(self, pieces):
+        """
+        Args:
+            pieces (int): Most pieces per side on the board (k)
+        """
+        self.pieces = pieces
+        self.blocks = []        # (offset, a, b, size of theirs ranking)
+        offset = 0
+        for a in range(1, pieces + 1):
+            for b in range(1, pieces + 1):
+                theirs = comb(BOARD_SIZE - a, b)
+                self.blocks.append((offset, a, b, theirs))
+                offset += comb(BOARD_SIZE, a) * theirs
+        self.size = offset
+        self._offsets = [block[0] for block in self.blocks]
+        self._block_of = {(a, b): (off, t) for off, a, b, t in self.blocks}
+
+    def rank(self, mine, theirs):
+        """
+        Args:
+            mine, theirs: sorted squares of the side to move / the other side
+        """
+        offset, size = self._block_of[(len(mine), len(theirs))]
+        free = []
+        j = 0
+        for square in theirs:
+            while j < len(mine) and mine[j] < square:
+                j += 1
+            free.append(square - j)
+        return offset + rank_combination(mine) * size + rank_combination(free)
+
+    def unrank(self, index):
+        offset, a, b, size = self.blocks[bisect_right(self._offsets, index) - 1]
+        mine_rank, theirs_rank = divmod(index - offset, size)
+        mine = unrank_combination(mine_rank, a)
+        taken = set(mine)
+        free = [square for square in range(BOARD_SIZE) if square not in taken]
+        theirs = [free[i] for i in unrank_combination(theirs_rank, b)]
+        return mine, theirs
+
+
+def _successor_chunk(pieces, start, end):
+    """Successor array (end - start, rolls, pieces) of one index range."""
+    index = PositionIndex(pieces)
+    out = np.full((end - start, len(_ROLLS), pieces), NO_CHILD, dtype=np.int32)
+    for row, position in enumerate(range(start, end)):
+        mine, theirs = index.unrank(position)
+        vector = [0] * BOARD_SIZE
+        for square in mine:
+            vector[square] = 1
+        for square in theirs:
+            vector[square] = -1
+        state = GameState(vector, 1)
+        for r, (roll, _) in enumerate(_ROLLS):
+            moves = state.get_valid_moves(roll)
+            if not moves:
+                out[row, r, 0] = index.rank(theirs, mine)
+                continue
+            for m, (from_pos, to_pos) in enumerate(moves):
+                child = state.apply_move(from_pos, to_pos).get_vector()
+                child_mine = [s for s, v in enumerate(child) if v == 1]
+                if not child_mine:
+                    out[row, r, m] = WIN
+                else:
+                    child_theirs = [s for s, v in enumerate(child) if v == -1]
+                    out[row, r, m] = index.rank(child_theirs, child_mine)
+    return out
+
+
+def _build_successors(index, work_dir, workers):
+    """Compute (or resume) every successor chunk; returns the full array."""
+    starts = list(range(0, index.size, CHUNK))
+    paths = [os.path.join(work_dir, f"successors_{start}.npy") for start in starts]
+    todo = [(start, path) for start, path in zip(starts, paths)
+            if not os.path.exists(path)]
+
+    def save(start, path, chunk):
+        tmp = path + '.tmp.npy'
+        np.save(tmp, chunk)
+        os.replace(tmp, path)
+
+    if todo and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_successor_chunk, index.pieces, start,
+                                       min(start + CHUNK, index.size)): (start, path)
+                       for start, path in todo}
+            for future, (start, path) in futures.items():
+                save(start, path, future.result())
+    else:
+        for start, path in todo:
+            save(start, path, _successor_chunk(index.pieces, start,
+                                               min(start + CHUNK, index.size)))
+    return np.concatenate([np.load(path) for path in paths])
+
+
+def _value_iteration(successors, work_dir, tolerance=TOLERANCE):
+    size = len(successors)
+    probabilities = np.array([prob for _, prob in _ROLLS])
+    # Padding reads -inf (never the max), WIN reads 1
+    gather = np.where(successors == NO_CHILD, size,
+                      np.where(successors == WIN, size + 1, successors))
+    checkpoint = os.path.join(work_dir, 'values.npz')
+    if os.path.exists(checkpoint):
+        saved = np.load(checkpoint)
+        values, iteration = saved['values'], int(saved['iteration'])
+    else:
+        values, iteration = np.full(size, 0.5), 0
+
+    child_values = np.empty(size + 2)
+    child_values[size] = -np.inf
+    child_values[size + 1] = 1.0
+    delta = np.inf
+    while iteration < MAX_ITERATIONS:
+        child_values[:size] = 1.0 - values
+        updated = child_values[gather].max(axis=2) @ probabilities
+        delta = np.abs(updated - values).max()
+        values = updated
+        iteration += 1
+        if iteration % CHECKPOINT_EVERY == 0:
+            np.savez(checkpoint, values=values, iteration=iteration)
+        if delta < tolerance:
+            break
+    return values, iteration, delta
+
+
+def build_tablebase(path, pieces, workers=1):
+    """
+    Returns:
+        tuple: (positions, iterations, final largest change)
+    """
+    index = PositionIndex(pieces)
+    work_dir = path + '.work'
+    os.makedirs(work_dir, exist_ok=True)
+    successors = _build_successors(index, work_dir, workers)
+    values, iterations, delta = _value_iteration(successors, work_dir)
+
+    quantized = np.rint(values * QUANT).astype('<u2')
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, pieces, index.size))
+        f.write(quantized.tobytes())
+    shutil.rmtree(work_dir)
+    return index.size, iterations, delta
+
+
+class Tablebase:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            magic, self.pieces, size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tablebase")
+        self.index = PositionIndex(self.pieces)
+        self._values = np.memmap(path, dtype='<u2', mode='r',
+                                 offset=_HEADER.size, shape=(size,))
+        self.path = path
+
+    def probe(self, mine, theirs):
+        """
+        Args:
+            mine, theirs: sorted squares of the side to move / the other side
+
+        Returns:
+            float | None: Win probability of the side to move, None if the
+            position is not in the table
+        """
+        if not 0 < len(mine) <= self.pieces or not 0 < len(theirs) <= self.pieces:
+            return None
+        return int(self._values[self.index.rank(mine, theirs)]) / QUANT
+
+    def __len__(self):
+        return len(self._values)
+
+
+def load_tablebase(path=TABLEBASE_FILE):
+    """Open (once per process) the tablebase at path, None if missing."""
+    if path not in _tablebases:
+        if not os.path.exists(path):
+            return None
+        _tablebases[path] = Tablebase(path)
+    return _tablebases[path]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pieces', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', default=TABLEBASE_FILE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    size, iterations, delta = build_tablebase(args.output, args.pieces, args.workers)
+    print(f"{size} positions (up to {args.pieces} pieces per side), "
+          f"{iterations} iterations (last change {delta:.1e}), "
+          f"{os.path.getsize(args.output)} bytes in {args.output}, "
+          f"{time.perf_counter() - start:.0f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Fixed-capacity transposition table for the expectiminimax search.
+
+Entries live in preallocated `array` buffers (one per field) grouped into
+buckets of BUCKET_SIZE slots; a 64-bit key selects its bucket with a hash
+mask. Each entry keeps the key, the search depth, a bound type
+(EXACT / LOWER / UPPER), the value, the best move and the generation
+(search number) that wrote it: ENTRY_BYTES bytes per entry, against well
+over 150 bytes for a dict of tuple keys to floats. The size is given as a
+memory budget in megabytes.
+
+Replacement inside a full bucket is depth-preferred with aging: entries
+from older generations lose AGE_PENALTY plies of effective depth per
+generation, and the lowest effective depth is evicted. The table is meant
+to live for a whole game: a probe hit on an entry from an earlier search
+re-stamps it with the current generation, so subtrees that are still
+relevant survive the aging.
+"""
+
+from array import array
+
+# Bound types
+EXACT = 0
+LOWER = 1   # value is a lower bound (fail-high)
+UPPER = 2   # value is an upper bound (fail-low)
+
+BUCKET_SIZE = 4
+AGE_PENALTY = 2
+GENERATION_MASK = 0xFF
+
+# Key 0 marks an empty slot (a real Zobrist key of 0 is never stored)
+EMPTY_KEY = 0
+NO_MOVE = -1
+
+# Per-entry storage: key 'Q' + value 'd' + move 'h' + depth/bound/generation 'B'
+_FIELD_TYPECODES = ('Q', 'd', 'h', 'B', 'B', 'B')
+ENTRY_BYTES = sum(array(code).itemsize for code in _FIELD_TYPECODES)
+
+
+def encode_move(move):
+    """(from, to) -> small int for the move buffer (NO_MOVE for None)."""
+    if move is None:
+        return NO_MOVE
+    return move[0] * 32 + move[1]
+
+
+def decode_move(code):
+    if code == NO_MOVE:
+        return None
+    return (code >> 5, code & 31)
+
+
+def entries_for_budget(size_mb):
+    """Largest power-of-two entry count that fits in size_mb megabytes."""
+    entries = max(BUCKET_SIZE, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+    return 1 << (entries.bit_length() - 1)
+
+
+class TranspositionTable:
+    def __init__(self, size_mb=8, verify=False):
+        """
+        Args:
+            size_mb (float): Memory budget; capacity is the largest power of
+                two number of entries that fits
+            verify (bool): Store a full position signature with every entry
+                and reject hits whose signature differs (collision check)
+        """
+        self.capacity = entries_for_budget(size_mb)
+        self.num_buckets = self.capacity // BUCKET_SIZE
+        self.mask = self.num_buckets - 1
+        self.verify = verify
+
+        self._allocate()
+
+        self.generation = 0
+        self.used = 0
+        self._reset_counters()
+
+    def _allocate(self):
+        capacity = self.capacity
+        self._keys = array('Q', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._moves = array('h', [NO_MOVE]) * capacity
+        self._depths = array('B', bytes(capacity))
+        self._bounds = array('B', bytes(capacity))
+        self._generations = array('B', bytes(capacity))
+        self._signatures = [None] * capacity if self.verify else None
+
+    def memory_bytes(self):
+        """Bytes held by the entry buffers (excluding verify signatures)."""
+        return sum(buf.itemsize * len(buf) for buf in (
+            self._keys, self._values, self._moves,
+            self._depths, self._bounds, self._generations))
+
+    def _reset_counters(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+        self.collisions = 0
+        self.reused_hits = 0
+
+    def clear(self):
+        """Empty every slot and reset counters."""
+        self._allocate()
+        self.generation = 0
+        self.used = 0
+        self._reset_counters()
+
+    def new_search(self):
+        """Start a new generation; older entries become preferred victims."""
+        self.generation = (self.generation + 1) & GENERATION_MASK
+
+    def probe(self, key, signature=None):
+        """
+        Returns:
+            tuple | None: (depth, bound, value, move) stored for key
+        """
+        self.probes += 1
+        base = (key & self.mask) * BUCKET_SIZE
+        keys = self._keys
+        if key not in keys[base:base + BUCKET_SIZE]:
+            return None
+        i = keys.index(key, base, base + BUCKET_SIZE)
+        if self.verify and self._signatures[i] != signature:
+            self.collisions += 1
+            return None
+        self.hits += 1
+        if self._generations[i] != self.generation:
+            self.reused_hits += 1
+            self._generations[i] = self.generation
+        return (self._depths[i], self._bounds[i],
+                self._values[i], decode_move(self._moves[i]))
+
+    def store(self, key, depth, bound, value, move=None, signature=None):
+        """
+        Store a search result. A new non-EXACT result never overwrites a
+        deeper entry from the current generation (it only fills in a missing
+        move); anything else replaces the entry for the same key.
+        """
+        self.stores += 1
+        base = (key & self.mask) * BUCKET_SIZE
+        keys = self._keys
+        depths = self._depths
+        generations = self._generations
+        generation = self.generation
+        bucket = keys[base:base + BUCKET_SIZE]
+
+        if key in bucket:
+            victim = base + bucket.index(key)
+            if depths[victim] > depth and generations[victim] == generation \
+               and bound != EXACT:
+                if move is not None and self._moves[victim] == NO_MOVE:
+                    self._moves[victim] = encode_move(move)
+                return
+        elif EMPTY_KEY in bucket:
+            victim = base + bucket.index(EMPTY_KEY)
+            self.used += 1
+        else:
+            victim = base
+            victim_score = None
+            for i in range(base, base + BUCKET_SIZE):
+                age = (generation - generations[i]) & GENERATION_MASK
+                score = depths[i] - AGE_PENALTY * age
+                if victim_score is None or score < victim_score:
+                    victim = i
+                    victim_score = score
+            self.replacements += 1
+
+        keys[victim] = key
+        depths[victim] = depth
+        self._bounds[victim] = bound
+        self._values[victim] = value
+        self._moves[victim] = encode_move(move)
+        generations[victim] = generation
+        if self.verify:
+            self._signatures[victim] = signature
+
+    def get_stats(self):
+        return {
+            'capacity': self.capacity,
+            'memory_mb': self.memory_bytes() / (1024 * 1024),
+            'used': self.used,
+            'fill_rate': self.used / self.capacity,
+            'stores': self.stores,
+            'replacements': self.replacements,
+            'probes': self.probes,
+            'hits': self.hits,
+            'reused_hits': self.reused_hits,
+            'collisions': self.collisions,
+            'generation': self.generation
+        }
@@ -0,0 +1,32 @@
+"""
+Terminal positions: a player with no pieces left on the board has borne
+them all off and won.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+from engines.board import BOARD_SIZE
+from evaluations import evaluation, evaluation_star1
+
+
+def board_with(x_squares, o_squares):
+    board = [None] * BOARD_SIZE
+    for square in x_squares:
+        board[square] = 'X'
+    for square in o_squares:
+        board[square] = 'O'
+    return board
+
+
+def test_basic_evaluation_scores_bearing_off_all_pieces_as_a_win():
+    board = board_with([], [20, 25])
+    assert evaluation.Evaluation('X').evaluate_board(board) == evaluation.WIN_SCORE
+    assert evaluation.Evaluation('O').evaluate_board(board) == -evaluation.WIN_SCORE
+
+
+def test_evaluations_agree_on_the_winner():
+    board = board_with([27], [])
+    for module in (evaluation, evaluation_star1):
+        assert module.Evaluation('O').evaluate_board(board) > 0
+        assert module.Evaluation('X').evaluate_board(board) < 0
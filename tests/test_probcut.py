@@ -0,0 +1,35 @@
+"""
+ProbCut models: every deep depth must be above the shallow search depth.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import json
+
+import pytest
+
+from players.probcut import load_model
+
+
+def write_model(path, shallow_depth, depths):
+    line = {'a': 1.0, 'b': 0.0, 'sigma': 100.0, 'samples': 10}
+    path.write_text(json.dumps({
+        'shallow_depth': shallow_depth,
+        'weights_crc': 0,
+        'lines': {str(depth): line for depth in depths},
+    }))
+    return str(path)
+
+
+def test_load_model_rejects_a_deep_depth_not_above_the_shallow_one(tmp_path):
+    path = write_model(tmp_path / 'model.json', 1, [1, 2, 3])
+    with pytest.raises(ValueError, match=r"\[1\]"):
+        load_model(path)
+
+
+def test_load_model_reads_lines_by_deep_depth(tmp_path):
+    path = write_model(tmp_path / 'model.json', 1, [2, 3])
+    model = load_model(path)
+    assert model['shallow_depth'] == 1
+    assert sorted(model['lines']) == [2, 3]
@@ -6,12 +6,16 @@ from engines.board import HOUSE_REBIRTH, HOUSE_OF_HAPPINESS, HOUSE_WATER, HOUSE_
 from engines.rules import get_valid_moves, apply_move, check_win
 from engines.sticks import throw_sticks
 from players.ai_pruning import AI
-from engines.game_state_pyrsistent import GameState
+from players.ponder import Ponderer
+from engines.game_state_bitboard import create_state
 from players.player import PlayerType
 from views.button import Button
 from views.text_input_box import TextInputBox
 import matplotlib.pyplot as plt
-from players.game_modes import SlowAI, FastAI
+from players.game_modes import SlowAI, FastAI, INTERACTIVE_TIME_BUDGET_MS
+from players.opening_book import OPENING_BOOK_FILE
+from players.tablebase import TABLEBASE_FILE
+from players.race_database import RACE_DATABASE_FILE
 
 
 AI_OPTIONS = {
@@ -63,6 +67,7 @@ class SenetGUI:
         self.current_player = PlayerType.PLAYER
         self.opponent = PlayerType.OPPONENT
         self.ai = None
+        self.ponderer = None
         self.ai_depth = 3  # Default depth
         self.game_mode = None  # 1 = HvH, 2 = HvAI
 
@@ -110,10 +115,20 @@ class SenetGUI:
         self.winner = None
         self.ai_depth = depth
 
+        if self.ponderer is not None:
+            self.ponderer.stop()
         if mode == 2:
-            self.ai = AI(player_symbol=PlayerType.OPPONENT, depth=depth)
+            self.ai = AI(player_symbol=PlayerType.OPPONENT, depth=depth,
+                         time_budget_ms=INTERACTIVE_TIME_BUDGET_MS,
+                         opening_book=OPENING_BOOK_FILE,
+                         tablebase=TABLEBASE_FILE,
+                         race_database=RACE_DATABASE_FILE)
+            # Searches the AI's next positions while the human is thinking
+            self.ponderer = Ponderer(self.ai)
+            self.ponderer.start(create_state(self.board, self.current_player))
         else:
             self.ai = None
+            self.ponderer = None
 
     def get_screen_pos(self, index):
         """Converts board index (0-29) to screen (x, y) coordinates handling the S-shape."""
@@ -225,6 +240,8 @@ class SenetGUI:
 
         elif self.state == "PLAYING":
             if self.btn_menu.check_click(pos) == "MENU_RETURN":
+                if self.ponderer is not None:
+                    self.ponderer.stop()
                 self.state = "MENU"
                 return
 
@@ -283,6 +300,10 @@ class SenetGUI:
         self.current_roll = throw_sticks()
         self.valid_moves = get_valid_moves(
             self.board, self.current_player, self.current_roll)
+        if self.ponderer is not None and self.valid_moves:
+            # The roll is known: ponder only its replies
+            self.ponderer.start(create_state(self.board, self.current_player),
+                                self.current_roll)
 
         msg = f"Rolled: {self.current_roll}. "
         if not self.valid_moves:
@@ -301,6 +322,9 @@ class SenetGUI:
     def execute_move(self, move):
         start, end = move
 
+        if self.ponderer is not None and self.current_player != PlayerType.OPPONENT:
+            self.ponderer.stop()
+
         if self.current_player == PlayerType.OPPONENT:
             print(f"[AI EXECUTE] Move from {start} to {end}")
 
@@ -321,6 +345,12 @@ class SenetGUI:
         self.selected_piece_index = None
         self.message = f"Player {self.current_player}'s Turn."
 
+        if self.ponderer is not None:
+            if self.current_player == PlayerType.OPPONENT:
+                self.ponderer.stop()
+            else:
+                self.ponderer.start(create_state(self.board, self.current_player))
+
     def handle_ai_turn(self):
         self.message = "AI is thinking..."
         self.draw_game(pygame.mouse.get_pos())
@@ -332,13 +362,20 @@ class SenetGUI:
         pygame.display.flip()
         time.sleep(0.5)
 
-        state = GameState.from_board(self.board, self.current_player)
-        move = self.ai.choose_best_move(state, self.current_roll)
+        state = create_state(self.board, self.current_player)
+        move = self.ponderer.lookup(state, self.current_roll)
+        pondered = move is not None
+        if not pondered:
+            move = self.ai.choose_best_move(state, self.current_roll)
 
         if move:
             start, end = move
+            ponder = self.ponderer.get_stats()
             print(
-                f"[AI MOVE] Rolled: {self.current_roll} | From: {start} -> To: {end}")
+                f"[AI MOVE] Rolled: {self.current_roll} | From: {start} -> To: {end}"
+                f" | {'pondered' if pondered else 'searched'}"
+                f" (ponder hits {ponder['ponder_hits']}/{ponder['ponder_lookups']},"
+                f" {ponder['ponder_saved_ms'] / 1000:.1f}s saved)")
         else:
             print(f"[AI MOVE] Rolled: {self.current_roll} | No valid moves")
 